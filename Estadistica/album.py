@@ -1,9 +1,7 @@
 # Importación de librerías
+# Solo random: numpy, matplotlib y seaborn se importan recién al graficar o correr el script,
+# así importar album (o usarlo desde barrido.py) no carga la librería de gráficos.
 import random as rd
-import math
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 
 ### ------     CÁLCULO ESTIMADO  ---------
 
@@ -68,33 +66,58 @@ def cuantos_paquetes(figus_total, figus_paquete):
 
 # Bullet 2: Simulación
 
-rd.seed(1234)  # Para reproducibilidad
-# Definimos los parámetros del experimento
-figus_total = 680
-figus_paquete = 5
-n_simulaciones = 100 # Número de simulaciones
-
-# Inicializamos un vector para guardar los resultados
-resultados = np.zeros(n_simulaciones)
-# Realizamos las simulaciones
-for i in range(n_simulaciones):
-    resultados[i] = cuantos_paquetes(figus_total, figus_paquete)
-# Calculamos la media y la desviación estándar
-media = np.mean(resultados)
-desviacion = np.std(resultados)
-# Imprimimos los resultados
-print(f"Media de paquetes necesarios: {media}")
-print(f"Desviación estándar: {desviacion}")
-# Graficamos los resultados
-plt.figure(figsize=(10, 6))
-sns.histplot(resultados, bins=30, kde=True)
-plt.title('Distribución de paquetes necesarios para completar el álbum')
-plt.xlabel('Paquetes comprados')
-plt.ylabel('Frecuencia')
-plt.axvline(media, color='red', linestyle='dashed', linewidth=1)
-plt.axvline(media + desviacion, color='green', linestyle='dashed', linewidth=1)
-plt.axvline(media - desviacion, color='green', linestyle='dashed', linewidth=1)
-plt.legend({'Media': media, 'Desviación estándar': desviacion})
-plt.show()
+def simular(figus_total, figus_paquete, n_simulaciones):
+    '''
+    Repite el experimento n_simulaciones veces y devuelve la lista con la cantidad
+    de paquetes de cada repetición. Para muchas repeticiones conviene
+    motor_album.simular_albumes o montecarlo.simular_en_paralelo.
+    '''
+    return [cuantos_paquetes(figus_total, figus_paquete) for _ in range(n_simulaciones)]
 
 
+def graficar_resultados(resultados):
+    '''
+    Histograma de los paquetes necesarios, con la media y la media ± un desvío.
+    '''
+    import numpy as np
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    media = np.mean(resultados)
+    desviacion = np.std(resultados)
+    plt.figure(figsize=(10, 6))
+    sns.histplot(resultados, bins=30, kde=True)
+    plt.title('Distribución de paquetes necesarios para completar el álbum')
+    plt.xlabel('Paquetes comprados')
+    plt.ylabel('Frecuencia')
+    plt.axvline(media, color='red', linestyle='dashed', linewidth=1)
+    plt.axvline(media + desviacion, color='green', linestyle='dashed', linewidth=1)
+    plt.axvline(media - desviacion, color='green', linestyle='dashed', linewidth=1)
+    plt.legend({'Media': media, 'Desviación estándar': desviacion})
+    plt.show()
+
+
+def main():
+    import numpy as np
+
+    rd.seed(1234)  # Para reproducibilidad
+    # Definimos los parámetros del experimento
+    figus_total = 680
+    figus_paquete = 5
+    n_simulaciones = 100 # Número de simulaciones
+
+    # Realizamos las simulaciones
+    resultados = np.array(simular(figus_total, figus_paquete, n_simulaciones))
+    # Calculamos la media y la desviación estándar
+    media = np.mean(resultados)
+    desviacion = np.std(resultados)
+    # Imprimimos los resultados
+    print(f"Media de paquetes necesarios: {media}")
+    print(f"Desviación estándar: {desviacion}")
+    # Graficamos los resultados
+    graficar_resultados(resultados)
+
+
+# Se ejecuta solo al correr el archivo (python album.py), no al importarlo
+if __name__ == "__main__":
+    main()
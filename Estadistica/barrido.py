@@ -0,0 +1,150 @@
+# barrido.py
+"""
+Barrido de parámetros del álbum: simula todas las combinaciones de figus_total,
+figus_paquete y amigos, en paralelo, y guarda un resumen por combinación.
+
+`amigos` es la cantidad de personas que compran paquetes y se pasan las repetidas
+hasta completar todas un álbum (1 = sin intercambio). Los paquetes se informan por persona.
+
+Uso (desde Estadistica):
+    python barrido.py --figus-total 300 680 --figus-paquete 1 5 10 --amigos 1 2 5 \\
+        --simulaciones 20000 --salida resultados.csv
+
+El formato sale de la extensión de --salida: .csv, .npz (columnas de NumPy) o .parquet
+(requiere pyarrow).
+"""
+
+import argparse
+import csv
+import itertools
+import os
+import sys
+import time
+
+import numpy as np
+
+from exacto import momentos_paquetes
+from montecarlo import ResumenSimulaciones, dividir_en_tareas, ejecutar_tareas
+
+COLUMNAS = ('figus_total', 'figus_paquete', 'amigos', 'simulaciones', 'media', 'desvio',
+            'error_estandar', 'p05', 'mediana', 'p95', 'minimo', 'maximo', 'media_exacta')
+FORMATOS = ('.csv', '.npz', '.parquet')
+
+
+def barrer(combinaciones, n_simulaciones, semilla=None, procesos=None, tamano_tarea=20000):
+    '''
+    Simula n_simulaciones álbumes por cada combinación (figus_total, figus_paquete, amigos)
+    y retorna {combinación: ResumenSimulaciones}. Todas las tareas de todas las combinaciones
+    se reparten en un mismo grupo de procesos.
+
+    La semilla de cada combinación sale de la semilla general y de los parámetros: agregar
+    o quitar combinaciones no cambia los resultados de las demás. Las combinaciones
+    repetidas se simulan una sola vez.
+    '''
+    if n_simulaciones < 1:
+        raise ValueError("n_simulaciones debe ser al menos 1.")
+    combinaciones = list(dict.fromkeys(combinaciones))
+
+    def tareas():
+        for combinacion in combinaciones:
+            figus_total, figus_paquete, amigos = combinacion
+            semilla_combinacion = np.random.SeedSequence(semilla, spawn_key=combinacion)
+            for cantidad, semilla_tarea in dividir_en_tareas(n_simulaciones, semilla_combinacion, tamano_tarea):
+                yield combinacion, (figus_total, figus_paquete, cantidad, semilla_tarea, amigos)
+
+    resumenes = {combinacion: ResumenSimulaciones() for combinacion in combinaciones}
+    for combinacion, resumen in ejecutar_tareas(tareas(), procesos):
+        resumenes[combinacion].combinar(resumen)
+    return resumenes
+
+
+def fila_resumen(combinacion, resumen):
+    '''Fila de resultados de una combinación, con los paquetes por persona.'''
+    figus_total, figus_paquete, amigos = combinacion
+    # Sin intercambio la media exacta sale de la cadena de Markov (exacto.py)
+    media_exacta = momentos_paquetes(figus_total, figus_paquete)[0] if amigos == 1 else float('nan')
+    return {
+        'figus_total': figus_total,
+        'figus_paquete': figus_paquete,
+        'amigos': amigos,
+        'simulaciones': resumen.n,
+        'media': resumen.media() / amigos,
+        'desvio': resumen.desvio() / amigos,
+        'error_estandar': resumen.desvio() / amigos / resumen.n ** 0.5,
+        'p05': resumen.cuantil(0.05) / amigos,
+        'mediana': resumen.cuantil(0.5) / amigos,
+        'p95': resumen.cuantil(0.95) / amigos,
+        'minimo': resumen.minimo() / amigos,
+        'maximo': resumen.maximo() / amigos,
+        'media_exacta': media_exacta,
+    }
+
+
+def guardar(filas, ruta):
+    '''Guarda las filas en CSV, .npz (una columna por arreglo) o Parquet, según la extensión de ruta.'''
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == '.csv':
+        with open(ruta, 'w', newline='', encoding='utf-8') as archivo:
+            escritor = csv.DictWriter(archivo, fieldnames=COLUMNAS)
+            escritor.writeheader()
+            escritor.writerows(filas)
+        return
+    columnas = {columna: np.array([fila[columna] for fila in filas]) for columna in COLUMNAS}
+    if extension == '.npz':
+        np.savez_compressed(ruta, **columnas)
+    elif extension == '.parquet':
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("Para guardar en Parquet hace falta instalar pyarrow (o usar .csv / .npz).")
+        pq.write_table(pa.table(columnas), ruta)
+    else:
+        raise ValueError(f"Formato de salida no soportado: '{extension}'. Usar {', '.join(FORMATOS)}.")
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--figus-total", type=int, nargs="+", default=[680])
+    parser.add_argument("--figus-paquete", type=int, nargs="+", default=[5])
+    parser.add_argument("--amigos", type=int, nargs="+", default=[1], help="personas que intercambian repetidas")
+    parser.add_argument("--simulaciones", type=int, default=10000, help="simulaciones por combinación")
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--procesos", type=int, default=None, help="por defecto, uno por núcleo")
+    parser.add_argument("--salida", default="barrido.csv")
+    args = parser.parse_args(argumentos)
+
+    # dict.fromkeys descarta las combinaciones repetidas (--amigos 1 1) sin cambiar el orden
+    combinaciones = list(dict.fromkeys(c for c in itertools.product(args.figus_total, args.figus_paquete, args.amigos)
+                                       if 0 < c[1] <= c[0] and c[2] >= 1))
+    extension = os.path.splitext(args.salida)[1].lower()
+    if extension not in FORMATOS:
+        parser.error(f"--salida debe terminar en {', '.join(FORMATOS)}.")
+    if extension == '.parquet':
+        # Antes de simular: si falta pyarrow, guardar() fallaría recién al final del barrido
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            parser.error("Para guardar en Parquet hace falta instalar pyarrow (o usar .csv / .npz).")
+    if args.simulaciones < 1:
+        parser.error("--simulaciones debe ser al menos 1.")
+    if not combinaciones:
+        parser.error("No hay combinaciones válidas (figus_paquete debe estar entre 1 y figus_total, amigos >= 1).")
+
+    inicio = time.perf_counter()
+    resumenes = barrer(combinaciones, args.simulaciones, args.semilla, args.procesos)
+    filas = [fila_resumen(combinacion, resumenes[combinacion]) for combinacion in combinaciones]
+    try:
+        guardar(filas, args.salida)
+    except ValueError as error:
+        print(f"Error: {error}")
+        sys.exit(1)
+
+    for fila in filas:
+        print(f"{fila['figus_total']:>5} figus, paquetes de {fila['figus_paquete']:>3}, {fila['amigos']:>2} amigos: "
+              f"{fila['media']:9.2f} ± {fila['error_estandar']:.2f} paquetes por persona (p95 {fila['p95']:.1f})")
+    print(f"\n{len(filas)} combinaciones en {time.perf_counter() - inicio:.1f} s -> {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# benchmark_album.py
+"""
+Velocidad de la simulación del álbum:
+
+- cuantos_paquetes (album.py), un álbum por vez con listas de Python
+- simular_albumes (motor_album.py), muchos álbumes a la vez con NumPy
+
+Además compara las dos muestras (media, desvío y distancia de Kolmogorov-Smirnov)
+para verificar que el motor vectorizado da la misma distribución.
+
+Uso (desde Estadistica):
+    python benchmarks/benchmark_album.py --referencia 300 --vectorizado 100000
+"""
+
+import argparse
+import os
+import random as rd
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from album import cuantos_paquetes
+from motor_album import simular_albumes
+
+
+def distancia_ks(muestra_a, muestra_b):
+    """Máxima diferencia entre las distribuciones empíricas de las dos muestras."""
+    valores = np.union1d(muestra_a, muestra_b)
+    acumulada_a = np.searchsorted(np.sort(muestra_a), valores, side="right") / len(muestra_a)
+    acumulada_b = np.searchsorted(np.sort(muestra_b), valores, side="right") / len(muestra_b)
+    return np.abs(acumulada_a - acumulada_b).max()
+
+
+def informar(nombre, resultados, transcurrido):
+    print(f"{nombre:>32}: {len(resultados) / transcurrido:>12,.1f} álbumes/s | "
+          f"media {resultados.mean():8.2f} ± {resultados.std(ddof=1) / np.sqrt(len(resultados)):.2f} | "
+          f"desvío {resultados.std(ddof=1):7.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--figus-total", type=int, default=680)
+    parser.add_argument("--figus-paquete", type=int, default=5)
+    parser.add_argument("--referencia", type=int, default=300, help="álbumes simulados con cuantos_paquetes")
+    parser.add_argument("--vectorizado", type=int, default=100000, help="álbumes simulados con simular_albumes")
+    parser.add_argument("--semilla", type=int, default=1234)
+    args = parser.parse_args()
+
+    rd.seed(args.semilla)
+    inicio = time.perf_counter()
+    referencia = np.array([cuantos_paquetes(args.figus_total, args.figus_paquete) for _ in range(args.referencia)])
+    tiempo_referencia = time.perf_counter() - inicio
+    informar("cuantos_paquetes", referencia, tiempo_referencia)
+
+    inicio = time.perf_counter()
+    vectorizado = simular_albumes(args.figus_total, args.figus_paquete, args.vectorizado, rng=args.semilla)
+    tiempo_vectorizado = time.perf_counter() - inicio
+    informar("simular_albumes", vectorizado, tiempo_vectorizado)
+
+    aceleracion = (args.vectorizado / tiempo_vectorizado) / (args.referencia / tiempo_referencia)
+    print(f"\nAceleración: {aceleracion:,.0f}x")
+
+    # Con muestras de la misma distribución, la distancia KS supera este valor solo el 1% de las veces
+    distancia = distancia_ks(referencia, vectorizado)
+    critico = 1.63 * np.sqrt((len(referencia) + len(vectorizado)) / (len(referencia) * len(vectorizado)))
+    print(f"Distancia KS: {distancia:.4f} (valor crítico al 1%: {critico:.4f})")
+    if distancia > critico:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
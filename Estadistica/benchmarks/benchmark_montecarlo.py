@@ -0,0 +1,57 @@
+# benchmark_montecarlo.py
+"""
+Escalado de simular_en_paralelo (montecarlo.py) con la cantidad de procesos.
+
+Para cada cantidad de procesos simula los mismos álbumes con la misma semilla,
+mide álbumes/s y verifica que el resumen sea idéntico en todas las corridas.
+Al final informa la memoria máxima del proceso principal, que no depende de --simulaciones.
+
+Uso (desde Estadistica):
+    python benchmarks/benchmark_montecarlo.py --simulaciones 1000000 --procesos 1 2 4 8
+"""
+
+import argparse
+import os
+import resource
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from montecarlo import simular_en_paralelo
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--figus-total", type=int, default=680)
+    parser.add_argument("--figus-paquete", type=int, default=5)
+    parser.add_argument("--simulaciones", type=int, default=200000)
+    parser.add_argument("--procesos", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--semilla", type=int, default=1234)
+    args = parser.parse_args()
+
+    referencia = None
+    velocidad_un_proceso = None
+    for procesos in args.procesos:
+        inicio = time.perf_counter()
+        resumen = simular_en_paralelo(args.figus_total, args.figus_paquete, args.simulaciones,
+                                      semilla=args.semilla, procesos=procesos)
+        velocidad = args.simulaciones / (time.perf_counter() - inicio)
+        velocidad_un_proceso = velocidad_un_proceso or velocidad
+        print(f"{procesos:>3} procesos: {velocidad:>10,.0f} álbumes/s ({velocidad / velocidad_un_proceso:4.1f}x) | "
+              f"media {resumen.media():.2f} ± {resumen.desvio() / resumen.n ** 0.5:.2f} | "
+              f"desvío {resumen.desvio():.2f} | mediana {resumen.cuantil(0.5)} | p95 {resumen.cuantil(0.95)}")
+        if referencia is None:
+            referencia = resumen
+        elif not np.array_equal(referencia.frecuencias, resumen.frecuencias):
+            print("El resumen cambió con la cantidad de procesos")
+            sys.exit(1)
+
+    memoria = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"\nMemoria máxima del proceso principal: {memoria:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# validacion_exacto.py
+"""
+Compara la distribución exacta (exacto.py) con la simulación (motor_album.py)
+para varias combinaciones de figus_total y figus_paquete:
+
+- media simulada contra la exacta, en errores estándar (z)
+- desvío simulado contra el exacto
+- distancia de Kolmogorov-Smirnov entre la distribución empírica y la exacta
+
+Termina con error si alguna combinación no pasa. También mide cuánto tarda el
+cálculo exacto la primera vez y con la caché.
+
+Uso (desde Estadistica):
+    python benchmarks/validacion_exacto.py --simulaciones 20000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from exacto import distribucion_paquetes
+from motor_album import simular_albumes
+
+PARAMETROS = [(10, 1), (50, 7), (100, 100), (200, 3), (680, 5), (680, 1)]
+
+
+def distancia_ks(resultados, distribucion):
+    """Máxima diferencia entre la distribución empírica de los resultados y la exacta."""
+    paquetes = np.arange(max(resultados.max(), len(distribucion.cdf) - 1) + 1)
+    empirica = np.searchsorted(np.sort(resultados), paquetes, side="right") / len(resultados)
+    exacta = np.array([distribucion.probabilidad_completar(p) for p in paquetes])
+    return np.abs(empirica - exacta).max()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--simulaciones", type=int, default=20000)
+    parser.add_argument("--semilla", type=int, default=1234)
+    args = parser.parse_args()
+
+    # Con la distribución verdadera, |z| > 3.3 o una distancia KS mayor al valor crítico pasan menos del 0.1% de las veces
+    critico_ks = 1.95 / np.sqrt(args.simulaciones)
+    fallas = 0
+    for figus_total, figus_paquete in PARAMETROS:
+        inicio = time.perf_counter()
+        distribucion = distribucion_paquetes(figus_total, figus_paquete)
+        tiempo_exacto = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        distribucion_paquetes(figus_total, figus_paquete)
+        tiempo_cache = time.perf_counter() - inicio
+
+        resultados = simular_albumes(figus_total, figus_paquete, args.simulaciones, rng=args.semilla)
+        z = (resultados.mean() - distribucion.media) / (distribucion.desvio / np.sqrt(args.simulaciones) or 1)
+        distancia = distancia_ks(resultados, distribucion)
+        paso = abs(z) <= 3.3 and distancia <= critico_ks
+        fallas += not paso
+        print(f"{figus_total:>4} / {figus_paquete:<3} | media exacta {distribucion.media:8.2f} simulada {resultados.mean():8.2f} "
+              f"(z {z:+5.2f}) | desvío {distribucion.desvio:7.2f} / {resultados.std(ddof=1):7.2f} | "
+              f"KS {distancia:.4f} | exacto {tiempo_exacto * 1000:7.1f} ms, caché {tiempo_cache * 1e6:4.1f} µs | "
+              f"{'ok' if paso else 'FALLA'}")
+
+    print(f"\nValor crítico KS: {critico_ks:.4f}")
+    if fallas:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
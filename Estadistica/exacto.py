@@ -0,0 +1,126 @@
+# Cálculo exacto de la distribución de paquetes necesarios para completar el álbum
+from functools import lru_cache
+
+import numpy as np
+
+### ------     CÁLCULO EXACTO  ---------
+
+# Lo único que importa del álbum para saber cuánto falta es cuántas figuritas faltan (m).
+# Al comprar un paquete, la cantidad de figuritas nuevas j es hipergeométrica: de las
+# figus_paquete figuritas distintas del paquete, j salen de las m faltantes y el resto de
+# las figus_total - m que ya están pegadas. Eso arma una cadena de Markov sobre m, que
+# arranca en figus_total y termina en 0; la cantidad de paquetes es el tiempo hasta llegar a 0.
+
+
+def probabilidades_nuevas(figus_total, figus_paquete):
+    '''
+    Matriz de (figus_total + 1) × (figus_paquete + 1) con la probabilidad de que un paquete
+    traiga j figuritas nuevas cuando faltan m: P[m, j] = C(m, j) C(figus_total - m, figus_paquete - j) / C(figus_total, figus_paquete).
+    '''
+    # Con logaritmos de factoriales para que los combinatorios grandes no se desborden
+    log_factorial = np.concatenate([[0.0], np.cumsum(np.log(np.arange(1, figus_total + 1)))])
+
+    def log_combinatorio(n, r):
+        valido = (r >= 0) & (r <= n)
+        n, r = np.where(valido, n, 0), np.where(valido, r, 0)
+        return np.where(valido, log_factorial[n] - log_factorial[r] - log_factorial[n - r], -np.inf)
+
+    faltantes = np.arange(figus_total + 1)[:, None]
+    nuevas = np.arange(figus_paquete + 1)[None, :]
+    logaritmos = (log_combinatorio(faltantes, nuevas)
+                  + log_combinatorio(figus_total - faltantes, figus_paquete - nuevas)
+                  - log_combinatorio(np.array(figus_total), np.array(figus_paquete)))
+    probabilidades = np.exp(logaritmos)
+    # Cada fila suma 1 salvo por el redondeo de los logaritmos: se corrige para que la cadena no pierda ni gane masa
+    return probabilidades / probabilidades.sum(axis=1, keepdims=True)
+
+
+class DistribucionPaquetes:
+    '''
+    Distribución exacta de la cantidad de paquetes necesarios para completar el álbum.
+
+    pmf[t] es la probabilidad de completarlo justo con el paquete t y cdf[t] la de completarlo
+    con t paquetes o menos. Los vectores se cortan cuando lo que queda sin completar es menor
+    que la tolerancia; media y varianza no dependen de ese corte (se calculan aparte, exactas).
+    '''
+    def __init__(self, figus_total, figus_paquete, pmf, media, varianza):
+        self.figus_total = figus_total
+        self.figus_paquete = figus_paquete
+        self.pmf = pmf
+        self.cdf = np.cumsum(pmf)
+        self.media = media
+        self.varianza = varianza
+        self.pmf.flags.writeable = False  # Se comparte entre todos los que piden los mismos parámetros
+        self.cdf.flags.writeable = False
+
+    @property
+    def desvio(self):
+        return self.varianza ** 0.5
+
+    def probabilidad_completar(self, paquetes):
+        '''Probabilidad de completar el álbum con `paquetes` paquetes o menos.'''
+        if paquetes < 0:
+            return 0.0
+        return float(self.cdf[min(paquetes, len(self.cdf) - 1)])
+
+    def cuantil(self, probabilidad):
+        '''Menor cantidad de paquetes con la que se completa el álbum con al menos esa probabilidad.'''
+        return int(np.searchsorted(self.cdf, probabilidad))
+
+    def __repr__(self):
+        return (f"DistribucionPaquetes(figus_total={self.figus_total}, figus_paquete={self.figus_paquete}, "
+                f"media={self.media:.2f}, desvio={self.desvio:.2f})")
+
+
+def _momentos(transiciones):
+    # E[m] y E[T²] desde m faltantes, de m = 0 hacia arriba. Con j = 0 nuevas el estado
+    # se repite, por eso se despeja dividiendo por 1 - P[m, 0]
+    figus_total = len(transiciones) - 1
+    figus_paquete = transiciones.shape[1] - 1
+    esperanza = np.zeros(figus_total + 1)
+    segundo_momento = np.zeros(figus_total + 1)
+    for m in range(1, figus_total + 1):
+        j = np.arange(1, min(m, figus_paquete) + 1)
+        p = transiciones[m, j]
+        repetir = transiciones[m, 0]
+        esperanza[m] = (1 + p @ esperanza[m - j]) / (1 - repetir)
+        segundo_momento[m] = (repetir * (1 + 2 * esperanza[m])
+                              + p @ (1 + 2 * esperanza[m - j] + segundo_momento[m - j])) / (1 - repetir)
+    return esperanza[figus_total], segundo_momento[figus_total] - esperanza[figus_total] ** 2
+
+
+@lru_cache(maxsize=1024)
+def momentos_paquetes(figus_total, figus_paquete):
+    '''
+    Retorna (media, varianza) exactas de la cantidad de paquetes, sin calcular toda la
+    distribución: O(figus_total × figus_paquete), para barridos de muchos parámetros.
+    '''
+    if not 0 < figus_paquete <= figus_total:
+        raise ValueError("Cada paquete debe traer entre 1 y figus_total figuritas.")
+    return _momentos(probabilidades_nuevas(figus_total, figus_paquete))
+
+
+@lru_cache(maxsize=128)
+def distribucion_paquetes(figus_total, figus_paquete, tolerancia=1e-12):
+    '''
+    Retorna la DistribucionPaquetes exacta para un álbum de figus_total figuritas y
+    paquetes de figus_paquete. Se calcula una vez por combinación de parámetros.
+    '''
+    if not 0 < figus_paquete <= figus_total:
+        raise ValueError("Cada paquete debe traer entre 1 y figus_total figuritas.")
+    transiciones = probabilidades_nuevas(figus_total, figus_paquete)
+
+    # estado[m] = probabilidad de que falten m figuritas después de t paquetes
+    estado = np.zeros(figus_total + 1)
+    estado[figus_total] = 1.0
+    pmf = [0.0]
+    while estado[1:].sum() > tolerancia:
+        siguiente = np.zeros(figus_total + 1)
+        for j in range(figus_paquete + 1):
+            siguiente[:figus_total + 1 - j] += (estado * transiciones[:, j])[j:]
+        pmf.append(siguiente[0])   # Los que se completaron con este paquete
+        siguiente[0] = 0.0         # Y no se siguen
+        estado = siguiente
+
+    media, varianza = momentos_paquetes(figus_total, figus_paquete)
+    return DistribucionPaquetes(figus_total, figus_paquete, np.array(pmf), media, varianza)
@@ -0,0 +1,277 @@
+# Simulación de Monte Carlo del álbum repartida entre varios procesos
+import argparse
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+
+from statistics import NormalDist
+
+import numpy as np
+
+from motor_album import simular_albumes
+
+
+class ResumenSimulaciones:
+    '''
+    Resumen de los resultados de muchas simulaciones, que ocupa lo mismo sea cual sea
+    la cantidad de simulaciones: en lugar de guardar cada resultado se cuenta cuántas
+    veces salió cada cantidad de paquetes (un histograma).
+
+    Como los resultados son enteros, con el histograma la media, la varianza y los
+    cuantiles salen exactos, y dos resúmenes se combinan sumando sus histogramas:
+    el resultado no depende del orden en que terminan los procesos.
+    '''
+    def __init__(self):
+        self.frecuencias = np.zeros(0, dtype=np.int64)  # frecuencias[p] = simulaciones que usaron p paquetes
+
+    def _ampliar(self, largo):
+        if largo > len(self.frecuencias):
+            self.frecuencias = np.concatenate([self.frecuencias, np.zeros(largo - len(self.frecuencias), dtype=np.int64)])
+
+    def agregar(self, resultados):
+        '''Suma al resumen un vector de resultados (paquetes por álbum).'''
+        conteo = np.bincount(resultados)
+        self._ampliar(len(conteo))
+        self.frecuencias[:len(conteo)] += conteo
+        return self
+
+    def combinar(self, otro):
+        '''Suma al resumen los resultados de otro resumen.'''
+        self._ampliar(len(otro.frecuencias))
+        self.frecuencias[:len(otro.frecuencias)] += otro.frecuencias
+        return self
+
+    @property
+    def n(self):
+        return int(self.frecuencias.sum())
+
+    def media(self):
+        valores = np.arange(len(self.frecuencias))
+        return float((valores * self.frecuencias).sum() / self.n)
+
+    def varianza(self):
+        '''Varianza muestral (dividiendo por n - 1); nan con menos de dos simulaciones.'''
+        if self.n < 2:
+            return float('nan')
+        valores = np.arange(len(self.frecuencias))
+        desvios = valores - self.media()
+        return float((desvios * desvios * self.frecuencias).sum() / (self.n - 1))
+
+    def desvio(self):
+        return self.varianza() ** 0.5
+
+    def cuantil(self, probabilidad):
+        '''Menor cantidad de paquetes p tal que al menos esa proporción de simulaciones usó p o menos.'''
+        acumuladas = np.cumsum(self.frecuencias)
+        return int(np.searchsorted(acumuladas, max(probabilidad * self.n, 1)))
+
+    def intervalo_media(self, confianza=0.95):
+        '''Intervalo de confianza (inferior, superior) para la media, con la aproximación normal.'''
+        z = NormalDist().inv_cdf((1 + confianza) / 2)
+        semiancho = z * self.desvio() / self.n ** 0.5
+        return self.media() - semiancho, self.media() + semiancho
+
+    def intervalo_cuantil(self, probabilidad, confianza=0.95):
+        '''
+        Intervalo de confianza (inferior, superior) para un cuantil, sin suponer ninguna
+        distribución: entre los cuantiles empíricos de probabilidad ± z·√(p(1-p)/n).
+        '''
+        z = NormalDist().inv_cdf((1 + confianza) / 2)
+        margen = z * (probabilidad * (1 - probabilidad) / self.n) ** 0.5
+        return self.cuantil(max(probabilidad - margen, 0)), self.cuantil(min(probabilidad + margen, 1))
+
+    def minimo(self):
+        return int(np.flatnonzero(self.frecuencias)[0])
+
+    def maximo(self):
+        return int(np.flatnonzero(self.frecuencias)[-1])
+
+
+def _simular_tarea(figus_total, figus_paquete, cantidad, semilla, copias=1):
+    # Corre en un proceso trabajador: devuelve solo el resumen, no los resultados
+    resultados = simular_albumes(figus_total, figus_paquete, cantidad, rng=np.random.default_rng(semilla), copias=copias)
+    return ResumenSimulaciones().agregar(resultados)
+
+
+def dividir_en_tareas(n_simulaciones, semilla=None, tamano_tarea=20000):
+    '''
+    Divide n_simulaciones en tareas de hasta tamano_tarea álbumes. Retorna [(cantidad, semilla_tarea), ...].
+
+    Cada tarea usa su propio generador, creado con SeedSequence(semilla).spawn: las secuencias
+    son independientes entre sí y la misma semilla da el mismo resultado con cualquier cantidad
+    de procesos. semilla puede ser un entero, None o una SeedSequence.
+    '''
+    if not isinstance(semilla, np.random.SeedSequence):
+        semilla = np.random.SeedSequence(semilla)
+    cantidades = [min(tamano_tarea, n_simulaciones - inicio) for inicio in range(0, n_simulaciones, tamano_tarea)]
+    return list(zip(cantidades, semilla.spawn(len(cantidades))))
+
+
+def ejecutar_tareas(tareas, procesos=None):
+    '''
+    Corre las tareas en `procesos` procesos (por defecto, uno por núcleo) y retorna los
+    resúmenes a medida que terminan. `tareas` es un iterable de (clave, argumentos de
+    _simular_tarea); se retornan pares (clave, ResumenSimulaciones).
+
+    Nunca hay más de dos tareas por proceso en curso y las tareas se toman del iterable
+    recién cuando hay lugar, así que la memoria no crece con la cantidad de tareas.
+    '''
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1:
+        for clave, argumentos in tareas:
+            yield clave, _simular_tarea(*argumentos)
+        return
+
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        en_curso = {}
+        for clave, argumentos in tareas:
+            en_curso[ejecutor.submit(_simular_tarea, *argumentos)] = clave
+            if len(en_curso) >= 2 * procesos:
+                terminadas, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+                for tarea in terminadas:
+                    yield en_curso.pop(tarea), tarea.result()
+        for tarea in as_completed(en_curso):
+            yield en_curso[tarea], tarea.result()
+
+
+def simular_en_paralelo(figus_total, figus_paquete, n_simulaciones, semilla=None, procesos=None,
+                        tamano_tarea=20000, copias=1):
+    '''
+    Simula n_simulaciones álbumes repartidos entre `procesos` procesos (por defecto, uno
+    por núcleo) y retorna un ResumenSimulaciones.
+
+    El trabajo se divide en tareas de tamano_tarea álbumes, cada una con su propia semilla
+    (ver dividir_en_tareas), y la memoria no crece con n_simulaciones (ver ejecutar_tareas).
+    '''
+    tareas = ((None, (figus_total, figus_paquete, cantidad, semilla_tarea, copias))
+              for cantidad, semilla_tarea in dividir_en_tareas(n_simulaciones, semilla, tamano_tarea))
+    resumen = ResumenSimulaciones()
+    for _, resumen_tarea in ejecutar_tareas(tareas, procesos):
+        resumen.combinar(resumen_tarea)
+    return resumen
+
+
+class EstimacionSecuencial:
+    '''
+    Resultado de estimar_secuencial: la estimación (media o cuantil), su intervalo de
+    confianza, cuántas simulaciones se usaron y por qué se paró ('tolerancia', 'tiempo'
+    o 'maximo'). El resumen completo queda en `resumen`.
+    '''
+    def __init__(self, resumen, cuantil, estimacion, intervalo, motivo, segundos):
+        self.resumen = resumen
+        self.cuantil = cuantil
+        self.estimacion = estimacion
+        self.intervalo = intervalo
+        self.motivo = motivo
+        self.segundos = segundos
+
+    @property
+    def simulaciones(self):
+        return self.resumen.n
+
+    @property
+    def semiancho(self):
+        return (self.intervalo[1] - self.intervalo[0]) / 2
+
+    def __repr__(self):
+        objetivo = "media" if self.cuantil is None else f"cuantil {self.cuantil}"
+        return (f"EstimacionSecuencial({objetivo}={self.estimacion:.2f} ± {self.semiancho:.2f}, "
+                f"simulaciones={self.simulaciones}, motivo='{self.motivo}')")
+
+
+def _estimar(resumen, cuantil, confianza):
+    if cuantil is None:
+        return resumen.media(), resumen.intervalo_media(confianza)
+    return resumen.cuantil(cuantil), resumen.intervalo_cuantil(cuantil, confianza)
+
+
+def estimar_secuencial(figus_total, figus_paquete, tolerancia, cuantil=None, confianza=0.95,
+                       tiempo_maximo=None, maximo_simulaciones=None, minimo_simulaciones=2000,
+                       semilla=None, procesos=None, tamano_tarea=2000, copias=1):
+    '''
+    Simula de a tareas de tamano_tarea álbumes hasta que el intervalo de confianza de la media
+    (o del cuantil indicado, por ejemplo 0.95) tenga un semiancho menor o igual a tolerancia
+    (en paquetes), se pasen tiempo_maximo segundos o se llegue a maximo_simulaciones.
+    Retorna una EstimacionSecuencial con cuántas simulaciones hicieron falta.
+
+    Antes de minimo_simulaciones no se mira el intervalo: con pocos álbumes el desvío
+    estimado todavía no es confiable. Siempre se corre al menos una tarea, aunque
+    tiempo_maximo sea 0. El criterio se revisa cada vez que hay lugar para una tarea
+    nueva, así que al parar pueden terminar las que ya estaban en curso (hasta dos por
+    proceso): tiempo_maximo se puede pasar por lo que tarden esas. Con un solo proceso,
+    la misma semilla da siempre el mismo resultado; con varios, la cantidad de
+    simulaciones puede variar según el orden en que terminen las tareas.
+
+    Lanza ValueError si maximo_simulaciones o tamano_tarea son menores que 2 (con un solo
+    álbum no hay desvío ni intervalo), o si tolerancia no es positiva y no hay
+    tiempo_maximo ni maximo_simulaciones (no pararía nunca).
+    '''
+    if maximo_simulaciones is not None and maximo_simulaciones < 2:
+        raise ValueError("maximo_simulaciones debe ser al menos 2.")
+    if tamano_tarea < 2:
+        raise ValueError("tamano_tarea debe ser al menos 2.")
+    if tolerancia <= 0 and tiempo_maximo is None and maximo_simulaciones is None:
+        raise ValueError("Con tolerancia <= 0 hace falta tiempo_maximo o maximo_simulaciones para poder parar.")
+    semillas = semilla if isinstance(semilla, np.random.SeedSequence) else np.random.SeedSequence(semilla)
+    resumen = ResumenSimulaciones()
+    inicio = time.perf_counter()
+    motivo = None
+
+    def tareas():
+        nonlocal motivo
+        pedidas = 0
+        while True:
+            if resumen.n >= minimo_simulaciones:
+                _, (inferior, superior) = _estimar(resumen, cuantil, confianza)
+                if (superior - inferior) / 2 <= tolerancia:
+                    motivo = 'tolerancia'
+                    return
+            # Sin ninguna tarea no habría nada que estimar: el tiempo se mira desde la segunda
+            if pedidas and tiempo_maximo is not None and time.perf_counter() - inicio >= tiempo_maximo:
+                motivo = 'tiempo'
+                return
+            if maximo_simulaciones is not None and pedidas >= maximo_simulaciones:
+                motivo = 'maximo'
+                return
+            cantidad = tamano_tarea if maximo_simulaciones is None else min(tamano_tarea, maximo_simulaciones - pedidas)
+            pedidas += cantidad
+            yield None, (figus_total, figus_paquete, cantidad, semillas.spawn(1)[0], copias)
+
+    for _, resumen_tarea in ejecutar_tareas(tareas(), procesos):
+        resumen.combinar(resumen_tarea)
+    estimacion, intervalo = _estimar(resumen, cuantil, confianza)
+    return EstimacionSecuencial(resumen, cuantil, estimacion, intervalo, motivo, time.perf_counter() - inicio)
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(
+        description="Estima los paquetes necesarios para completar el álbum simulando hasta alcanzar una precisión.")
+    parser.add_argument("--figus-total", type=int, default=680)
+    parser.add_argument("--figus-paquete", type=int, default=5)
+    parser.add_argument("--tolerancia", type=float, default=1.0, help="semiancho máximo del intervalo, en paquetes")
+    parser.add_argument("--cuantil", type=float, default=None, help="estimar este cuantil (ej. 0.95) en lugar de la media")
+    parser.add_argument("--confianza", type=float, default=0.95)
+    parser.add_argument("--tiempo-maximo", type=float, default=None, help="segundos")
+    parser.add_argument("--maximo-simulaciones", type=int, default=None)
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--procesos", type=int, default=None, help="por defecto, uno por núcleo")
+    args = parser.parse_args(argumentos)
+    if args.tiempo_maximo is not None and args.tiempo_maximo <= 0:
+        parser.error("--tiempo-maximo debe ser mayor que 0.")
+    if args.maximo_simulaciones is not None and args.maximo_simulaciones < 2:
+        parser.error("--maximo-simulaciones debe ser al menos 2.")
+    if args.tolerancia <= 0 and args.tiempo_maximo is None and args.maximo_simulaciones is None:
+        parser.error("Con --tolerancia <= 0 hace falta --tiempo-maximo o --maximo-simulaciones.")
+
+    resultado = estimar_secuencial(args.figus_total, args.figus_paquete, args.tolerancia, cuantil=args.cuantil,
+                                   confianza=args.confianza, tiempo_maximo=args.tiempo_maximo,
+                                   maximo_simulaciones=args.maximo_simulaciones, semilla=args.semilla,
+                                   procesos=args.procesos)
+    objetivo = "Media" if args.cuantil is None else f"Cuantil {args.cuantil}"
+    print(f"{objetivo} de paquetes necesarios: {resultado.estimacion:.2f} ± {resultado.semiancho:.2f} "
+          f"(intervalo del {args.confianza:.0%}: {resultado.intervalo[0]:.2f} a {resultado.intervalo[1]:.2f})")
+    print(f"Simulaciones: {resultado.simulaciones} en {resultado.segundos:.1f} s (se paró por: {resultado.motivo})")
+
+
+if __name__ == "__main__":
+    main()
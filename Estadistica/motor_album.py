@@ -0,0 +1,88 @@
+# Motor vectorizado para simular muchos álbumes a la vez
+import numpy as np
+
+### ------     SIMULACIÓN VECTORIZADA  ---------
+
+# La versión de album.py guarda cada álbum en una lista, arma list(range(figus_total)) para
+# cada paquete y recorre las figus_total posiciones después de cada paquete para saber si
+# el álbum está completo: cada simulación cuesta O(paquetes × figus_total).
+# Acá cada fila de una matriz booleana es un álbum, los paquetes de todos los álbumes se
+# sortean juntos y se lleva la cuenta de figuritas faltantes de cada álbum, que baja con
+# cada figurita nueva: el álbum está completo cuando llega a cero, sin volver a recorrerlo.
+#
+# Con copias > 1 se simula un grupo de `copias` amigos que compran paquetes en común y se
+# pasan las repetidas: el grupo completa todos sus álbumes cuando junta `copias` ejemplares
+# de cada figurita. Cada fila cuenta entonces los ejemplares de cada figurita (hasta `copias`).
+
+
+def comprar_paquetes(figus_total, figus_paquete, cantidad, rng):
+    '''
+    Genera `cantidad` paquetes de figus_paquete figuritas diferentes cada uno, elegidas
+    al azar entre las figus_total posibles. Retorna una matriz de cantidad × figus_paquete.
+
+    Usa el algoritmo de Floyd: la figurita i se elige entre 0 y figus_total - figus_paquete + i,
+    y si ya estaba en el paquete se toma la última de ese rango, que seguro no está.
+    Cada paquete posible sale con la misma probabilidad, igual que con rd.sample.
+    '''
+    paquetes = np.empty((cantidad, figus_paquete), dtype=np.int64)
+    for i, tope in enumerate(range(figus_total - figus_paquete, figus_total)):
+        figuras = rng.integers(0, tope + 1, size=cantidad)
+        repetidas = (paquetes[:, :i] == figuras[:, None]).any(axis=1)
+        paquetes[:, i] = np.where(repetidas, tope, figuras)
+    return paquetes
+
+
+def _simular_lote(figus_total, figus_paquete, n_albumes, rng, copias):
+    # Los álbumes son filas de una matriz n_albumes × figus_total, guardada como un vector plano:
+    # la figurita f del álbum a está en la posición a * figus_total + f
+    album = np.zeros(n_albumes * figus_total, dtype=bool if copias == 1 else np.min_scalar_type(copias))
+    resultados = np.zeros(n_albumes, dtype=np.int64)
+    # Solo se siguen comprando paquetes para los álbumes incompletos (activos)
+    activos = np.arange(n_albumes)
+    inicio_fila = activos * figus_total
+    faltantes = np.full(n_albumes, figus_total * copias)  # Figuritas que le faltan a cada álbum activo
+    paquetes_comprados = 0
+    while activos.size:
+        paquetes_comprados += 1
+        posiciones = comprar_paquetes(figus_total, figus_paquete, activos.size, rng)
+        posiciones += inicio_fila[:, None]
+        # Las figuritas de un paquete son distintas: las útiles son las que todavía no estaban pegadas
+        # (o, con copias > 1, las que el grupo todavía no juntó `copias` veces)
+        if copias == 1:
+            faltantes -= figus_paquete - album[posiciones].sum(axis=1)
+            album[posiciones] = True
+        else:
+            utiles = album[posiciones] < copias
+            faltantes -= utiles.sum(axis=1)
+            album[posiciones[utiles]] += 1
+        completos = faltantes == 0
+        if completos.any():
+            resultados[activos[completos]] = paquetes_comprados
+            incompletos = ~completos
+            activos = activos[incompletos]
+            inicio_fila = inicio_fila[incompletos]
+            faltantes = faltantes[incompletos]
+    return resultados
+
+
+def simular_albumes(figus_total, figus_paquete, n_albumes, rng=None, tamano_lote=10000, copias=1):
+    '''
+    Simula n_albumes álbumes y retorna un vector con la cantidad de paquetes que
+    necesitó cada uno para completarse (la misma distribución que cuantos_paquetes).
+    Con copias > 1, cada resultado es el total de paquetes que compró un grupo de
+    `copias` amigos que intercambian repetidas hasta completar todos sus álbumes.
+
+    rng puede ser una semilla o un numpy.random.Generator. Los álbumes se simulan de a
+    tamano_lote por vez, para que la matriz de álbumes no ocupe más de
+    tamano_lote × figus_total bytes.
+    '''
+    if not 0 < figus_paquete <= figus_total:
+        raise ValueError("Cada paquete debe traer entre 1 y figus_total figuritas.")
+    if copias < 1:
+        raise ValueError("Hace falta al menos una copia de cada figurita.")
+    rng = np.random.default_rng(rng)
+    resultados = np.empty(n_albumes, dtype=np.int64)
+    for inicio in range(0, n_albumes, tamano_lote):
+        fin = min(inicio + tamano_lote, n_albumes)
+        resultados[inicio:fin] = _simular_lote(figus_total, figus_paquete, fin - inicio, rng, copias)
+    return resultados
@@ -0,0 +1,7 @@
+"""
+Código compartido por las aplicaciones de IFTS (ev3, ev3_solo_python y ev3_probandoCodigo).
+
+Las aplicaciones se ejecutan desde su propia carpeta, así que cada una agrega la carpeta
+IFTS al path en un solo lugar antes de importar de acá: services/__init__.py en
+ev3_solo_python, database.py en ev3 y validations.py en ev3_probandoCodigo.
+"""
@@ -0,0 +1,222 @@
+import json
+import os
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import bcrypt
+
+
+class ServicioSaturadoError(Exception):
+    """Se lanza cuando la cola del servicio está llena y no se liberó lugar a tiempo."""
+
+
+# Funciones a nivel de módulo para que el pool de procesos pueda serializarlas
+def _hashear(contrasena_bytes, rondas):
+    return bcrypt.hashpw(contrasena_bytes, bcrypt.gensalt(rounds=rondas))
+
+
+def _verificar(contrasena_bytes, contrasena_hasheada):
+    return bcrypt.checkpw(contrasena_bytes, contrasena_hasheada)
+
+
+def rondas_de_hash(contrasena_hasheada):
+    """Factor de trabajo de un hash bcrypt ('$2b$12$...' -> 12), o None si no tiene ese formato."""
+    if isinstance(contrasena_hasheada, str):
+        contrasena_hasheada = contrasena_hasheada.encode('utf-8')
+    partes = contrasena_hasheada.split(b"$")
+    if len(partes) < 4 or not partes[2].isdigit():
+        return None
+    return int(partes[2])
+
+
+def calibrar_rondas(objetivo_ms=250, min_rondas=12, max_rondas=16, muestras=5):
+    """
+    Mide bcrypt en esta máquina y retorna el factor de trabajo más alto cuya verificación
+    tarda como mucho objetivo_ms milisegundos (nunca menos que min_rondas; el 12 por
+    defecto es el costo que se usaba antes, así la calibración solo puede subirlo).
+    Cada ronda extra duplica el costo, así que se mide subiendo de a una hasta pasarse.
+    De cada factor se toma la mediana de varias mediciones, para que una sola medición
+    lenta (o rápida) no cambie el resultado.
+    """
+    contrasena = b"calibracion-bcrypt"
+    elegidas = min_rondas
+    for rondas in range(min_rondas, max_rondas + 1):
+        contrasena_hasheada = _hashear(contrasena, rondas)
+        tiempos = []
+        for _ in range(muestras):
+            inicio = time.perf_counter()
+            _verificar(contrasena, contrasena_hasheada)
+            tiempos.append(time.perf_counter() - inicio)
+        if statistics.median(tiempos) * 1000 > objetivo_ms:
+            break
+        elegidas = rondas
+    return elegidas
+
+
+def rondas_configuradas(ruta, objetivo_ms=250):
+    """
+    Factor de trabajo guardado en `ruta` (JSON). Si no existe, o se guardó para otro
+    objetivo_ms, se calibra y se guarda: así se calibra una sola vez por máquina y no
+    en cada arranque, y un reinicio no cambia el factor. Para recalibrar, borrar el archivo.
+    """
+    if os.path.exists(ruta):
+        with open(ruta, encoding="utf-8") as archivo:
+            configuracion = json.load(archivo)
+        if configuracion.get("objetivo_ms") == objetivo_ms:
+            return configuracion["rondas"]
+    rondas = calibrar_rondas(objetivo_ms)
+    temporal = ruta + ".tmp"
+    with open(temporal, "w", encoding="utf-8") as archivo:
+        json.dump({"rondas": rondas, "objetivo_ms": objetivo_ms}, archivo)
+    os.replace(temporal, ruta)
+    return rondas
+
+
+class ServicioHashing:
+    """
+    Hashea y verifica contraseñas con bcrypt en un pool de trabajadores,
+    para que una ráfaga de logins use todos los núcleos en lugar de uno solo.
+
+    - modo="hilos": ThreadPoolExecutor. bcrypt libera el GIL mientras calcula,
+      así que los hilos corren en paralelo de verdad.
+    - modo="procesos": ProcessPoolExecutor, alternativa si el bcrypt instalado no libera el GIL.
+
+    La cola de trabajos está acotada (max_pendientes): si está llena, quien llama espera hasta
+    timeout_encolado segundos y después recibe ServicioSaturadoError (contrapresión).
+
+    Con rondas=None el factor de trabajo se calibra al crear el servicio (calibrar_rondas)
+    para que una verificación tarde alrededor de objetivo_ms en este hardware; con
+    ruta_configuracion, además, se guarda y se reutiliza (rondas_configuradas).
+    """
+    def __init__(self, trabajadores=None, modo="hilos", rondas=12, max_pendientes=None,
+                 timeout_encolado=5.0, muestras_latencia=1000, objetivo_ms=250, ruta_configuracion=None):
+        if modo not in ("hilos", "procesos"):
+            raise ValueError("Modo no válido. Debe ser 'hilos' o 'procesos'.")
+        self.trabajadores = trabajadores or os.cpu_count() or 1
+        self.modo = modo
+        if rondas is None:
+            rondas = rondas_configuradas(ruta_configuracion, objetivo_ms) if ruta_configuracion else calibrar_rondas(objetivo_ms)
+        self.rondas = rondas
+        self.max_pendientes = max_pendientes or self.trabajadores * 4
+        self.timeout_encolado = timeout_encolado
+
+        clase_pool = ThreadPoolExecutor if modo == "hilos" else ProcessPoolExecutor
+        self._pool = clase_pool(max_workers=self.trabajadores)
+        self._lugares = threading.BoundedSemaphore(self.max_pendientes)
+        self._lock = threading.Lock()
+        self._latencias = {"hashear": deque(maxlen=muestras_latencia), "verificar": deque(maxlen=muestras_latencia)}
+        self._metricas = {"hashear": 0, "verificar": 0, "rechazadas": 0, "pendientes": 0, "rehasheadas": 0}
+
+    # --- Envío de trabajos ---
+
+    def _enviar(self, operacion, funcion, *argumentos):
+        if not self._lugares.acquire(timeout=self.timeout_encolado):
+            with self._lock:
+                self._metricas["rechazadas"] += 1
+            raise ServicioSaturadoError(
+                f"El servicio de hashing tiene {self.max_pendientes} trabajos pendientes; intente más tarde."
+            )
+        inicio = time.perf_counter()
+        with self._lock:
+            self._metricas["pendientes"] += 1
+        try:
+            futuro = self._pool.submit(funcion, *argumentos)
+        except Exception:
+            self._liberar()
+            raise
+
+        def al_terminar(_):
+            latencia = time.perf_counter() - inicio  # Espera en cola + cálculo
+            with self._lock:
+                self._metricas[operacion] += 1
+                self._latencias[operacion].append(latencia)
+            self._liberar()
+
+        futuro.add_done_callback(al_terminar)
+        return futuro
+
+    def _liberar(self):
+        with self._lock:
+            self._metricas["pendientes"] -= 1
+        self._lugares.release()
+
+    def hashear_async(self, contrasena):
+        """Encola el hash de la contraseña y retorna un Future con el hash (bytes)."""
+        return self._enviar("hashear", _hashear, contrasena.encode('utf-8'), self.rondas)
+
+    def verificar_async(self, contrasena, contrasena_hasheada):
+        """Encola la verificación y retorna un Future con True/False."""
+        return self._enviar("verificar", _verificar, contrasena.encode('utf-8'), contrasena_hasheada)
+
+    def hashear(self, contrasena):
+        """Hashea la contraseña en el pool y espera el resultado."""
+        return self.hashear_async(contrasena).result()
+
+    def verificar(self, contrasena, contrasena_hasheada):
+        """Verifica la contraseña en el pool y espera el resultado."""
+        return self.verificar_async(contrasena, contrasena_hasheada).result()
+
+    def necesita_rehash(self, contrasena_hasheada):
+        """
+        True si el hash se generó con un factor de trabajo menor que el configurado.
+        Los hashes con un factor mayor se dejan como están: rehashearlos los debilitaría.
+        """
+        rondas = rondas_de_hash(contrasena_hasheada)
+        return rondas is None or rondas < self.rondas
+
+    def rehashear_si_corresponde(self, contrasena, contrasena_hasheada):
+        """
+        Llamar después de una verificación exitosa. Si el hash quedó con un factor de trabajo
+        menor que el actual, retorna uno nuevo con el factor actual; si no, retorna None.
+        """
+        if not self.necesita_rehash(contrasena_hasheada):
+            return None
+        nuevo_hash = self.hashear(contrasena)
+        with self._lock:
+            self._metricas["rehasheadas"] += 1
+        return nuevo_hash
+
+    # --- Métricas y cierre ---
+
+    def obtener_metricas(self):
+        """Retorna contadores y latencias (p50/p99/máxima, en milisegundos) de cada operación."""
+        with self._lock:
+            metricas = dict(self._metricas)
+            latencias = {operacion: sorted(valores) for operacion, valores in self._latencias.items()}
+        for operacion, valores in latencias.items():
+            if valores:
+                metricas[f"{operacion}_p50_ms"] = valores[len(valores) // 2] * 1000
+                metricas[f"{operacion}_p99_ms"] = valores[min(len(valores) - 1, int(len(valores) * 0.99))] * 1000
+                metricas[f"{operacion}_max_ms"] = valores[-1] * 1000
+        return metricas
+
+    def cerrar(self):
+        self._pool.shutdown(wait=True)
+
+
+_servicio_por_defecto = None
+_lock_por_defecto = threading.Lock()
+
+# Donde se guarda el factor de trabajo calibrado si no se indica otro lugar (opcional)
+RUTA_CONFIGURACION_POR_DEFECTO = os.environ.get("IFTS_CONFIG_HASHING")
+
+
+def obtener_servicio_por_defecto(ruta_configuracion=None):
+    """
+    Servicio compartido por los gestores que no reciben uno propio (se crea la primera vez).
+    Con ruta_configuracion (o la variable de entorno IFTS_CONFIG_HASHING) el factor de trabajo
+    se calibra para esta máquina la primera vez y queda guardado ahí; sin ruta se usa el factor
+    fijo de ServicioHashing, sin calibrar ni escribir nada. Vale la ruta del primer llamado.
+    """
+    global _servicio_por_defecto
+    with _lock_por_defecto:
+        if _servicio_por_defecto is None:
+            ruta_configuracion = ruta_configuracion or RUTA_CONFIGURACION_POR_DEFECTO
+            if ruta_configuracion:
+                _servicio_por_defecto = ServicioHashing(rondas=None, ruta_configuracion=ruta_configuracion)
+            else:
+                _servicio_por_defecto = ServicioHashing()
+        return _servicio_por_defecto
@@ -0,0 +1,196 @@
+import math
+import unicodedata
+from array import array
+from collections import Counter
+
+from comun.sorted_index import IndiceOrdenado
+
+# Campos de usuario que se pueden buscar, y los que admiten búsqueda aproximada (con errores de tipeo).
+# Son los de ev3_solo_python; ev3 indexa los de su base y le pasa los suyos a IndiceBusqueda.
+# Email y DNI solo por prefijo: el email suele repetir el nombre de usuario y duplicaría el índice de trigramas.
+CAMPOS_BUSQUEDA = ('nombre_usuario', 'nombre', 'apellido', 'email', 'dni')
+CAMPOS_APROXIMADOS = ('nombre_usuario', 'nombre', 'apellido')
+CAMPOS_POR_PALABRA = ('nombre', 'apellido')  # "María José" se indexa como "maria" y "jose"
+
+SEPARADOR = "\x00"  # Separa término e id en las claves del índice de prefijos (ordena antes que cualquier letra)
+
+
+def normalizar(texto):
+    """Minúsculas y sin acentos, para que 'García' y 'garcia' se encuentren igual."""
+    texto = texto.lower()
+    if texto.isascii():
+        return texto
+    return "".join(c for c in unicodedata.normalize("NFKD", texto) if not unicodedata.combining(c))
+
+
+def trigramas(termino):
+    """Conjunto de trigramas del término, con relleno para que el principio y el final pesen más."""
+    relleno = f"  {termino} "
+    return {relleno[i:i + 3] for i in range(len(relleno) - 2)} if termino else set()
+
+
+def valores_de_usuario(usuario):
+    """Valores buscables de un usuario (o vista de usuario), por campo."""
+    perfil = usuario.perfil
+    valores = {'nombre_usuario': usuario.nombre_usuario}
+    for campo in CAMPOS_BUSQUEDA[1:]:
+        valores[campo] = getattr(perfil, campo) if perfil is not None else ""
+    return valores
+
+
+class IndiceBusqueda:
+    """
+    Índice de búsqueda de usuarios por prefijo y por parecido.
+
+    - Prefijo: por cada campo, un IndiceOrdenado de claves "término\\x00id_usuario".
+      Buscar "gar" es una búsqueda binaria más un recorrido de los resultados.
+    - Parecido: índice invertido trigrama -> términos. Se cuenta cuántos trigramas comparte
+      cada término con la consulta recorriendo solo las listas de sus trigramas, y con la
+      cantidad de trigramas de cada término (guardada al indexarlo) sale la similitud de Jaccard.
+      Los términos se guardan una sola vez aunque los usen muchos usuarios, y un término
+      que deja de usarse queda en el índice sin resultados (se descarta al buscar).
+
+    Se actualiza de a un usuario (agregar, quitar, actualizar). Los ids de usuario deben ser enteros.
+    Como IndiceOrdenado, no se debe leer y modificar desde hilos distintos sin lock.
+    """
+    def __init__(self, campos=CAMPOS_BUSQUEDA, campos_aproximados=CAMPOS_APROXIMADOS,
+                 campos_por_palabra=CAMPOS_POR_PALABRA):
+        self.campos = tuple(campos)
+        self.campos_aproximados = tuple(campos_aproximados)
+        self.campos_por_palabra = frozenset(campos_por_palabra)
+        self._prefijos = {campo: IndiceOrdenado() for campo in self.campos}
+        self._numero_termino = {}   # término -> número de término
+        self._terminos = []         # número de término -> término
+        self._usos = array('L')     # número de término -> cuántas veces aparece hoy en campos aproximados
+        self._largos = array('H')   # número de término -> cantidad de trigramas del término
+        self._trigramas = {}        # trigrama -> array de números de término
+
+    def _terminos_de(self, campo, valor):
+        if not valor:
+            return set()
+        valor = normalizar(str(valor))
+        return set(valor.split()) if campo in self.campos_por_palabra else {valor.strip()} - {""}
+
+    def _contar_uso(self, termino, diferencia):
+        numero = self._numero_termino.get(termino)
+        if numero is None:
+            numero = len(self._terminos)
+            self._numero_termino[termino] = numero
+            self._terminos.append(termino)
+            self._usos.append(0)
+            trigramas_termino = trigramas(termino)
+            self._largos.append(min(len(trigramas_termino), 0xFFFF))
+            for trigrama in trigramas_termino:
+                self._trigramas.setdefault(trigrama, array('L')).append(numero)
+        self._usos[numero] += diferencia
+
+    def _agregar_terminos(self, id_usuario, campo, terminos):
+        for termino in terminos:
+            self._prefijos[campo].agregar(f"{termino}{SEPARADOR}{id_usuario}")
+            if campo in self.campos_aproximados:
+                self._contar_uso(termino, 1)
+
+    def _quitar_terminos(self, id_usuario, campo, terminos):
+        for termino in terminos:
+            self._prefijos[campo].quitar(f"{termino}{SEPARADOR}{id_usuario}")
+            if campo in self.campos_aproximados:
+                self._contar_uso(termino, -1)
+
+    # --- Mantenimiento ---
+
+    def agregar(self, id_usuario, valores):
+        """Indexa un usuario. `valores` es un diccionario campo -> valor (ver valores_de_usuario)."""
+        for campo in self.campos:
+            self._agregar_terminos(id_usuario, campo, self._terminos_de(campo, valores.get(campo)))
+
+    def quitar(self, id_usuario, valores):
+        """Saca del índice a un usuario, con los mismos valores con los que se lo indexó."""
+        for campo in self.campos:
+            self._quitar_terminos(id_usuario, campo, self._terminos_de(campo, valores.get(campo)))
+
+    def actualizar(self, id_usuario, anteriores, nuevos):
+        """Reindexa solo los términos que cambiaron entre los valores anteriores y los nuevos."""
+        for campo in self.campos:
+            terminos_anteriores = self._terminos_de(campo, anteriores.get(campo))
+            terminos_nuevos = self._terminos_de(campo, nuevos.get(campo))
+            self._quitar_terminos(id_usuario, campo, terminos_anteriores - terminos_nuevos)
+            self._agregar_terminos(id_usuario, campo, terminos_nuevos - terminos_anteriores)
+
+    # --- Búsquedas ---
+
+    @staticmethod
+    def _id_de(clave):
+        return int(clave.rpartition(SEPARADOR)[2])
+
+    def _ids_con_prefijo(self, campo, prefijo, encontrados, limite):
+        despues_de = None
+        while len(encontrados) < limite:
+            claves = self._prefijos[campo].desde(despues_de, prefijo, limite)
+            for clave in claves:
+                encontrados.setdefault(self._id_de(clave), 1.0)
+                if len(encontrados) >= limite:
+                    return
+            if len(claves) < limite:
+                return
+            despues_de = claves[-1]
+
+    def buscar_prefijo(self, texto, limite=20, campos=None):
+        """Ids de los usuarios con algún campo (o palabra del nombre/apellido) que empieza con texto."""
+        prefijo = normalizar(texto).strip()
+        encontrados = {}
+        if prefijo:
+            for campo in campos or self.campos:
+                self._ids_con_prefijo(campo, prefijo, encontrados, limite)
+        return list(encontrados)
+
+    def buscar_aproximado(self, texto, limite=20, similitud_minima=0.3):
+        """
+        Retorna [(id_usuario, similitud), ...] de los usuarios con algún término parecido a texto,
+        de más a menos parecido. La similitud va de 0 a 1 (Jaccard entre trigramas).
+        """
+        trigramas_consulta = trigramas(normalizar(texto).strip())
+        if not trigramas_consulta:
+            return []
+        # Con similitud >= s hace falta compartir al menos ceil(s * |consulta|) trigramas
+        minimo_comunes = max(1, math.ceil(similitud_minima * len(trigramas_consulta)))
+        comunes_por_termino = Counter()
+        for trigrama in trigramas_consulta:
+            comunes_por_termino.update(self._trigramas.get(trigrama, ()))
+
+        parecidos = []
+        largo_consulta = len(trigramas_consulta)
+        for numero, comunes in comunes_por_termino.items():
+            if comunes < minimo_comunes or not self._usos[numero]:
+                continue # Comparte pocos trigramas, o es un término que ya no usa nadie
+            similitud = comunes / (largo_consulta + self._largos[numero] - comunes)
+            if similitud >= similitud_minima:
+                parecidos.append((similitud, self._terminos[numero]))
+        parecidos.sort(key=lambda par: (-par[0], par[1]))
+
+        encontrados = {}
+        for similitud, termino in parecidos:
+            for campo in self.campos_aproximados:
+                despues_de = None
+                while len(encontrados) < limite:
+                    claves = self._prefijos[campo].desde(despues_de, termino + SEPARADOR, limite)
+                    for clave in claves:
+                        encontrados.setdefault(self._id_de(clave), similitud)
+                    if len(claves) < limite:
+                        break
+                    despues_de = claves[-1]
+            if len(encontrados) >= limite:
+                break
+        return list(encontrados.items())[:limite]
+
+    def buscar(self, texto, limite=20, similitud_minima=0.3):
+        """Ids de usuarios que coinciden por prefijo y, si faltan para llegar al límite, por parecido."""
+        ids = self.buscar_prefijo(texto, limite)
+        if len(ids) < limite:
+            vistos = set(ids)
+            for id_usuario, _ in self.buscar_aproximado(texto, limite, similitud_minima):
+                if id_usuario not in vistos:
+                    ids.append(id_usuario)
+                    vistos.add(id_usuario)
+                    if len(ids) >= limite:
+                        break
+        return ids
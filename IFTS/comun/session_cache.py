@@ -0,0 +1,120 @@
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheSesiones:
+    """
+    Sesiones en memoria identificadas por un token opaco.
+
+    - Vencimiento deslizante: cada uso de la sesión la extiende `ttl` segundos más,
+      sin pasar de `duracion_maxima` desde que se creó.
+    - Límite de tamaño: si hay `max_sesiones` abiertas, se desaloja la usada hace más tiempo.
+    - Revocación masiva: revocar_usuario cierra todas las sesiones de un usuario en una sola llamada.
+
+    Todas las operaciones son O(1) (la purga de vencidas es proporcional a las que vencieron).
+    Como cada uso mueve la sesión al final y el ttl es el mismo para todas, las sesiones
+    quedan ordenadas por vencimiento: las vencidas siempre están al principio.
+    """
+    def __init__(self, ttl=1800, duracion_maxima=8 * 3600, max_sesiones=100000):
+        if max_sesiones < 1:
+            raise ValueError("La cantidad máxima de sesiones debe ser al menos 1.")
+        self.ttl = ttl
+        self.duracion_maxima = duracion_maxima
+        self.max_sesiones = max_sesiones
+        self._sesiones = OrderedDict()  # token -> [id_usuario, datos, vence_en, vence_como_maximo]
+        self._tokens_por_usuario = {}   # id_usuario -> {token, ...}
+        self._lock = threading.Lock()
+        self._estadisticas = {"creadas": 0, "aciertos": 0, "fallos": 0, "vencidas": 0,
+                              "desalojadas": 0, "revocadas": 0}
+
+    def crear(self, id_usuario, datos=None):
+        """Abre una sesión para id_usuario (con datos opcionales asociados) y retorna su token."""
+        token = secrets.token_urlsafe(32)
+        ahora = time.monotonic()
+        with self._lock:
+            self._purgar_vencidas(ahora)
+            while len(self._sesiones) >= self.max_sesiones:
+                token_viejo, entrada = self._sesiones.popitem(last=False)
+                self._olvidar(token_viejo, entrada[0])
+                self._estadisticas["desalojadas"] += 1
+            vence_como_maximo = ahora + self.duracion_maxima
+            self._sesiones[token] = [id_usuario, datos, min(ahora + self.ttl, vence_como_maximo), vence_como_maximo]
+            self._tokens_por_usuario.setdefault(id_usuario, set()).add(token)
+            self._estadisticas["creadas"] += 1
+        return token
+
+    def obtener(self, token):
+        """Retorna (id_usuario, datos) si la sesión existe y está vigente (y la extiende), o None."""
+        ahora = time.monotonic()
+        with self._lock:
+            entrada = self._sesiones.get(token)
+            if entrada is None:
+                self._estadisticas["fallos"] += 1
+                return None
+            if ahora >= entrada[2]:
+                del self._sesiones[token]
+                self._olvidar(token, entrada[0])
+                self._estadisticas["vencidas"] += 1
+                self._estadisticas["fallos"] += 1
+                return None
+            entrada[2] = min(ahora + self.ttl, entrada[3])
+            self._sesiones.move_to_end(token)
+            self._estadisticas["aciertos"] += 1
+            return entrada[0], entrada[1]
+
+    def revocar(self, token):
+        """Cierra una sesión. Retorna el id_usuario al que pertenecía, o None si no existía."""
+        with self._lock:
+            entrada = self._sesiones.pop(token, None)
+            if entrada is None:
+                return None
+            self._olvidar(token, entrada[0])
+            self._estadisticas["revocadas"] += 1
+            return entrada[0]
+
+    def revocar_usuario(self, id_usuario):
+        """Cierra todas las sesiones de un usuario. Retorna cuántas se cerraron."""
+        with self._lock:
+            tokens = self._tokens_por_usuario.pop(id_usuario, set())
+            for token in tokens:
+                del self._sesiones[token]
+            self._estadisticas["revocadas"] += len(tokens)
+            return len(tokens)
+
+    def _olvidar(self, token, id_usuario):
+        tokens = self._tokens_por_usuario.get(id_usuario)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_por_usuario[id_usuario]
+
+    def _purgar_vencidas(self, ahora):
+        # Las vencidas están al principio; el tope por duracion_maxima puede dejar alguna más
+        # adelante, que se descarta cuando se la consulta
+        while self._sesiones:
+            token, entrada = next(iter(self._sesiones.items()))
+            if ahora < entrada[2]:
+                break
+            del self._sesiones[token]
+            self._olvidar(token, entrada[0])
+            self._estadisticas["vencidas"] += 1
+
+    def purgar_vencidas(self):
+        """Descarta las sesiones vencidas. Retorna cuántas sesiones siguen activas."""
+        with self._lock:
+            self._purgar_vencidas(time.monotonic())
+            return len(self._sesiones)
+
+    def __len__(self):
+        return len(self._sesiones)
+
+    def obtener_estadisticas(self):
+        """Retorna los contadores de sesiones (creadas, activas, vencidas, desalojadas, revocadas, aciertos, fallos)."""
+        with self._lock:
+            self._purgar_vencidas(time.monotonic())
+            estadisticas = dict(self._estadisticas)
+            estadisticas["activas"] = len(self._sesiones)
+            estadisticas["usuarios_con_sesion"] = len(self._tokens_por_usuario)
+        return estadisticas
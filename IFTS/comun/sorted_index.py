@@ -0,0 +1,62 @@
+from bisect import bisect_left, bisect_right, insort
+
+
+class IndiceOrdenado:
+    """
+    Claves (sin repetir) mantenidas en orden, para recorrer por rangos y por prefijo.
+
+    Las altas al final del orden son O(1). Las que llegan fuera de orden esperan en una lista
+    aparte hasta la próxima consulta: si son pocas se insertan en su lugar y si son muchas
+    (una carga masiva) se reordena todo una sola vez, en lugar de una vez por cada alta.
+    Como una consulta puede reordenar la lista, el índice no se debe leer y modificar
+    desde hilos distintos sin lock.
+    """
+    MAX_INSERCIONES = 32  # Con más pendientes que esto conviene reordenar la lista entera
+
+    def __init__(self, claves=()):
+        self._claves = sorted(claves)
+        self._pendientes = []  # Altas fuera de orden todavía no ubicadas
+
+    def _ordenar(self):
+        if not self._pendientes:
+            return
+        if len(self._pendientes) <= self.MAX_INSERCIONES:
+            for clave in self._pendientes:
+                insort(self._claves, clave)
+        else:
+            self._claves.extend(self._pendientes)
+            self._claves.sort()
+        self._pendientes.clear()
+
+    def agregar(self, clave):
+        if not self._claves or clave > self._claves[-1]:
+            self._claves.append(clave)
+        else:
+            self._pendientes.append(clave)
+
+    def quitar(self, clave):
+        if self._pendientes:
+            self._ordenar()
+        posicion = bisect_left(self._claves, clave)
+        if posicion < len(self._claves) and self._claves[posicion] == clave:
+            del self._claves[posicion]
+
+    def desde(self, despues_de=None, prefijo="", limite=None):
+        """
+        Retorna hasta `limite` claves en orden, mayores que `despues_de` (el cursor de la
+        página anterior) y que empiezan con `prefijo`.
+        """
+        self._ordenar()
+        if despues_de is None or despues_de < prefijo:
+            inicio = bisect_left(self._claves, prefijo)
+        else:
+            inicio = bisect_right(self._claves, despues_de)
+        fin = len(self._claves) if limite is None else inicio + limite
+        claves = self._claves[inicio:fin]
+        if prefijo and claves and not claves[-1].startswith(prefijo):
+            # Las que empiezan con el prefijo son contiguas: se corta en la primera que no
+            claves = claves[:bisect_left(claves, prefijo + "\U0010ffff")]
+        return claves
+
+    def __len__(self):
+        return len(self._claves) + len(self._pendientes)
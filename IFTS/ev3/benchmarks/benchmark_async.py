@@ -0,0 +1,98 @@
+# benchmark_async.py
+"""
+Throughput de inicios de sesión con 1, 10 y 100 logins concurrentes:
+módulo sincrónico (database.py, un hilo por login concurrente) contra
+el módulo asíncrono (database_async.py, una tarea por login concurrente).
+
+Uso (desde IFTS/ev3):
+    python benchmarks/benchmark_async.py --motor sqlite --usuarios 1000 --logins 3000
+    python benchmarks/benchmark_async.py --motor mysql   # requiere aiomysql
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import database
+import database_async
+from benchmark_login import preparar_base
+
+CONTRASENA = "clave123"
+HASH_ESPERADO = hashlib.sha256(CONTRASENA.encode()).hexdigest()
+
+
+def login_sincronico(nombre_usuario):
+    resultado = database.obtener_usuario_con_perfil_por_nombre(nombre_usuario)
+    return resultado is not None and resultado[0][2] == HASH_ESPERADO
+
+
+async def login_asincronico(nombre_usuario):
+    resultado = await database_async.obtener_usuario_con_perfil_por_nombre(nombre_usuario)
+    return resultado is not None and resultado[0][2] == HASH_ESPERADO
+
+
+def medir_sincronico(nombres, concurrencia):
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrencia) as hilos:
+        correctos = sum(hilos.map(login_sincronico, nombres))
+    return correctos, time.perf_counter() - inicio
+
+
+async def medir_asincronico(nombres, concurrencia):
+    limite = asyncio.Semaphore(concurrencia)
+
+    async def un_login(nombre):
+        async with limite:
+            return await login_asincronico(nombre)
+
+    inicio = time.perf_counter()
+    correctos = sum(await asyncio.gather(*(un_login(n) for n in nombres)))
+    return correctos, time.perf_counter() - inicio
+
+
+async def medir_todo_asincronico(nombres, niveles):
+    await database_async.inicializar()
+    try:
+        return [await medir_asincronico(nombres, c) for c in niveles]
+    finally:
+        await database_async.cerrar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput de logins: sincrónico vs asyncio.")
+    parser.add_argument("--motor", choices=["sqlite", "mysql"], default="sqlite")
+    parser.add_argument("--usuarios", type=int, default=1000)
+    parser.add_argument("--logins", type=int, default=3000)
+    parser.add_argument("--concurrencia", type=int, nargs="+", default=[1, 10, 100])
+    args = parser.parse_args()
+
+    random.seed(1234)
+    preparar_base(args.motor, args.usuarios)
+    nombres = [f"bench_{random.randrange(args.usuarios)}" for _ in range(args.logins)]
+
+    # Mismo número máximo de conexiones para los dos módulos
+    database.DB_POOL_CONFIG["tamano_maximo"] = database_async.DB_POOL_ASYNC_CONFIG["maxsize"]
+    database.DB_POOL_CONFIG["timeout_espera"] = 60
+    database.cerrar_pool()
+
+    sincronicos = [medir_sincronico(nombres, c) for c in args.concurrencia]
+    asincronicos = asyncio.run(medir_todo_asincronico(nombres, args.concurrencia))
+
+    print(f"Motor: {args.motor} | usuarios: {args.usuarios} | logins por nivel: {args.logins}")
+    print(f"{'concurrencia':>12} | {'sincrónico (logins/s)':>22} | {'asyncio (logins/s)':>19}")
+    for concurrencia, (ok_s, t_s), (ok_a, t_a) in zip(args.concurrencia, sincronicos, asincronicos):
+        if ok_s != len(nombres) or ok_a != len(nombres):
+            raise RuntimeError("Algún login falló durante la medición.")
+        print(f"{concurrencia:>12} | {len(nombres) / t_s:>22.0f} | {len(nombres) / t_a:>19.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# benchmark_login.py
+"""
+Micro-benchmark del inicio de sesión.
+
+Compara el camino anterior (usuario y perfil en dos consultas) con el actual
+(una sola consulta con LEFT JOIN) y reporta la latencia p50/p99 por login.
+Los dos caminos verifican la contraseña con el mismo KDF y van a la base en
+cada login (el camino anterior no usa la caché de lecturas).
+
+Uso (desde IFTS/ev3):
+    python benchmarks/benchmark_login.py --motor sqlite --usuarios 1000 --logins 1000
+    python benchmarks/benchmark_login.py --motor mysql   # usa DB_CONFIG de database.py
+
+En ambos casos las conexiones salen del pool de database.py.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import database
+from classes.usuario import Usuario
+from hash_contrasenas import hashear_contrasena, verificar_contrasena
+
+
+# --- Preparación de la base ---
+
+def preparar_base(motor, cantidad_usuarios):
+    """Configura el motor elegido y carga usuarios de prueba (bench_0, bench_1, ...)."""
+    if motor == "sqlite":
+        # Base embebida temporal: mismo esquema, sin servidor
+        database.configurar_motor("sqlite", database=os.path.join(tempfile.mkdtemp(), "benchmark_login.db"))
+    else:
+        database.configurar_motor("mysql")
+    with contextlib.redirect_stdout(io.StringIO()):
+        database.initialize_db()
+
+    conn = database.get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM usuarios WHERE nombre_usuario LIKE 'bench_%'")
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+    # Hash en el formato actual, para que el login no tenga que actualizarlo
+    hash_pw = hashear_contrasena("clave123")
+    filas = [{"nombre_usuario": f"bench_{i}", "contrasena_hash": hash_pw, "rol": "estandar",
+              "nombre_completo": f"Nombre {i}", "apellido": f"Apellido {i}", "email": f"bench_{i}@ejemplo.com"}
+             for i in range(cantidad_usuarios)]
+    for inicio in range(0, len(filas), 1000):
+        database.insertar_lote_usuarios_con_perfil(filas[inicio:inicio + 1000])
+
+
+# --- Caminos de login a comparar ---
+
+def login_dos_consultas(nombre_usuario, contrasena):
+    """Reproduce el login anterior: usuario y perfil en consultas separadas."""
+    database.limpiar_cache()  # Sin caché, como el login actual: las dos consultas van a la base
+    usuario_data = database.obtener_usuario_por_nombre(nombre_usuario)
+    if usuario_data and verificar_contrasena(contrasena, usuario_data[2]):
+        return usuario_data, database.obtener_perfil_por_usuario_id(usuario_data[0])
+    return None
+
+
+def login_una_consulta(nombre_usuario, contrasena):
+    """Login actual (Usuario.iniciar_sesion), sin los mensajes por consola."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return Usuario.iniciar_sesion(nombre_usuario, contrasena)
+
+
+def medir(funcion_login, cantidad_usuarios, cantidad_logins):
+    """Ejecuta cantidad_logins inicios de sesión al azar y retorna las latencias en milisegundos."""
+    nombres = [f"bench_{random.randrange(cantidad_usuarios)}" for _ in range(cantidad_logins)]
+    latencias = []
+    for nombre in nombres:
+        inicio = time.perf_counter()
+        if funcion_login(nombre, "clave123") is None:
+            raise RuntimeError(f"Falló el login de '{nombre}'.")
+        latencias.append((time.perf_counter() - inicio) * 1000)
+    return latencias
+
+
+def percentil(valores_ordenados, p):
+    indice = min(len(valores_ordenados) - 1, int(round(p / 100 * (len(valores_ordenados) - 1))))
+    return valores_ordenados[indice]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latencia p50/p99 del inicio de sesión.")
+    parser.add_argument("--motor", choices=["sqlite", "mysql"], default="sqlite")
+    parser.add_argument("--usuarios", type=int, default=1000)
+    parser.add_argument("--logins", type=int, default=1000)
+    args = parser.parse_args()
+
+    random.seed(1234)
+    preparar_base(args.motor, args.usuarios)
+
+    print(f"Motor: {args.motor} | usuarios: {args.usuarios} | logins: {args.logins}")
+    for etiqueta, funcion in (("dos consultas", login_dos_consultas), ("una consulta", login_una_consulta)):
+        medir(funcion, args.usuarios, min(200, args.logins))  # Calentamiento
+        latencias = sorted(medir(funcion, args.usuarios, args.logins))
+        print(f"{etiqueta:>14}: p50 = {percentil(latencias, 50):.3f} ms | p99 = {percentil(latencias, 99):.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+# backends/__init__.py
+"""
+Motores de base de datos que puede usar database.py.
+
+Cada motor expone la misma interfaz:
+- nombre: identificador del motor ('mysql' o 'sqlite').
+- Error: excepción (o tupla de excepciones) que lanzan sus conexiones.
+- conectar(): abre una conexión nueva que acepta consultas con placeholders '%s'.
+- verificar_conexion(conn): True si la conexión sigue utilizable.
+- sentencias_esquema(): lista de sentencias CREATE TABLE para 'usuarios' y 'perfiles'.
+- descripcion(): texto corto para los mensajes por consola.
+"""
+
+import importlib
+
+MOTORES = {
+    'mysql': 'backends.motor_mysql.MotorMySQL',
+    'sqlite': 'backends.motor_sqlite.MotorSQLite',
+}
+
+
+class ErrorBaseDatos(Exception):
+    """Error de base de datos independiente del motor. errno usa los códigos de MySQL (1062 = duplicado)."""
+    def __init__(self, mensaje, errno=None):
+        super().__init__(mensaje)
+        self.errno = errno
+
+
+def crear_motor(nombre, **config):
+    """Crea el motor indicado. El módulo del motor se importa recién acá, así no hace falta instalar los drivers que no se usan."""
+    if nombre not in MOTORES:
+        raise ValueError(f"Motor de base de datos desconocido: '{nombre}'. Opciones: {', '.join(MOTORES)}.")
+    ruta_modulo, nombre_clase = MOTORES[nombre].rsplit('.', 1)
+    clase = getattr(importlib.import_module(ruta_modulo), nombre_clase)
+    return clase(**config)
@@ -0,0 +1,51 @@
+# backends/motor_mysql.py
+
+import mysql.connector
+from mysql.connector import Error
+
+
+class MotorMySQL:
+    """Motor para un servidor MySQL, usando mysql.connector."""
+    nombre = 'mysql'
+    Error = Error
+
+    def __init__(self, **config):
+        self.config = config
+
+    def conectar(self):
+        conn = mysql.connector.connect(**self.config)
+        return conn if conn.is_connected() else None
+
+    def verificar_conexion(self, conn):
+        return conn.is_connected() # Hace un ping al servidor
+
+    def descripcion(self):
+        return f"MySQL '{self.config.get('database')}'"
+
+    def sentencias_esquema(self):
+        return [
+            '''
+            CREATE TABLE IF NOT EXISTS usuarios (
+                id_usuario INT AUTO_INCREMENT PRIMARY KEY,
+                nombre_usuario VARCHAR(255) NOT NULL UNIQUE,
+                contrasena_hash VARCHAR(255) NOT NULL,
+                rol VARCHAR(50) NOT NULL,
+                CHECK (rol IN ('administrador', 'estandar'))
+            );
+            ''',
+            '''
+            CREATE TABLE IF NOT EXISTS perfiles (
+                id_perfil INT AUTO_INCREMENT PRIMARY KEY,
+                id_usuario INT NOT NULL UNIQUE,          -- Clave foránea a usuarios.id_usuario
+                nombre_completo VARCHAR(255) NULL,
+                apellido VARCHAR(255) NULL,
+                email VARCHAR(255) UNIQUE NULL,
+                fecha_nacimiento DATE NULL,
+                direccion VARCHAR(255) NULL,
+                telefono VARCHAR(50) NULL,
+
+                FOREIGN KEY (id_usuario) REFERENCES usuarios(id_usuario)
+                    ON DELETE CASCADE -- Si se elimina un usuario, su perfil también se elimina
+            );
+            ''',
+        ]
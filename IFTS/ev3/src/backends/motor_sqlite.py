@@ -0,0 +1,138 @@
+# backends/motor_sqlite.py
+
+import functools
+import sqlite3
+
+from backends import ErrorBaseDatos
+
+
+@functools.lru_cache(maxsize=512)
+def _adaptar_consulta(consulta):
+    """Convierte los placeholders de MySQL ('%s') a los de SQLite ('?')."""
+    return consulta.replace('%s', '?')
+
+
+def _traducir_error(error):
+    """Convierte un error de sqlite3 en ErrorBaseDatos con el código equivalente de MySQL."""
+    mensaje = str(error)
+    errno = None
+    if isinstance(error, sqlite3.IntegrityError):
+        if 'UNIQUE' in mensaje:
+            errno = 1062 # Entrada duplicada
+        elif 'FOREIGN KEY' in mensaje:
+            errno = 1452 # Falla de clave foránea
+        elif 'CHECK' in mensaje:
+            errno = 3819 # Falla de restricción CHECK
+    return ErrorBaseDatos(mensaje, errno)
+
+
+class CursorSQLite:
+    """Cursor que acepta las mismas consultas que usamos con MySQL."""
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, consulta, parametros=()):
+        try:
+            self._cursor.execute(_adaptar_consulta(consulta), parametros)
+        except sqlite3.Error as e:
+            raise _traducir_error(e) from e
+        return self
+
+    def executemany(self, consulta, secuencia_parametros):
+        try:
+            self._cursor.executemany(_adaptar_consulta(consulta), secuencia_parametros)
+        except sqlite3.Error as e:
+            raise _traducir_error(e) from e
+        return self
+
+    def __getattr__(self, nombre):
+        # fetchone, fetchall, fetchmany, lastrowid, rowcount, close, ...
+        return getattr(self._cursor, nombre)
+
+
+class ConexionSQLite:
+    """Conexión SQLite con la misma interfaz que usa database.py para MySQL."""
+    def __init__(self, conexion):
+        self._conexion = conexion
+
+    def cursor(self, **opciones):
+        # Opciones como buffered=False no aplican: los cursores de SQLite ya leen fila por fila
+        return CursorSQLite(self._conexion.cursor())
+
+    def commit(self):
+        try:
+            self._conexion.commit()
+        except sqlite3.Error as e:
+            raise _traducir_error(e) from e
+
+    def is_connected(self):
+        try:
+            self._conexion.execute('SELECT 1')
+            return True
+        except sqlite3.Error:
+            return False
+
+    def __getattr__(self, nombre):
+        # rollback, close, in_transaction, ...
+        return getattr(self._conexion, nombre)
+
+
+class MotorSQLite:
+    """
+    Motor embebido SQLite: mismo esquema que MySQL, sin servidor ni red.
+    Usa modo WAL (lectores que no bloquean al escritor) y la caché de sentencias
+    preparadas de sqlite3, que reutiliza la consulta compilada cuando el texto SQL se repite.
+    """
+    nombre = 'sqlite'
+    Error = ErrorBaseDatos
+
+    def __init__(self, database='proyecto_usuarios_db.sqlite3', timeout=5.0, sentencias_en_cache=256):
+        self.database = database
+        self.timeout = timeout
+        self.sentencias_en_cache = sentencias_en_cache
+
+    def conectar(self):
+        try:
+            conexion = sqlite3.connect(self.database, timeout=self.timeout,
+                                       cached_statements=self.sentencias_en_cache,
+                                       check_same_thread=False) # El pool garantiza un solo hilo por conexión a la vez
+            conexion.execute('PRAGMA journal_mode = WAL')
+            conexion.execute('PRAGMA synchronous = NORMAL') # Seguro con WAL y mucho más rápido que FULL
+            conexion.execute('PRAGMA foreign_keys = ON')    # Necesario para ON DELETE CASCADE
+        except sqlite3.Error as e:
+            raise _traducir_error(e) from e
+        return ConexionSQLite(conexion)
+
+    def verificar_conexion(self, conn):
+        return conn.is_connected()
+
+    def descripcion(self):
+        return f"SQLite '{self.database}'"
+
+    def sentencias_esquema(self):
+        return [
+            '''
+            CREATE TABLE IF NOT EXISTS usuarios (
+                id_usuario INTEGER PRIMARY KEY AUTOINCREMENT,
+                nombre_usuario VARCHAR(255) NOT NULL UNIQUE,
+                contrasena_hash VARCHAR(255) NOT NULL,
+                rol VARCHAR(50) NOT NULL,
+                CHECK (rol IN ('administrador', 'estandar'))
+            );
+            ''',
+            '''
+            CREATE TABLE IF NOT EXISTS perfiles (
+                id_perfil INTEGER PRIMARY KEY AUTOINCREMENT,
+                id_usuario INT NOT NULL UNIQUE,
+                nombre_completo VARCHAR(255) NULL,
+                apellido VARCHAR(255) NULL,
+                email VARCHAR(255) UNIQUE NULL,
+                fecha_nacimiento DATE NULL,
+                direccion VARCHAR(255) NULL,
+                telefono VARCHAR(50) NULL,
+
+                FOREIGN KEY (id_usuario) REFERENCES usuarios(id_usuario)
+                    ON DELETE CASCADE
+            );
+            ''',
+        ]
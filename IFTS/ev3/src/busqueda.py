@@ -0,0 +1,74 @@
+# busqueda.py
+
+import threading
+
+from comun.search_index import IndiceBusqueda
+
+
+# --- Configuración de la Búsqueda ---
+# nombre_completo y apellido se indexan por palabra; el email solo admite búsqueda por prefijo
+BUSQUEDA_CONFIG = {
+    'campos': ('nombre_usuario', 'nombre_completo', 'apellido', 'email'),
+    'campos_aproximados': ('nombre_usuario', 'nombre_completo', 'apellido'),
+    'campos_por_palabra': ('nombre_completo', 'apellido')
+}
+
+_indice = None
+_valores = {}  # id_usuario -> valores indexados (hacen falta para reindexar cuando cambian)
+_lock = threading.Lock()
+
+
+def _construir_indice(tamano_pagina=1000):
+    """Arma el índice recorriendo usuarios y perfiles de la base página por página."""
+    from database import iterar_usuarios_con_perfil # Local: database importa este módulo
+    global _indice
+    indice = IndiceBusqueda(**BUSQUEDA_CONFIG)
+    _valores.clear()
+    for pagina in iterar_usuarios_con_perfil(tamano_pagina):
+        for id_usuario, nombre_usuario, _, nombre_completo, apellido, email in pagina:
+            valores = {'nombre_usuario': nombre_usuario, 'nombre_completo': nombre_completo,
+                       'apellido': apellido, 'email': email}
+            indice.agregar(id_usuario, valores)
+            _valores[id_usuario] = valores
+    _indice = indice
+
+def buscar_usuarios(texto, limite=20):
+    """
+    Busca por nombre de usuario, nombre completo, apellido o email: primero los que empiezan
+    con el texto y después los parecidos. Retorna una lista de (id_usuario, valores).
+    El índice se arma en la primera búsqueda y después se mantiene con cada alta, baja o cambio de perfil.
+    """
+    with _lock:
+        if _indice is None:
+            _construir_indice()
+        return [(id_usuario, dict(_valores[id_usuario])) for id_usuario in _indice.buscar(texto, limite)]
+
+def indexar_usuario(id_usuario, **datos):
+    """
+    Agrega o actualiza un usuario en el índice (si ya está armado). Los campos en None no cambian,
+    igual que en database.actualizar_perfil.
+    """
+    with _lock:
+        if _indice is None:
+            return
+        anteriores = _valores.get(id_usuario)
+        nuevos = dict(anteriores or {})
+        nuevos.update({campo: valor for campo, valor in datos.items() if valor is not None})
+        if anteriores is None:
+            _indice.agregar(id_usuario, nuevos)
+        else:
+            _indice.actualizar(id_usuario, anteriores, nuevos)
+        _valores[id_usuario] = nuevos
+
+def quitar_usuario_del_indice(id_usuario):
+    with _lock:
+        valores = _valores.pop(id_usuario, None)
+        if _indice is not None and valores is not None:
+            _indice.quitar(id_usuario, valores)
+
+def reconstruir_indice():
+    """Descarta el índice para que se vuelva a armar desde la base (por ejemplo, tras cambios de otro proceso)."""
+    global _indice
+    with _lock:
+        _indice = None
+        _valores.clear()
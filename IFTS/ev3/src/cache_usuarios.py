@@ -0,0 +1,65 @@
+# cache_usuarios.py
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheLRU:
+    """
+    Caché en memoria con límite de tamaño (descarta la entrada usada hace más tiempo)
+    y vencimiento por tiempo (ttl, en segundos). Lleva contadores de aciertos y fallos
+    para poder dimensionarla.
+    """
+    def __init__(self, tamano_maximo=1024, ttl=60):
+        if tamano_maximo < 1:
+            raise ValueError("El tamaño máximo de la caché debe ser al menos 1.")
+        self.tamano_maximo = tamano_maximo
+        self.ttl = ttl
+        self._entradas = OrderedDict()  # clave -> (valor, vence_en)
+        self._lock = threading.Lock()
+        self._estadisticas = {"aciertos": 0, "fallos": 0, "vencidas": 0, "descartadas": 0, "invalidadas": 0}
+
+    def obtener(self, clave):
+        """Retorna (True, valor) si la clave está en caché y vigente, o (False, None) si no."""
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                self._estadisticas["fallos"] += 1
+                return False, None
+            valor, vence_en = entrada
+            if time.monotonic() >= vence_en:
+                del self._entradas[clave]
+                self._estadisticas["vencidas"] += 1
+                self._estadisticas["fallos"] += 1
+                return False, None
+            self._entradas.move_to_end(clave)
+            self._estadisticas["aciertos"] += 1
+            return True, valor
+
+    def guardar(self, clave, valor):
+        with self._lock:
+            self._entradas[clave] = (valor, time.monotonic() + self.ttl)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.tamano_maximo:
+                self._entradas.popitem(last=False)
+                self._estadisticas["descartadas"] += 1
+
+    def invalidar(self, clave):
+        with self._lock:
+            if self._entradas.pop(clave, None) is not None:
+                self._estadisticas["invalidadas"] += 1
+
+    def limpiar(self):
+        with self._lock:
+            self._entradas.clear()
+
+    def obtener_estadisticas(self):
+        """Retorna los contadores de la caché junto con la tasa de aciertos."""
+        with self._lock:
+            estadisticas = dict(self._estadisticas)
+            estadisticas["entradas"] = len(self._entradas)
+            estadisticas["tamano_maximo"] = self.tamano_maximo
+        consultas = estadisticas["aciertos"] + estadisticas["fallos"]
+        estadisticas["tasa_aciertos"] = estadisticas["aciertos"] / consultas if consultas else 0.0
+        return estadisticas
@@ -1,4 +1,6 @@
-from database import obtener_perfil_por_usuario_id, obtener_todos_los_usuarios
+from database import iterar_usuarios_con_perfil, actualizar_rol_usuario, eliminar_usuario
+from sesiones import revocar_sesiones_de_usuario
+from busqueda import buscar_usuarios
 # Importaciones adelantadas para evitar dependencias circulares
 from .usuario import Usuario
 
@@ -12,22 +14,68 @@ class Administrador(Usuario):
             raise ValueError("El rol debe ser 'administrador' para esta clase.")
 
     # Resto de métodos de Administrador ...
-    # Asegúrate de que visualizar_todos_los_usuarios() también use obtener_perfil_por_usuario_id para mostrar la información completa
-    def visualizar_todos_los_usuarios(self):
-        """Visualiza el listado completo de usuarios registrados, con algunos datos de perfil."""
-        usuarios_data = obtener_todos_los_usuarios() # Obtiene datos de la tabla usuarios
-        
-        if usuarios_data:
-            print("\n--- Listado de Usuarios ---")
-            for user_tuple in usuarios_data:
-                id_u, nombre_u, _, rol_u = user_tuple # Desempaquetar la tupla (el hash no lo necesitamos mostrar)
-                # Intentamos obtener el perfil para cada usuario
-                perfil_data = obtener_perfil_por_usuario_id(id_u)
-                
-                nombre_completo = perfil_data[2] if perfil_data and len(perfil_data) > 2 and perfil_data[2] else "N/A"
-                email = perfil_data[4] if perfil_data and len(perfil_data) > 4 and perfil_data[4] else "N/A"
-                
-                print(f"ID: {id_u}, Nombre: {nombre_u}, Rol: {rol_u}, Nombre Completo: {nombre_completo}, Email: {email}")
+    def visualizar_todos_los_usuarios(self, tamano_pagina=100):
+        """
+        Visualiza el listado completo de usuarios registrados, con algunos datos de perfil.
+        Los usuarios se traen ya unidos a su perfil y se imprimen página por página,
+        sin cargar toda la tabla en memoria.
+        """
+        hay_usuarios = False
+        for pagina in iterar_usuarios_con_perfil(tamano_pagina):
+            if not hay_usuarios:
+                print("\n--- Listado de Usuarios ---")
+                hay_usuarios = True
+            for id_u, nombre_u, rol_u, nombre_completo, _, email in pagina:
+                print(f"ID: {id_u}, Nombre: {nombre_u}, Rol: {rol_u}, "
+                      f"Nombre Completo: {nombre_completo or 'N/A'}, Email: {email or 'N/A'}")
+
+        if hay_usuarios:
             print("--------------------------")
         else:
-            print("No hay usuarios registrados en el sistema.")
\ No newline at end of file
+            print("No hay usuarios registrados en el sistema.")
+
+    def buscar_usuarios(self, texto, limite=20):
+        """
+        Busca usuarios por nombre de usuario, nombre completo, apellido o email (alcanza con el
+        comienzo, y tolera errores de tipeo) e imprime los encontrados.
+        """
+        if not texto.strip():
+            print("Ingrese un texto para buscar.")
+            return
+        encontrados = buscar_usuarios(texto, limite)
+        if not encontrados:
+            print("No se encontraron usuarios.")
+            return
+        print("\n--- Usuarios Encontrados ---")
+        for id_u, valores in encontrados:
+            print(f"ID: {id_u}, Nombre: {valores.get('nombre_usuario')}, "
+                  f"Nombre Completo: {valores.get('nombre_completo') or 'N/A'} {valores.get('apellido') or ''}, "
+                  f"Email: {valores.get('email') or 'N/A'}")
+        print("----------------------------")
+
+    def modificar_rol_de_usuario(self, id_usuario, nuevo_rol):
+        """
+        Cambia el rol de otro usuario. Sus sesiones abiertas se cierran: con otro rol
+        tiene otros permisos, así que debe volver a iniciar sesión.
+        """
+        if id_usuario == self.id_usuario:
+            print("No puede cambiar su propio rol.")
+            return False
+        if not actualizar_rol_usuario(id_usuario, nuevo_rol):
+            print(f"No se pudo cambiar el rol del usuario con ID {id_usuario}.")
+            return False
+        revocar_sesiones_de_usuario(id_usuario)
+        print(f"Rol del usuario con ID {id_usuario} actualizado a '{nuevo_rol}'.")
+        return True
+
+    def eliminar_usuario_por_id(self, id_usuario):
+        """Elimina a otro usuario (y su perfil) y cierra todas sus sesiones abiertas."""
+        if id_usuario == self.id_usuario:
+            print("No puede eliminar su propio usuario.")
+            return False
+        if not eliminar_usuario(id_usuario):
+            print(f"No se pudo eliminar el usuario con ID {id_usuario}.")
+            return False
+        revocar_sesiones_de_usuario(id_usuario)
+        print(f"Usuario con ID {id_usuario} eliminado.")
+        return True
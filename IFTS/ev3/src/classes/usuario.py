@@ -1,8 +1,8 @@
 # clases/usuario.py
 
-import hashlib
-from database import crear_usuario, obtener_usuario_por_nombre, \
-                     crear_perfil, obtener_perfil_por_usuario_id, eliminar_usuario # eliminar_usuario para rollback
+from database import obtener_usuario_con_perfil_por_nombre, registrar_usuario_con_perfil, \
+                     obtener_perfil_por_usuario_id, actualizar_hash_contrasena, obtener_usuario_por_id
+from hash_contrasenas import hashear_contrasena, verificar_contrasena, necesita_actualizacion
 
 # NO IMPORTAR UsuarioEstandar ni Administrador aquí (líneas eliminadas)
     
@@ -73,31 +73,25 @@ class Usuario:
             print(f"Error de validación de contraseña: {mensaje}")
             return None
         
-        contrasena_hasheada = hashlib.sha256(contrasena.encode()).hexdigest()
+        contrasena_hasheada = hashear_contrasena(contrasena)
         
-        id_nuevo_usuario = crear_usuario(nombre_usuario, contrasena_hasheada, rol)
-        if id_nuevo_usuario:
-            nc = datos_perfil_iniciales.get('nombre_completo') if datos_perfil_iniciales else None
-            ap = datos_perfil_iniciales.get('apellido') if datos_perfil_iniciales else None
-            em = datos_perfil_iniciales.get('email') if datos_perfil_iniciales else None
-            fn = datos_perfil_iniciales.get('fecha_nacimiento') if datos_perfil_iniciales else None
-            dir = datos_perfil_iniciales.get('direccion') if datos_perfil_iniciales else None
-            tel = datos_perfil_iniciales.get('telefono') if datos_perfil_iniciales else None
+        datos = datos_perfil_iniciales or {}
+        # Usuario y perfil se insertan en una sola transacción: o se guardan ambos o ninguno
+        resultado = registrar_usuario_con_perfil(
+            nombre_usuario, contrasena_hasheada, rol,
+            datos.get('nombre_completo'), datos.get('apellido'), datos.get('email'),
+            datos.get('fecha_nacimiento'), datos.get('direccion'), datos.get('telefono')
+        )
+        if resultado is None:
+            print("Fallo la creación del usuario o de su perfil. Usuario no registrado.")
+            return None
 
-            if crear_perfil(id_nuevo_usuario, nc, ap, em, fn, dir, tel):
-                usuario_data = obtener_usuario_por_nombre(nombre_usuario)
-                perfil_data = obtener_perfil_por_usuario_id(id_nuevo_usuario)
-                if usuario_data:
-                    id_u, nombre_u, hash_u, rol_u = usuario_data
-                    if rol_u == 'administrador':
-                        return Administrador(id_u, nombre_u, hash_u, rol_u, perfil_data)
-                    else:
-                        return UsuarioEstandar(id_u, nombre_u, hash_u, rol_u, perfil_data)
-            else:
-                # Si falla la creación del perfil, eliminamos el usuario que acabamos de crear
-                eliminar_usuario(id_nuevo_usuario) 
-                print("Fallo la creación del perfil. Usuario no registrado.")
-        return None
+        # Construimos el objeto con los datos que ya tenemos, sin volver a leerlos de la base
+        id_nuevo_usuario, perfil_data = resultado
+        if rol == 'administrador':
+            return Administrador(id_nuevo_usuario, nombre_usuario, contrasena_hasheada, rol, perfil_data)
+        else:
+            return UsuarioEstandar(id_nuevo_usuario, nombre_usuario, contrasena_hasheada, rol, perfil_data)
 
     @staticmethod
     def iniciar_sesion(nombre_usuario, contrasena):
@@ -109,13 +103,17 @@ class Usuario:
         from .usuario_estandar import UsuarioEstandar
         from .administrador import Administrador
 
-        usuario_data = obtener_usuario_por_nombre(nombre_usuario)
-        if usuario_data:
-            id_u, nombre_u, hash_u, rol_u = usuario_data
-            if hashlib.sha256(contrasena.encode()).hexdigest() == hash_u:
+        # Credenciales y perfil llegan juntos en una sola consulta
+        resultado = obtener_usuario_con_perfil_por_nombre(nombre_usuario)
+        if resultado:
+            (id_u, nombre_u, hash_u, rol_u), perfil_data = resultado
+            if verificar_contrasena(contrasena, hash_u):
                 print("Inicio de sesión exitoso.")
-                perfil_data = obtener_perfil_por_usuario_id(id_u)
-                
+                if necesita_actualizacion(hash_u):
+                    # Tenemos la contraseña en claro: pasamos el hash viejo al formato y parámetros actuales
+                    hash_nuevo = hashear_contrasena(contrasena)
+                    if actualizar_hash_contrasena(id_u, hash_u, hash_nuevo):
+                        hash_u = hash_nuevo
                 if rol_u == 'administrador':
                     return Administrador(id_u, nombre_u, hash_u, rol_u, perfil_data)
                 else:
@@ -126,6 +124,26 @@ class Usuario:
             print("Usuario no encontrado.")
         return None
 
+    @staticmethod
+    def obtener_por_id(id_usuario):
+        """
+        Retorna la instancia (Administrador o UsuarioEstandar) del usuario con ese ID, con sus
+        datos de perfil, o None si no existe.
+        """
+        # IMPORTACIONES LOCALES DENTRO DE LA FUNCIÓN
+        from .usuario_estandar import UsuarioEstandar
+        from .administrador import Administrador
+
+        usuario_data = obtener_usuario_por_id(id_usuario)
+        if usuario_data is None:
+            return None
+        id_u, nombre_u, hash_u, rol_u = usuario_data
+        perfil_data = obtener_perfil_por_usuario_id(id_u)
+        if rol_u == 'administrador':
+            return Administrador(id_u, nombre_u, hash_u, rol_u, perfil_data)
+        else:
+            return UsuarioEstandar(id_u, nombre_u, hash_u, rol_u, perfil_data)
+
     def actualizar_perfil(self, nombre_completo=None, apellido=None, email=None, fecha_nacimiento=None, direccion=None, telefono=None):
         """
         Permite al usuario actualizar sus propios datos de perfil.
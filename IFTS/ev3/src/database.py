@@ -1,10 +1,25 @@
 # database.py
 
-import mysql.connector
-from mysql.connector import Error
-import hashlib
+import os
+import sys
+from collections import OrderedDict
+
+# Todos los puntos de entrada de ev3 importan este módulo antes que busqueda y sesiones,
+# que usan el paquete comun: la carpeta IFTS se agrega al path una sola vez, acá
+_CARPETA_IFTS = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+if _CARPETA_IFTS not in sys.path:
+    sys.path.append(_CARPETA_IFTS)
+
+from backends import ErrorBaseDatos, crear_motor
+from pool_conexiones import PoolConexiones, PoolAgotadoError
+from cache_usuarios import CacheLRU
+from hash_contrasenas import VERSION_FORMATO, hashear_contrasena
+from busqueda import indexar_usuario, quitar_usuario_del_indice
 
 # --- Configuración de la Base de Datos ---
+# Motor a usar: 'mysql' (servidor) o 'sqlite' (embebido, sin servidor). Se puede elegir con la variable de entorno DB_MOTOR.
+DB_MOTOR = os.environ.get('DB_MOTOR', 'mysql')
+
 DB_CONFIG = {
     'host': 'localhost',
     'database': 'proyecto_usuarios_db',
@@ -12,21 +27,126 @@ DB_CONFIG = {
     'password': 'root'
 }
 
+SQLITE_CONFIG = {
+    'database': 'proyecto_usuarios_db.sqlite3'
+}
+
+# --- Configuración del Pool de Conexiones ---
+DB_POOL_CONFIG = {
+    'tamano_maximo': 5,          # Conexiones abiertas como máximo
+    'tiempo_max_inactiva': 300,  # Segundos antes de cerrar una conexión libre sin uso
+    'verificar_tras': 30,        # Segundos de inactividad tras los cuales se verifica la conexión al prestarla
+    'timeout_espera': 5          # Segundos de espera por una conexión libre
+}
+
+# --- Configuración de la Caché de Lecturas ---
+# Usuarios y perfiles leídos recientemente se sirven desde memoria hasta que vencen o se modifican
+DB_CACHE_CONFIG = {
+    'tamano_maximo': 1024,  # Entradas como máximo por caché
+    'ttl': 60               # Segundos de vigencia de cada entrada
+}
+
+_motor = None
+_pool = None
+_cache_usuarios = CacheLRU(**DB_CACHE_CONFIG)  # Claves ('id', id_usuario) y ('nombre', nombre_usuario)
+_cache_perfiles = CacheLRU(**DB_CACHE_CONFIG)  # Clave id_usuario
+_nombre_por_id = OrderedDict()                 # Para invalidar también la entrada por nombre
+
+# Excepción que capturan las funciones de este módulo; al cargar el motor se reemplaza por la suya
+Error = ErrorBaseDatos
+
 # --- Funciones de Conexión e Inicialización ---
 
+def configurar_motor(nombre, **config):
+    """
+    Cambia el motor de base de datos (por ejemplo configurar_motor('sqlite', database='usuarios.db')).
+    Si no se pasa configuración se usa DB_CONFIG o SQLITE_CONFIG. Cierra el pool del motor anterior.
+    """
+    global DB_MOTOR, _motor, Error
+    cerrar_pool()
+    if not config:
+        config = SQLITE_CONFIG if nombre == 'sqlite' else DB_CONFIG
+    _motor = crear_motor(nombre, **config)
+    DB_MOTOR = nombre
+    limpiar_cache()
+    Error = _motor.Error
+    return _motor
+
+def _obtener_motor():
+    """Carga el motor configurado en DB_MOTOR la primera vez que se necesita."""
+    if _motor is None:
+        configurar_motor(DB_MOTOR)
+    return _motor
+
+def _obtener_pool():
+    """Crea el pool la primera vez que se necesita y lo reutiliza después."""
+    global _pool
+    if _pool is None:
+        motor = _obtener_motor()
+        _pool = PoolConexiones(motor.conectar, verificar_conexion=motor.verificar_conexion, **DB_POOL_CONFIG)
+    return _pool
+
 def get_db_connection():
-    """Establece y retorna una conexión a la base de datos MySQL."""
+    """
+    Retorna una conexión a la base de datos tomada del pool.
+    Al llamar a close() la conexión vuelve al pool en lugar de cerrarse.
+    """
     try:
-        conn = mysql.connector.connect(**DB_CONFIG)
-        if conn.is_connected():
-            return conn
+        return _obtener_pool().obtener()
     except Error as e:
-        print(f"Error al conectar a MySQL: {e}")
+        print(f"Error al conectar a la base de datos: {e}")
         return None
+    except PoolAgotadoError as e:
+        print(f"Error al obtener conexión: {e}")
+        return None
+
+def obtener_metricas_pool():
+    """Retorna los contadores del pool (creadas, reutilizadas, esperas, agotamientos, etc.)."""
+    return _obtener_pool().obtener_metricas()
+
+def cerrar_pool():
+    """Cierra todas las conexiones del pool (por ejemplo, al salir del programa)."""
+    global _pool
+    if _pool is not None:
+        _pool.cerrar()
+        _pool = None
+
+# --- Caché de lecturas ---
+
+def _guardar_usuario_en_cache(usuario_data):
+    """Guarda la tupla (id, nombre, hash, rol) bajo su ID y su nombre. Los 'no encontrado' no se guardan."""
+    if usuario_data:
+        id_usuario, nombre_usuario = usuario_data[0], usuario_data[1]
+        _cache_usuarios.guardar(('id', id_usuario), usuario_data)
+        _cache_usuarios.guardar(('nombre', nombre_usuario), usuario_data)
+        _nombre_por_id[id_usuario] = nombre_usuario
+        _nombre_por_id.move_to_end(id_usuario)
+        if len(_nombre_por_id) > _cache_usuarios.tamano_maximo:
+            # Si olvidamos a qué nombre corresponde un ID, descartamos también esa entrada para no dejarla sin invalidar
+            _, nombre_olvidado = _nombre_por_id.popitem(last=False)
+            _cache_usuarios.invalidar(('nombre', nombre_olvidado))
+
+def invalidar_cache_usuario(id_usuario):
+    """Descarta de la caché el usuario y el perfil de id_usuario (se llama después de modificarlos)."""
+    _cache_usuarios.invalidar(('id', id_usuario))
+    nombre_usuario = _nombre_por_id.pop(id_usuario, None)
+    if nombre_usuario is not None:
+        _cache_usuarios.invalidar(('nombre', nombre_usuario))
+    _cache_perfiles.invalidar(id_usuario)
+
+def limpiar_cache():
+    """Vacía las cachés de usuarios y perfiles."""
+    _cache_usuarios.limpiar()
+    _cache_perfiles.limpiar()
+    _nombre_por_id.clear()
+
+def obtener_estadisticas_cache():
+    """Retorna aciertos, fallos, vencidas, descartadas y tasa de aciertos de cada caché."""
+    return {'usuarios': _cache_usuarios.obtener_estadisticas(), 'perfiles': _cache_perfiles.obtener_estadisticas()}
 
 def initialize_db():
     """
-    Inicializa la base de datos MySQL creando las tablas 'usuarios' y 'perfiles' si no existen.
+    Inicializa la base de datos creando las tablas 'usuarios' y 'perfiles' si no existen.
     También inserta un usuario administrador por defecto si la tabla 'usuarios' está vacía.
     """
     conn = None
@@ -38,38 +158,14 @@ def initialize_db():
 
         cursor = conn.cursor()
 
-        # Script SQL para crear la tabla de usuarios
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS usuarios (
-                id_usuario INT AUTO_INCREMENT PRIMARY KEY,
-                nombre_usuario VARCHAR(255) NOT NULL UNIQUE,
-                contrasena_hash VARCHAR(255) NOT NULL,
-                rol VARCHAR(50) NOT NULL,
-                CHECK (rol IN ('administrador', 'estandar'))
-            );
-        ''')
-
-        # Script SQL para crear la tabla de perfiles
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS perfiles (
-                id_perfil INT AUTO_INCREMENT PRIMARY KEY,
-                id_usuario INT NOT NULL UNIQUE,          -- Clave foránea a usuarios.id_usuario
-                nombre_completo VARCHAR(255) NULL,
-                apellido VARCHAR(255) NULL,
-                email VARCHAR(255) UNIQUE NULL,
-                fecha_nacimiento DATE NULL,
-                direccion VARCHAR(255) NULL,
-                telefono VARCHAR(50) NULL,
-                
-                FOREIGN KEY (id_usuario) REFERENCES usuarios(id_usuario)
-                    ON DELETE CASCADE -- Si se elimina un usuario, su perfil también se elimina
-            );
-        ''')
+        # Crear las tablas 'usuarios' y 'perfiles' con la sintaxis del motor configurado
+        for sentencia in _obtener_motor().sentencias_esquema():
+            cursor.execute(sentencia)
 
         # Verificar si ya existe un administrador para no duplicarlo
         cursor.execute("SELECT COUNT(*) FROM usuarios WHERE rol = 'administrador'")
         if cursor.fetchone()[0] == 0:
-            default_admin_pass_hash = hashlib.sha256("admin123".encode()).hexdigest()
+            default_admin_pass_hash = hashear_contrasena("admin123")
             # Primero insertamos en usuarios
             cursor.execute('''
                 INSERT INTO usuarios (nombre_usuario, contrasena_hash, rol)
@@ -88,10 +184,10 @@ def initialize_db():
             print("Administrador por defecto 'admin' creado con contraseña 'admin123' y perfil básico.")
 
         conn.commit()
-        print(f"Base de datos MySQL '{DB_CONFIG['database']}' inicializada correctamente con tablas de usuarios y perfiles.")
+        print(f"Base de datos {_obtener_motor().descripcion()} inicializada correctamente con tablas de usuarios y perfiles.")
 
     except Error as e:
-        print(f"Error durante la inicialización de MySQL: {e}")
+        print(f"Error durante la inicialización de la base de datos: {e}")
         if conn:
             conn.rollback()
     finally:
@@ -113,6 +209,7 @@ def crear_usuario(nombre_usuario, contrasena_hash, rol):
             VALUES (%s, %s, %s)
         ''', (nombre_usuario, contrasena_hash, rol))
         conn.commit()
+        indexar_usuario(cursor.lastrowid, nombre_usuario=nombre_usuario)
         return cursor.lastrowid # Retorna el ID del nuevo usuario
     except Error as e:
         if e.errno == 1062:
@@ -121,16 +218,25 @@ def crear_usuario(nombre_usuario, contrasena_hash, rol):
             print(f"Error al crear usuario: {e}")
         if conn: conn.rollback()
         return None
+    finally:
+        if conn and conn.is_connected():
+            cursor.close()
+            conn.close()
 
 def obtener_usuario_por_nombre(nombre_usuario):
     """Busca un usuario por su nombre de usuario. Retorna una tupla (id, nombre, hash, rol) o None."""
+    encontrado, usuario_data = _cache_usuarios.obtener(('nombre', nombre_usuario))
+    if encontrado:
+        return usuario_data
     conn = None
     try:
         conn = get_db_connection()
         if conn is None: return None
         cursor = conn.cursor()
         cursor.execute('SELECT id_usuario, nombre_usuario, contrasena_hash, rol FROM usuarios WHERE nombre_usuario = %s', (nombre_usuario,))
-        return cursor.fetchone()
+        usuario_data = cursor.fetchone()
+        _guardar_usuario_en_cache(usuario_data)
+        return usuario_data
     except Error as e:
         print(f"Error al obtener usuario: {e}")
         return None
@@ -139,15 +245,54 @@ def obtener_usuario_por_nombre(nombre_usuario):
             cursor.close()
             conn.close()
 
+def obtener_usuario_con_perfil_por_nombre(nombre_usuario):
+    """
+    Busca un usuario por su nombre de usuario y trae su perfil en la misma consulta.
+    Retorna una tupla (datos_usuario, datos_perfil), donde datos_usuario es (id, nombre, hash, rol)
+    y datos_perfil tiene la misma forma que obtener_perfil_por_usuario_id() (o None si no tiene perfil).
+    Si el usuario no existe retorna None.
+    """
+    conn = None
+    try:
+        conn = get_db_connection()
+        if conn is None: return None
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT u.id_usuario, u.nombre_usuario, u.contrasena_hash, u.rol,
+                   p.id_perfil, p.id_usuario, p.nombre_completo, p.apellido, p.email,
+                   p.fecha_nacimiento, p.direccion, p.telefono
+            FROM usuarios u
+            LEFT JOIN perfiles p ON p.id_usuario = u.id_usuario
+            WHERE u.nombre_usuario = %s
+        ''', (nombre_usuario,))
+        fila = cursor.fetchone()
+        if fila is None:
+            return None
+        datos_usuario = tuple(fila[:4])
+        datos_perfil = tuple(fila[4:]) if fila[4] is not None else None
+        return datos_usuario, datos_perfil
+    except Error as e:
+        print(f"Error al obtener usuario con perfil: {e}")
+        return None
+    finally:
+        if conn and conn.is_connected():
+            cursor.close()
+            conn.close()
+
 def obtener_usuario_por_id(id_usuario):
     """Busca un usuario por su ID. Retorna una tupla (id, nombre, hash, rol) o None."""
+    encontrado, usuario_data = _cache_usuarios.obtener(('id', id_usuario))
+    if encontrado:
+        return usuario_data
     conn = None
     try:
         conn = get_db_connection()
         if conn is None: return None
         cursor = conn.cursor()
         cursor.execute('SELECT id_usuario, nombre_usuario, contrasena_hash, rol FROM usuarios WHERE id_usuario = %s', (id_usuario,))
-        return cursor.fetchone()
+        usuario_data = cursor.fetchone()
+        _guardar_usuario_en_cache(usuario_data)
+        return usuario_data
     except Error as e:
         print(f"Error al obtener usuario por ID: {e}")
         return None
@@ -173,6 +318,50 @@ def obtener_todos_los_usuarios():
             cursor.close()
             conn.close()
 
+def obtener_pagina_usuarios_con_perfil(despues_de_id=0, tamano_pagina=100):
+    """
+    Retorna una página de usuarios junto con sus datos de perfil en una sola consulta (LEFT JOIN).
+    Usa paginación por clave (id_usuario > despues_de_id), así cada página cuesta lo mismo
+    sin importar cuántos usuarios haya antes.
+    Cada fila es una tupla (id_usuario, nombre_usuario, rol, nombre_completo, apellido, email).
+    """
+    conn = None
+    try:
+        conn = get_db_connection()
+        if conn is None: return []
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT u.id_usuario, u.nombre_usuario, u.rol, p.nombre_completo, p.apellido, p.email
+            FROM usuarios u
+            LEFT JOIN perfiles p ON p.id_usuario = u.id_usuario
+            WHERE u.id_usuario > %s
+            ORDER BY u.id_usuario
+            LIMIT %s
+        ''', (despues_de_id, tamano_pagina))
+        return cursor.fetchall()
+    except Error as e:
+        print(f"Error al obtener la página de usuarios: {e}")
+        return []
+    finally:
+        if conn and conn.is_connected():
+            cursor.close()
+            conn.close()
+
+def iterar_usuarios_con_perfil(tamano_pagina=100):
+    """
+    Generador que recorre todos los usuarios con su perfil, página por página.
+    Solo mantiene en memoria una página a la vez y libera la conexión entre páginas.
+    """
+    ultimo_id = 0
+    while True:
+        pagina = obtener_pagina_usuarios_con_perfil(ultimo_id, tamano_pagina)
+        if not pagina:
+            return
+        yield pagina
+        if len(pagina) < tamano_pagina:
+            return
+        ultimo_id = pagina[-1][0]
+
 def actualizar_rol_usuario(id_usuario, nuevo_rol):
     """Actualiza el rol de un usuario específico."""
     if nuevo_rol not in ['administrador', 'estandar']:
@@ -186,6 +375,7 @@ def actualizar_rol_usuario(id_usuario, nuevo_rol):
         cursor = conn.cursor()
         cursor.execute('UPDATE usuarios SET rol = %s WHERE id_usuario = %s', (nuevo_rol, id_usuario))
         conn.commit()
+        invalidar_cache_usuario(id_usuario)
         return cursor.rowcount > 0
     except Error as e:
         print(f"Error al actualizar rol del usuario: {e}")
@@ -196,6 +386,30 @@ def actualizar_rol_usuario(id_usuario, nuevo_rol):
             cursor.close()
             conn.close()
 
+def actualizar_hash_contrasena(id_usuario, hash_anterior, hash_nuevo):
+    """
+    Reemplaza el hash de la contraseña solo si sigue siendo hash_anterior
+    (si otro proceso lo cambió mientras tanto, no lo pisa). Retorna True si se actualizó.
+    """
+    conn = None
+    try:
+        conn = get_db_connection()
+        if conn is None: return False
+        cursor = conn.cursor()
+        cursor.execute('UPDATE usuarios SET contrasena_hash = %s WHERE id_usuario = %s AND contrasena_hash = %s',
+                       (hash_nuevo, id_usuario, hash_anterior))
+        conn.commit()
+        invalidar_cache_usuario(id_usuario)
+        return cursor.rowcount > 0
+    except Error as e:
+        print(f"Error al actualizar el hash de la contraseña: {e}")
+        if conn: conn.rollback()
+        return False
+    finally:
+        if conn and conn.is_connected():
+            cursor.close()
+            conn.close()
+
 def eliminar_usuario(id_usuario):
     """
     Elimina un usuario de la base de datos por su ID.
@@ -208,6 +422,8 @@ def eliminar_usuario(id_usuario):
         cursor = conn.cursor()
         cursor.execute('DELETE FROM usuarios WHERE id_usuario = %s', (id_usuario,))
         conn.commit()
+        invalidar_cache_usuario(id_usuario) # También descarta el perfil, borrado en cascada
+        quitar_usuario_del_indice(id_usuario)
         return cursor.rowcount > 0
     except Error as e:
         print(f"Error al eliminar usuario: {e}")
@@ -233,6 +449,7 @@ def crear_perfil(id_usuario, nombre_completo=None, apellido=None, email=None, fe
             VALUES (%s, %s, %s, %s, %s, %s, %s)
         ''', (id_usuario, nombre_completo, apellido, email, fecha_nacimiento, direccion, telefono))
         conn.commit()
+        indexar_usuario(id_usuario, nombre_completo=nombre_completo, apellido=apellido, email=email)
         return True
     except Error as e:
         if e.errno == 1062: # Duplicate entry for id_usuario in perfiles
@@ -246,8 +463,49 @@ def crear_perfil(id_usuario, nombre_completo=None, apellido=None, email=None, fe
             cursor.close()
             conn.close()
 
+def registrar_usuario_con_perfil(nombre_usuario, contrasena_hash, rol, nombre_completo=None, apellido=None, email=None, fecha_nacimiento=None, direccion=None, telefono=None):
+    """
+    Inserta el usuario y su perfil en una única transacción sobre la misma conexión.
+    Si falla cualquiera de los dos INSERT no queda nada guardado.
+    Retorna una tupla (id_usuario, datos_perfil) con datos_perfil en el mismo formato
+    que obtener_perfil_por_usuario_id(), o None si no se pudo registrar.
+    """
+    conn = None
+    try:
+        conn = get_db_connection()
+        if conn is None: return None
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO usuarios (nombre_usuario, contrasena_hash, rol)
+            VALUES (%s, %s, %s)
+        ''', (nombre_usuario, contrasena_hash, rol))
+        id_usuario = cursor.lastrowid
+        cursor.execute('''
+            INSERT INTO perfiles (id_usuario, nombre_completo, apellido, email, fecha_nacimiento, direccion, telefono)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+        ''', (id_usuario, nombre_completo, apellido, email, fecha_nacimiento, direccion, telefono))
+        id_perfil = cursor.lastrowid
+        conn.commit()
+        indexar_usuario(id_usuario, nombre_usuario=nombre_usuario, nombre_completo=nombre_completo,
+                        apellido=apellido, email=email)
+        return id_usuario, (id_perfil, id_usuario, nombre_completo, apellido, email, fecha_nacimiento, direccion, telefono)
+    except Error as e:
+        if e.errno == 1062:
+            print(f"Error: El nombre de usuario '{nombre_usuario}' o el email ya están registrados.")
+        else:
+            print(f"Error al registrar usuario con perfil: {e}")
+        if conn: conn.rollback()
+        return None
+    finally:
+        if conn and conn.is_connected():
+            cursor.close()
+            conn.close()
+
 def obtener_perfil_por_usuario_id(id_usuario):
     """Busca un perfil por el ID de usuario. Retorna una tupla con los datos del perfil o None."""
+    encontrado, perfil_data = _cache_perfiles.obtener(id_usuario)
+    if encontrado:
+        return perfil_data
     conn = None
     try:
         conn = get_db_connection()
@@ -258,7 +516,10 @@ def obtener_perfil_por_usuario_id(id_usuario):
             FROM perfiles
             WHERE id_usuario = %s
         ''', (id_usuario,))
-        return cursor.fetchone()
+        perfil_data = cursor.fetchone()
+        if perfil_data:
+            _cache_perfiles.guardar(id_usuario, perfil_data)
+        return perfil_data
     except Error as e:
         print(f"Error al obtener perfil para usuario ID {id_usuario}: {e}")
         return None
@@ -306,7 +567,12 @@ def actualizar_perfil(id_usuario, nombre_completo=None, apellido=None, email=Non
 
         cursor.execute(query, tuple(params))
         conn.commit()
-        return cursor.rowcount > 0
+        actualizado = cursor.rowcount > 0
+        if actualizado:
+            # Si no había perfil para ese id no se toca la caché ni el índice de búsqueda
+            invalidar_cache_usuario(id_usuario)
+            indexar_usuario(id_usuario, nombre_completo=nombre_completo, apellido=apellido, email=email)
+        return actualizado
     except Error as e:
         print(f"Error al actualizar perfil para usuario ID {id_usuario}: {e}")
         if conn: conn.rollback()
@@ -317,6 +583,155 @@ def actualizar_perfil(id_usuario, nombre_completo=None, apellido=None, email=Non
             conn.close()
 
 
+
+# --- Funciones para importación y exportación masiva ---
+
+CAMPOS_PERFIL = ('nombre_completo', 'apellido', 'email', 'fecha_nacimiento', 'direccion', 'telefono')
+
+def insertar_lote_usuarios_con_perfil(filas):
+    """
+    Inserta un lote de usuarios con sus perfiles en una sola transacción, usando executemany.
+    Cada fila es un diccionario con 'nombre_usuario', 'contrasena_hash', 'rol' y los campos de perfil.
+    Los nombres de usuario que ya existen en la base se saltean.
+    Retorna una tupla (cantidad_insertada, nombres_duplicados), o None si el lote falló
+    (en ese caso no se guarda nada del lote).
+    """
+    if not filas:
+        return 0, []
+    conn = None
+    try:
+        conn = get_db_connection()
+        if conn is None: return None
+        cursor = conn.cursor()
+
+        nombres = [fila['nombre_usuario'] for fila in filas]
+        marcadores = ', '.join(['%s'] * len(nombres))
+        cursor.execute(f'SELECT nombre_usuario FROM usuarios WHERE nombre_usuario IN ({marcadores})', tuple(nombres))
+        existentes = {nombre for (nombre,) in cursor.fetchall()}
+        nuevas = [fila for fila in filas if fila['nombre_usuario'] not in existentes]
+        duplicados = [nombre for nombre in nombres if nombre in existentes]
+        if not nuevas:
+            return 0, duplicados
+
+        cursor.executemany('''
+            INSERT INTO usuarios (nombre_usuario, contrasena_hash, rol)
+            VALUES (%s, %s, %s)
+        ''', [(f['nombre_usuario'], f['contrasena_hash'], f['rol']) for f in nuevas])
+
+        # Recuperamos los IDs generados para asociar los perfiles
+        nombres_nuevos = [f['nombre_usuario'] for f in nuevas]
+        marcadores = ', '.join(['%s'] * len(nombres_nuevos))
+        cursor.execute(f'SELECT id_usuario, nombre_usuario FROM usuarios WHERE nombre_usuario IN ({marcadores})', tuple(nombres_nuevos))
+        ids = {nombre: id_u for id_u, nombre in cursor.fetchall()}
+
+        cursor.executemany('''
+            INSERT INTO perfiles (id_usuario, nombre_completo, apellido, email, fecha_nacimiento, direccion, telefono)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+        ''', [(ids[f['nombre_usuario']],) + tuple(f.get(campo) for campo in CAMPOS_PERFIL) for f in nuevas])
+
+        conn.commit()
+        for f in nuevas:
+            indexar_usuario(ids[f['nombre_usuario']], nombre_usuario=f['nombre_usuario'], nombre_completo=f.get('nombre_completo'),
+                            apellido=f.get('apellido'), email=f.get('email'))
+        return len(nuevas), duplicados
+    except Error as e:
+        print(f"Error al insertar lote de usuarios: {e}")
+        if conn: conn.rollback()
+        return None
+    finally:
+        if conn and conn.is_connected():
+            cursor.close()
+            conn.close()
+
+def iterar_filas_exportacion(tamano_lote=1000, incluir_hash=False):
+    """
+    Generador que recorre todos los usuarios con su perfil usando un cursor del lado del servidor
+    (sin buffer), leyendo de a tamano_lote filas. Cada fila es un diccionario.
+    """
+    columnas = ['id_usuario', 'nombre_usuario'] + (['contrasena_hash'] if incluir_hash else []) + ['rol'] + list(CAMPOS_PERFIL)
+    seleccion = ', '.join(('p.' if c in CAMPOS_PERFIL else 'u.') + c for c in columnas)
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        if conn is None: return
+        cursor = conn.cursor(buffered=False) # Las filas se traen del servidor a medida que se piden
+        cursor.execute(f'''
+            SELECT {seleccion}
+            FROM usuarios u
+            LEFT JOIN perfiles p ON p.id_usuario = u.id_usuario
+            ORDER BY u.id_usuario
+        ''')
+        while True:
+            filas = cursor.fetchmany(tamano_lote)
+            if not filas:
+                break
+            for fila in filas:
+                yield dict(zip(columnas, fila))
+    except Error as e:
+        print(f"Error al exportar usuarios: {e}")
+    finally:
+        if conn and conn.is_connected():
+            if cursor is not None:
+                cursor.close()
+            conn.close()
+
+# --- Funciones para la migración de hashes de contraseña ---
+
+def obtener_pagina_hashes_legados(despues_de_id=0, tamano_pagina=1000):
+    """
+    Retorna una página de tuplas (id_usuario, contrasena_hash) con hashes del formato viejo
+    (sin prefijo de versión), paginando por clave (id_usuario > despues_de_id).
+    """
+    conn = None
+    try:
+        conn = get_db_connection()
+        if conn is None: return []
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT id_usuario, contrasena_hash
+            FROM usuarios
+            WHERE id_usuario > %s AND contrasena_hash NOT LIKE %s
+            ORDER BY id_usuario
+            LIMIT %s
+        ''', (despues_de_id, VERSION_FORMATO + '$%', tamano_pagina))
+        return cursor.fetchall()
+    except Error as e:
+        print(f"Error al obtener la página de hashes: {e}")
+        return []
+    finally:
+        if conn and conn.is_connected():
+            cursor.close()
+            conn.close()
+
+def actualizar_hashes_en_lote(cambios):
+    """
+    Aplica en una sola transacción una lista de tuplas (id_usuario, hash_anterior, hash_nuevo).
+    Igual que actualizar_hash_contrasena, no pisa hashes que cambiaron mientras tanto.
+    Retorna la cantidad de filas actualizadas, o None si el lote falló.
+    """
+    if not cambios:
+        return 0
+    conn = None
+    try:
+        conn = get_db_connection()
+        if conn is None: return None
+        cursor = conn.cursor()
+        cursor.executemany('UPDATE usuarios SET contrasena_hash = %s WHERE id_usuario = %s AND contrasena_hash = %s',
+                           [(hash_nuevo, id_usuario, hash_anterior) for id_usuario, hash_anterior, hash_nuevo in cambios])
+        conn.commit()
+        for id_usuario, _, _ in cambios:
+            invalidar_cache_usuario(id_usuario)
+        return cursor.rowcount
+    except Error as e:
+        print(f"Error al actualizar el lote de hashes: {e}")
+        if conn: conn.rollback()
+        return None
+    finally:
+        if conn and conn.is_connected():
+            cursor.close()
+            conn.close()
+
 # Ejemplo de uso (para pruebas, no debería estar en el archivo final)
 if __name__ == "__main__":
     print("Inicializando la base de datos...")
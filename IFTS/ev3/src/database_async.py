@@ -0,0 +1,299 @@
+# database_async.py
+"""
+Versión asyncio de las funciones CRUD de database.py, para usar desde un front end asíncrono.
+
+- Con el motor 'mysql' usa un pool asíncrono de aiomysql (pip install aiomysql),
+  así las consultas no bloquean el event loop.
+- Con el motor 'sqlite' (embebido, sin red) las consultas corren en hilos sobre
+  el pool de database.py, con asyncio.to_thread.
+
+Uso:
+    await inicializar()          # motor configurado en database.DB_MOTOR
+    usuario = await obtener_usuario_por_nombre('admin')
+    await cerrar()
+"""
+
+import asyncio
+
+import database
+from backends import ErrorBaseDatos
+from busqueda import indexar_usuario, quitar_usuario_del_indice
+
+# --- Configuración del Pool Asíncrono (solo MySQL) ---
+DB_POOL_ASYNC_CONFIG = {
+    'minsize': 1,
+    'maxsize': 10
+}
+
+_ejecutor = None
+_motor = None  # Motor elegido en inicializar(); puede no ser database.DB_MOTOR
+
+
+class _EjecutorMySQL:
+    """Ejecuta consultas con un pool de aiomysql."""
+    def __init__(self, pool):
+        self._pool = pool
+
+    @classmethod
+    async def crear(cls, config):
+        import aiomysql # Dependencia opcional: solo hace falta con el motor MySQL
+        pool = await aiomysql.create_pool(
+            host=config.get('host', 'localhost'), port=config.get('port', 3306),
+            user=config['user'], password=config['password'], db=config['database'],
+            autocommit=False, **DB_POOL_ASYNC_CONFIG
+        )
+        return cls(pool)
+
+    async def ejecutar(self, sentencias, modo):
+        """Ejecuta las sentencias en una transacción y retorna según modo ('uno', 'todos' o 'escritura')."""
+        import pymysql
+        async with self._pool.acquire() as conn:
+            try:
+                async with conn.cursor() as cursor:
+                    ids = []
+                    for consulta, parametros in sentencias:
+                        await cursor.execute(consulta, parametros)
+                        ids.append(cursor.lastrowid)
+                    if modo in ('uno', 'todos'):
+                        filas = await (cursor.fetchone() if modo == 'uno' else cursor.fetchall())
+                        # Cierra la transacción que abrió la lectura: Pool.release cierra (en lugar de
+                        # reutilizar) las conexiones que vuelven al pool con una transacción abierta
+                        await conn.rollback()
+                        return filas
+                    await conn.commit()
+                    return ids, cursor.rowcount
+            except pymysql.MySQLError as e:
+                await conn.rollback()
+                raise ErrorBaseDatos(str(e), e.args[0] if e.args else None) from e
+
+    async def cerrar(self):
+        self._pool.close()
+        await self._pool.wait_closed()
+
+
+class _EjecutorEnHilos:
+    """Ejecuta consultas en hilos usando el pool sincrónico de database.py (motor SQLite)."""
+    def _ejecutar_sincronico(self, sentencias, modo):
+        conn = database.get_db_connection()
+        if conn is None:
+            raise ErrorBaseDatos("No se pudo obtener una conexión.")
+        cursor = conn.cursor()
+        try:
+            ids = []
+            for consulta, parametros in sentencias:
+                cursor.execute(consulta, parametros)
+                ids.append(cursor.lastrowid)
+            if modo == 'uno':
+                return cursor.fetchone()
+            if modo == 'todos':
+                return cursor.fetchall()
+            conn.commit()
+            return ids, cursor.rowcount
+        except ErrorBaseDatos:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+
+    async def ejecutar(self, sentencias, modo):
+        return await asyncio.to_thread(self._ejecutar_sincronico, sentencias, modo)
+
+    async def cerrar(self):
+        pass
+
+
+# --- Inicialización ---
+
+async def inicializar(motor=None):
+    """
+    Crea el pool asíncrono para el motor indicado (por defecto, el de database.py).
+    Con 'sqlite' las consultas usan el pool de database.py, así que ese tiene que ser
+    también el motor de database.py: si no, lanza ValueError.
+    """
+    global _ejecutor, _motor
+    motor = motor or database.DB_MOTOR
+    if motor != 'mysql' and motor != database.DB_MOTOR:
+        raise ValueError(f"El motor '{motor}' usa el pool de database.py, que está configurado con "
+                         f"'{database.DB_MOTOR}'. Llamar antes a database.configurar_motor('{motor}').")
+    _motor = motor
+    if motor == 'mysql':
+        _ejecutor = await _EjecutorMySQL.crear(database.DB_CONFIG)
+    else:
+        _ejecutor = _EjecutorEnHilos()
+    return _ejecutor
+
+async def cerrar():
+    """Cierra el pool asíncrono."""
+    global _ejecutor, _motor
+    if _ejecutor is not None:
+        await _ejecutor.cerrar()
+        _ejecutor = None
+        _motor = None
+
+async def _ejecutar(sentencias, modo):
+    if _ejecutor is None:
+        await inicializar()
+    return await _ejecutor.ejecutar(sentencias, modo)
+
+
+# --- Funciones CRUD para la tabla 'usuarios' ---
+
+async def crear_usuario(nombre_usuario, contrasena_hash, rol):
+    """Inserta un nuevo usuario. Retorna su ID o None."""
+    try:
+        ids, _ = await _ejecutar([('''
+            INSERT INTO usuarios (nombre_usuario, contrasena_hash, rol)
+            VALUES (%s, %s, %s)
+        ''', (nombre_usuario, contrasena_hash, rol))], 'escritura')
+        indexar_usuario(ids[0], nombre_usuario=nombre_usuario)
+        return ids[0]
+    except ErrorBaseDatos as e:
+        if e.errno == 1062:
+            print(f"Error: El nombre de usuario '{nombre_usuario}' ya existe.")
+        else:
+            print(f"Error al crear usuario: {e}")
+        return None
+
+async def obtener_usuario_por_nombre(nombre_usuario):
+    """Busca un usuario por su nombre de usuario. Retorna una tupla (id, nombre, hash, rol) o None."""
+    try:
+        return await _ejecutar([('SELECT id_usuario, nombre_usuario, contrasena_hash, rol FROM usuarios WHERE nombre_usuario = %s',
+                                 (nombre_usuario,))], 'uno')
+    except ErrorBaseDatos as e:
+        print(f"Error al obtener usuario: {e}")
+        return None
+
+async def obtener_usuario_por_id(id_usuario):
+    """Busca un usuario por su ID. Retorna una tupla (id, nombre, hash, rol) o None."""
+    try:
+        return await _ejecutar([('SELECT id_usuario, nombre_usuario, contrasena_hash, rol FROM usuarios WHERE id_usuario = %s',
+                                 (id_usuario,))], 'uno')
+    except ErrorBaseDatos as e:
+        print(f"Error al obtener usuario por ID: {e}")
+        return None
+
+async def obtener_usuario_con_perfil_por_nombre(nombre_usuario):
+    """Igual que database.obtener_usuario_con_perfil_por_nombre: retorna (datos_usuario, datos_perfil) o None."""
+    try:
+        fila = await _ejecutar([('''
+            SELECT u.id_usuario, u.nombre_usuario, u.contrasena_hash, u.rol,
+                   p.id_perfil, p.id_usuario, p.nombre_completo, p.apellido, p.email,
+                   p.fecha_nacimiento, p.direccion, p.telefono
+            FROM usuarios u
+            LEFT JOIN perfiles p ON p.id_usuario = u.id_usuario
+            WHERE u.nombre_usuario = %s
+        ''', (nombre_usuario,))], 'uno')
+    except ErrorBaseDatos as e:
+        print(f"Error al obtener usuario con perfil: {e}")
+        return None
+    if fila is None:
+        return None
+    return tuple(fila[:4]), (tuple(fila[4:]) if fila[4] is not None else None)
+
+async def actualizar_rol_usuario(id_usuario, nuevo_rol):
+    """Actualiza el rol de un usuario específico."""
+    if nuevo_rol not in ['administrador', 'estandar']:
+        print("Rol no válido. Debe ser 'administrador' o 'estandar'.")
+        return False
+    try:
+        _, filas = await _ejecutar([('UPDATE usuarios SET rol = %s WHERE id_usuario = %s', (nuevo_rol, id_usuario))], 'escritura')
+    except ErrorBaseDatos as e:
+        print(f"Error al actualizar rol del usuario: {e}")
+        return False
+    database.invalidar_cache_usuario(id_usuario)
+    return filas > 0
+
+async def eliminar_usuario(id_usuario):
+    """Elimina un usuario (y su perfil, por ON DELETE CASCADE)."""
+    try:
+        _, filas = await _ejecutar([('DELETE FROM usuarios WHERE id_usuario = %s', (id_usuario,))], 'escritura')
+    except ErrorBaseDatos as e:
+        print(f"Error al eliminar usuario: {e}")
+        return False
+    database.invalidar_cache_usuario(id_usuario)
+    quitar_usuario_del_indice(id_usuario)
+    return filas > 0
+
+
+# --- Funciones CRUD para la tabla 'perfiles' ---
+
+async def crear_perfil(id_usuario, nombre_completo=None, apellido=None, email=None, fecha_nacimiento=None, direccion=None, telefono=None):
+    """Inserta un nuevo perfil asociado a un id_usuario."""
+    try:
+        await _ejecutar([('''
+            INSERT INTO perfiles (id_usuario, nombre_completo, apellido, email, fecha_nacimiento, direccion, telefono)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+        ''', (id_usuario, nombre_completo, apellido, email, fecha_nacimiento, direccion, telefono))], 'escritura')
+        indexar_usuario(id_usuario, nombre_completo=nombre_completo, apellido=apellido, email=email)
+        return True
+    except ErrorBaseDatos as e:
+        if e.errno == 1062:
+            print(f"Error: Ya existe un perfil para el usuario ID {id_usuario}.")
+        else:
+            print(f"Error al crear perfil para usuario ID {id_usuario}: {e}")
+        return False
+
+async def registrar_usuario_con_perfil(nombre_usuario, contrasena_hash, rol, nombre_completo=None, apellido=None, email=None, fecha_nacimiento=None, direccion=None, telefono=None):
+    """Inserta usuario y perfil en una sola transacción. Retorna (id_usuario, datos_perfil) o None."""
+    try:
+        ids, _ = await _ejecutar([
+            ('''
+            INSERT INTO usuarios (nombre_usuario, contrasena_hash, rol)
+            VALUES (%s, %s, %s)
+            ''', (nombre_usuario, contrasena_hash, rol)),
+            # El ID del usuario se resuelve en la misma conexión con LAST_INSERT_ID()/last_insert_rowid()
+            (_sentencia_perfil_del_ultimo_usuario(), (nombre_completo, apellido, email, fecha_nacimiento, direccion, telefono)),
+        ], 'escritura')
+    except ErrorBaseDatos as e:
+        if e.errno == 1062:
+            print(f"Error: El nombre de usuario '{nombre_usuario}' o el email ya están registrados.")
+        else:
+            print(f"Error al registrar usuario con perfil: {e}")
+        return None
+    id_usuario, id_perfil = ids
+    indexar_usuario(id_usuario, nombre_usuario=nombre_usuario, nombre_completo=nombre_completo, apellido=apellido, email=email)
+    return id_usuario, (id_perfil, id_usuario, nombre_completo, apellido, email, fecha_nacimiento, direccion, telefono)
+
+def _sentencia_perfil_del_ultimo_usuario():
+    # Sin inicializar todavía, _ejecutar() va a usar el motor de database.py
+    ultimo_id = 'LAST_INSERT_ID()' if (_motor or database.DB_MOTOR) == 'mysql' else 'last_insert_rowid()'
+    return f'''
+            INSERT INTO perfiles (id_usuario, nombre_completo, apellido, email, fecha_nacimiento, direccion, telefono)
+            VALUES ({ultimo_id}, %s, %s, %s, %s, %s, %s)
+            '''
+
+async def obtener_perfil_por_usuario_id(id_usuario):
+    """Busca un perfil por el ID de usuario. Retorna una tupla con los datos del perfil o None."""
+    try:
+        return await _ejecutar([('''
+            SELECT id_perfil, id_usuario, nombre_completo, apellido, email, fecha_nacimiento, direccion, telefono
+            FROM perfiles
+            WHERE id_usuario = %s
+        ''', (id_usuario,))], 'uno')
+    except ErrorBaseDatos as e:
+        print(f"Error al obtener perfil para usuario ID {id_usuario}: {e}")
+        return None
+
+async def actualizar_perfil(id_usuario, nombre_completo=None, apellido=None, email=None, fecha_nacimiento=None, direccion=None, telefono=None):
+    """Actualiza solo los campos de perfil que no son None."""
+    campos = {'nombre_completo': nombre_completo, 'apellido': apellido, 'email': email,
+              'fecha_nacimiento': fecha_nacimiento, 'direccion': direccion, 'telefono': telefono}
+    updates = [(f"{campo} = %s", valor) for campo, valor in campos.items() if valor is not None]
+    if not updates:
+        print("No se proporcionaron datos para actualizar el perfil.")
+        return False
+
+    query = f"UPDATE perfiles SET {', '.join(u for u, _ in updates)} WHERE id_usuario = %s"
+    params = tuple(v for _, v in updates) + (id_usuario,)
+    try:
+        _, filas = await _ejecutar([(query, params)], 'escritura')
+    except ErrorBaseDatos as e:
+        print(f"Error al actualizar perfil para usuario ID {id_usuario}: {e}")
+        return False
+    actualizado = filas > 0
+    if actualizado:
+        # Igual que en database.actualizar_perfil: sin perfil para ese id no se toca la caché ni el índice
+        database.invalidar_cache_usuario(id_usuario)
+        indexar_usuario(id_usuario, nombre_completo=nombre_completo, apellido=apellido, email=email)
+    return actualizado
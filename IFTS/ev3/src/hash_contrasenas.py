@@ -0,0 +1,128 @@
+# hash_contrasenas.py
+"""
+Hash de contraseñas con una función de derivación de claves (KDF) configurable.
+
+Los hashes se guardan en la columna contrasena_hash con un formato versionado:
+
+    v1$<algoritmo>$<parámetros>$<sal en hex>$<hash en hex>
+    por ejemplo: v1$scrypt$n=16384,r=8,p=1$9f2c...$41ab...
+
+- Algoritmos: 'scrypt' o 'pbkdf2' (PBKDF2-HMAC-SHA256), ambos de hashlib.
+- 'sha256+scrypt' / 'sha256+pbkdf2': el KDF aplicado sobre un hash SHA-256 viejo.
+  Lo genera la migración sin conexión (migracion_hashes.py), que no conoce las contraseñas.
+- Un hash sin prefijo (64 caracteres hex) es el formato anterior: SHA-256 sin sal.
+
+Los hashes viejos y los envueltos se reemplazan por uno directo la próxima vez
+que el usuario inicia sesión (ver necesita_actualizacion).
+"""
+
+import hashlib
+import hmac
+import os
+
+VERSION_FORMATO = 'v1'
+PREFIJO_ENVUELTO = 'sha256+'
+
+# --- Configuración del KDF ---
+KDF_CONFIG = {
+    'algoritmo': 'scrypt',   # 'scrypt' o 'pbkdf2'
+    'scrypt': {'n': 2 ** 14, 'r': 8, 'p': 1},
+    'pbkdf2': {'i': 600_000},
+    'largo_sal': 16,         # Bytes
+    'largo_hash': 32         # Bytes
+}
+
+
+def configurar_kdf(algoritmo=None, **parametros):
+    """
+    Cambia el algoritmo y/o sus parámetros (por ejemplo configurar_kdf('pbkdf2', i=800_000)).
+    Los hashes ya guardados se siguen verificando con los parámetros con los que se crearon.
+    """
+    if algoritmo is not None:
+        if algoritmo not in ('scrypt', 'pbkdf2'):
+            raise ValueError("Algoritmo no válido. Debe ser 'scrypt' o 'pbkdf2'.")
+        KDF_CONFIG['algoritmo'] = algoritmo
+    KDF_CONFIG[KDF_CONFIG['algoritmo']].update(parametros)
+
+
+def _parametros_a_texto(parametros):
+    return ','.join(f"{clave}={valor}" for clave, valor in sorted(parametros.items()))
+
+
+def _texto_a_parametros(texto):
+    return {clave: int(valor) for clave, valor in (par.split('=') for par in texto.split(','))}
+
+
+def _derivar(algoritmo, parametros, secreto, sal):
+    largo = KDF_CONFIG['largo_hash']
+    if algoritmo == 'scrypt':
+        n, r, p = parametros['n'], parametros['r'], parametros['p']
+        # scrypt usa unos 128 * r * n bytes de memoria; dejamos margen sobre el límite por defecto de OpenSSL
+        return hashlib.scrypt(secreto, salt=sal, n=n, r=r, p=p, maxmem=256 * r * n, dklen=largo)
+    if algoritmo == 'pbkdf2':
+        return hashlib.pbkdf2_hmac('sha256', secreto, sal, parametros['i'], dklen=largo)
+    raise ValueError(f"Algoritmo de hash desconocido: '{algoritmo}'.")
+
+
+def _sha256_legado(contrasena):
+    """Hash del formato anterior (SHA-256 sin sal, en hex)."""
+    return hashlib.sha256(contrasena.encode()).hexdigest()
+
+
+def _armar_hash(algoritmo, secreto, envuelto=False):
+    parametros = KDF_CONFIG[algoritmo]
+    sal = os.urandom(KDF_CONFIG['largo_sal'])
+    derivado = _derivar(algoritmo, parametros, secreto, sal)
+    nombre = PREFIJO_ENVUELTO + algoritmo if envuelto else algoritmo
+    return '$'.join((VERSION_FORMATO, nombre, _parametros_a_texto(parametros), sal.hex(), derivado.hex()))
+
+
+def hashear_contrasena(contrasena):
+    """Retorna el hash de la contraseña con el algoritmo y los parámetros configurados."""
+    return _armar_hash(KDF_CONFIG['algoritmo'], contrasena.encode('utf-8'))
+
+
+def envolver_hash_legado(hash_sha256):
+    """
+    Aplica el KDF configurado sobre un hash SHA-256 viejo (sin necesitar la contraseña).
+    Es lo que usa la migración sin conexión: el resultado se verifica con la contraseña original.
+    """
+    return _armar_hash(KDF_CONFIG['algoritmo'], hash_sha256.encode('ascii'), envuelto=True)
+
+
+def es_hash_legado(contrasena_hash):
+    return not contrasena_hash.startswith(VERSION_FORMATO + '$')
+
+
+def verificar_contrasena(contrasena, contrasena_hash):
+    """Verifica la contraseña contra un hash en cualquiera de los formatos soportados."""
+    if es_hash_legado(contrasena_hash):
+        # Se comparan bytes: compare_digest no acepta str con caracteres fuera de ASCII
+        return hmac.compare_digest(_sha256_legado(contrasena).encode('ascii'), contrasena_hash.encode('utf-8'))
+    try:
+        _, nombre, parametros, sal, esperado = contrasena_hash.split('$')
+        parametros = _texto_a_parametros(parametros)
+        sal, esperado = bytes.fromhex(sal), bytes.fromhex(esperado)
+        if nombre.startswith(PREFIJO_ENVUELTO):
+            algoritmo, secreto = nombre[len(PREFIJO_ENVUELTO):], _sha256_legado(contrasena).encode('ascii')
+        else:
+            algoritmo, secreto = nombre, contrasena.encode('utf-8')
+        derivado = _derivar(algoritmo, parametros, secreto, sal)
+    except (ValueError, KeyError):
+        # Hash mal formado: algoritmo desconocido, faltan parámetros o no son válidos para el KDF
+        return False
+    return hmac.compare_digest(derivado, esperado)
+
+
+def necesita_actualizacion(contrasena_hash):
+    """
+    True si el hash es del formato viejo, está envuelto o usa otro algoritmo/parámetros
+    que los configurados. Se consulta después de una verificación exitosa.
+    """
+    if es_hash_legado(contrasena_hash):
+        return True
+    partes = contrasena_hash.split('$')
+    if len(partes) != 5:
+        return True
+    algoritmo = KDF_CONFIG['algoritmo']
+    return partes[1] != algoritmo or partes[2] != _parametros_a_texto(KDF_CONFIG[algoritmo])
@@ -0,0 +1,215 @@
+# importacion_masiva.py
+"""
+Importación y exportación masiva de usuarios.
+
+Importar (CSV o JSONL, con columnas nombre_usuario, contrasena, rol y los campos de perfil):
+    python importacion_masiva.py importar usuarios.csv --lote 1000 --procesos 4
+Si se corta, volver a ejecutar el mismo comando retoma desde el último lote guardado.
+
+Exportar (sin los hashes de contraseña salvo que se pida --incluir-hash):
+    python importacion_masiva.py exportar usuarios.jsonl
+"""
+
+import argparse
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from database import CAMPOS_PERFIL, insertar_lote_usuarios_con_perfil, iterar_filas_exportacion, \
+                     registrar_usuario_con_perfil
+from classes.usuario import Usuario
+from hash_contrasenas import hashear_contrasena
+
+ROLES_VALIDOS = ('administrador', 'estandar')
+
+
+# --- Lectura perezosa de archivos ---
+
+def leer_filas(ruta):
+    """Generador que lee un archivo CSV o JSONL fila por fila (sin cargarlo entero en memoria)."""
+    with open(ruta, encoding='utf-8', newline='') as archivo:
+        if ruta.lower().endswith(('.jsonl', '.ndjson')):
+            for linea in archivo:
+                if linea.strip():
+                    yield json.loads(linea)
+        else:
+            yield from csv.DictReader(archivo)
+
+
+def validar_fila(fila):
+    """Valida una fila del archivo. Retorna (True, '') o (False, mensaje)."""
+    nombre_usuario = (fila.get('nombre_usuario') or '').strip()
+    if not nombre_usuario:
+        return False, "Falta el nombre de usuario."
+    if (fila.get('rol') or '').strip().lower() not in ROLES_VALIDOS:
+        return False, "Rol inválido. Debe ser 'administrador' o 'estandar'."
+    return Usuario._validar_contrasena(fila.get('contrasena') or '')
+
+
+def _normalizar_fila(fila):
+    """Arma el diccionario que espera la base (los campos vacíos pasan a None)."""
+    normalizada = {
+        'nombre_usuario': fila['nombre_usuario'].strip(),
+        'rol': fila['rol'].strip().lower(),
+    }
+    for campo in CAMPOS_PERFIL:
+        valor = fila.get(campo)
+        normalizada[campo] = (valor.strip() or None) if isinstance(valor, str) else valor
+    return normalizada
+
+
+def _hashear_contrasena(contrasena):
+    """Mismo hash que usa Usuario.registrar_nuevo_usuario (se ejecuta en los procesos del pool)."""
+    return hashear_contrasena(contrasena)
+
+
+# --- Checkpoints para poder retomar ---
+
+def _leer_checkpoint(ruta_checkpoint, ruta_archivo):
+    if not os.path.exists(ruta_checkpoint):
+        return 0
+    with open(ruta_checkpoint, encoding='utf-8') as f:
+        datos = json.load(f)
+    if datos.get('archivo') != os.path.abspath(ruta_archivo):
+        return 0
+    return datos.get('filas_procesadas', 0)
+
+
+def _guardar_checkpoint(ruta_checkpoint, ruta_archivo, filas_procesadas):
+    # Escribimos a un temporal y lo renombramos, así el checkpoint nunca queda a medio escribir
+    temporal = ruta_checkpoint + '.tmp'
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump({'archivo': os.path.abspath(ruta_archivo), 'filas_procesadas': filas_procesadas}, f)
+    os.replace(temporal, ruta_checkpoint)
+
+
+# --- Importación ---
+
+def importar_usuarios(ruta, tamano_lote=1000, procesos=None, ruta_checkpoint=None):
+    """
+    Importa usuarios desde un archivo CSV/JSONL.
+    Las contraseñas se hashean en un pool de procesos y cada lote se inserta en su propia transacción.
+    Después de cada lote guardado se actualiza el checkpoint, para retomar si el proceso se corta.
+    Retorna un diccionario con el resumen de la importación.
+    """
+    ruta_checkpoint = ruta_checkpoint or ruta + '.checkpoint'
+    ya_procesadas = _leer_checkpoint(ruta_checkpoint, ruta)
+    if ya_procesadas:
+        print(f"Retomando la importación desde la fila {ya_procesadas + 1}.")
+
+    resumen = {'insertados': 0, 'duplicados': 0, 'invalidos': 0, 'fallidos': 0}
+    filas = islice(leer_filas(ruta), ya_procesadas, None)
+    procesadas = ya_procesadas
+    inicio = time.perf_counter()
+
+    pool = None
+    try:
+        while True:
+            lote = list(islice(filas, tamano_lote))
+            if not lote:
+                break
+
+            validas, vistos = [], set()
+            for numero, fila in enumerate(lote, start=procesadas + 1):
+                es_valida, mensaje = validar_fila(fila)
+                if not es_valida:
+                    resumen['invalidos'] += 1
+                    print(f"Fila {numero} rechazada: {mensaje}")
+                    continue
+                normalizada = _normalizar_fila(fila)
+                if normalizada['nombre_usuario'] in vistos: # Repetido dentro del mismo lote
+                    resumen['duplicados'] += 1
+                    continue
+                vistos.add(normalizada['nombre_usuario'])
+                validas.append((normalizada, fila['contrasena']))
+
+            contrasenas = [contrasena for _, contrasena in validas]
+            hashes = []
+            if contrasenas:
+                if pool is None:
+                    # El pool se crea recién con el primer lote que tiene contraseñas para hashear
+                    pool = ProcessPoolExecutor(max_workers=procesos)
+                hashes = pool.map(_hashear_contrasena, contrasenas, chunksize=max(1, len(contrasenas) // 16))
+            filas_db = []
+            for (normalizada, _), contrasena_hash in zip(validas, hashes):
+                normalizada['contrasena_hash'] = contrasena_hash
+                filas_db.append(normalizada)
+
+            resultado = insertar_lote_usuarios_con_perfil(filas_db)
+            if resultado is None:
+                # El lote completo falló (por ejemplo, un email repetido): lo reintentamos fila por fila
+                for f in filas_db:
+                    datos_perfil = [f[campo] for campo in CAMPOS_PERFIL]
+                    if registrar_usuario_con_perfil(f['nombre_usuario'], f['contrasena_hash'], f['rol'], *datos_perfil):
+                        resumen['insertados'] += 1
+                    else:
+                        resumen['fallidos'] += 1
+            else:
+                insertados, duplicados = resultado
+                resumen['insertados'] += insertados
+                resumen['duplicados'] += len(duplicados)
+
+            procesadas += len(lote)
+            _guardar_checkpoint(ruta_checkpoint, ruta, procesadas)
+            transcurrido = time.perf_counter() - inicio
+            print(f"{procesadas} filas procesadas ({(procesadas - ya_procesadas) / transcurrido:.0f} filas/s).")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    # La importación terminó completa (si no hubo ningún lote, el checkpoint nunca se creó)
+    if os.path.exists(ruta_checkpoint):
+        os.remove(ruta_checkpoint)
+    resumen['filas_procesadas'] = procesadas
+    return resumen
+
+
+# --- Exportación ---
+
+def exportar_usuarios(ruta, tamano_lote=1000, incluir_hash=False):
+    """Exporta todos los usuarios con su perfil a CSV o JSONL, leyendo la base en forma de streaming."""
+    cantidad = 0
+    es_jsonl = ruta.lower().endswith(('.jsonl', '.ndjson'))
+    with open(ruta, 'w', encoding='utf-8', newline='') as archivo:
+        escritor = None
+        for fila in iterar_filas_exportacion(tamano_lote, incluir_hash):
+            if es_jsonl:
+                archivo.write(json.dumps(fila, ensure_ascii=False, default=str) + '\n')
+            else:
+                if escritor is None:
+                    escritor = csv.DictWriter(archivo, fieldnames=list(fila.keys()))
+                    escritor.writeheader()
+                escritor.writerow(fila)
+            cantidad += 1
+    return cantidad
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importación y exportación masiva de usuarios.")
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    importar = subparsers.add_parser('importar', help="Importa usuarios desde un CSV o JSONL.")
+    importar.add_argument('archivo')
+    importar.add_argument('--lote', type=int, default=1000, help="Filas por transacción.")
+    importar.add_argument('--procesos', type=int, default=None, help="Procesos para hashear contraseñas.")
+    importar.add_argument('--checkpoint', default=None, help="Archivo de checkpoint (por defecto <archivo>.checkpoint).")
+
+    exportar = subparsers.add_parser('exportar', help="Exporta usuarios a un CSV o JSONL.")
+    exportar.add_argument('archivo')
+    exportar.add_argument('--lote', type=int, default=1000, help="Filas leídas del servidor por vez.")
+    exportar.add_argument('--incluir-hash', action='store_true', help="Incluye el hash de la contraseña.")
+
+    args = parser.parse_args()
+    if args.comando == 'importar':
+        resumen = importar_usuarios(args.archivo, args.lote, args.procesos, args.checkpoint)
+        print(f"Importación terminada: {resumen}")
+    else:
+        cantidad = exportar_usuarios(args.archivo, args.lote, args.incluir_hash)
+        print(f"Se exportaron {cantidad} usuarios a '{args.archivo}'.")
+
+
+if __name__ == "__main__":
+    main()
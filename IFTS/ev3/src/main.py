@@ -1,15 +1,33 @@
 # main.py
 
 import sys
-from database import initialize_db # Importa la función para inicializar la DB
+from database import initialize_db, cerrar_pool # Inicialización de la DB y cierre del pool de conexiones
 
 # Importamos las clases directamente desde el paquete 'clases'
 from classes.usuario import Usuario
 from classes.usuario_estandar import UsuarioEstandar
 from classes.administrador import Administrador
-
-# Variable global para almacenar el usuario actualmente logueado
-usuario_logueado = None
+import sesiones
+
+# Token de la sesión abierta en esta consola (el usuario se resuelve con él en cada acción)
+token_sesion = None
+
+def obtener_usuario_logueado():
+    """Retorna el usuario de la sesión actual, o None si no hay sesión o si venció o fue revocada."""
+    global token_sesion
+    if token_sesion is None:
+        return None
+    usuario = sesiones.obtener_usuario(token_sesion)
+    if usuario is None:
+        print("\nSu sesión venció o fue cerrada. Inicie sesión nuevamente.")
+        token_sesion = None
+    return usuario
+
+def cerrar_sesion_actual():
+    global token_sesion
+    if token_sesion is not None:
+        sesiones.cerrar_sesion(token_sesion)
+        token_sesion = None
 
 def mostrar_menu_principal():
     """Muestra el menú principal de la aplicación."""
@@ -28,7 +46,8 @@ def mostrar_menu_admin():
     print("3. Cambiar rol de usuario")
     print("4. Eliminar usuario")
     print("5. Editar mi perfil") # NUEVA OPCIÓN
-    print("6. Cerrar sesión")
+    print("6. Buscar usuarios")
+    print("7. Cerrar sesión")
     print("-----------------------------")
     return input("Seleccione una opción: ")
 
@@ -71,15 +90,17 @@ def ejecutar_registro_usuario():
 
 def ejecutar_inicio_sesion():
     """Solicita credenciales e intenta iniciar sesión."""
-    global usuario_logueado
+    global token_sesion
     print("\n--- Inicio de Sesión ---")
     nombre = input("Ingrese nombre de usuario: ")
     contrasena = input("Ingrese contraseña: ")
-    usuario_logueado = Usuario.iniciar_sesion(nombre, contrasena)
+    usuario = Usuario.iniciar_sesion(nombre, contrasena)
+    if usuario is not None:
+        token_sesion = sesiones.iniciar_sesion(usuario)
 
 def ejecutar_edicion_perfil():
     """Permite al usuario logueado editar su perfil."""
-    global usuario_logueado
+    usuario_logueado = obtener_usuario_logueado()
     if usuario_logueado is None:
         print("Debe iniciar sesión para editar su perfil.")
         return
@@ -110,7 +131,7 @@ def ejecutar_edicion_perfil():
 
 def ejecutar_accion_admin(opcion):
     """Ejecuta la acción de administrador según la opción seleccionada."""
-    global usuario_logueado
+    usuario_logueado = obtener_usuario_logueado()
     if not isinstance(usuario_logueado, Administrador):
         print("Error: Permisos insuficientes para esta acción.")
         return
@@ -144,14 +165,16 @@ def ejecutar_accion_admin(opcion):
     elif opcion == '5': # NUEVA OPCIÓN
         ejecutar_edicion_perfil()
     elif opcion == '6':
+        usuario_logueado.buscar_usuarios(input("Buscar (nombre de usuario, nombre, apellido o email): "))
+    elif opcion == '7':
         print("Cerrando sesión de administrador...")
-        usuario_logueado = None # Cerrar sesión
+        cerrar_sesion_actual()
     else:
         print("Opción no válida. Intente de nuevo.")
 
 def ejecutar_accion_estandar(opcion):
     """Ejecuta la acción de usuario estándar según la opción seleccionada."""
-    global usuario_logueado
+    usuario_logueado = obtener_usuario_logueado()
     if not isinstance(usuario_logueado, UsuarioEstandar):
         print("Error: Permisos insuficientes para esta acción.")
         return
@@ -171,17 +194,17 @@ def ejecutar_accion_estandar(opcion):
         ejecutar_edicion_perfil()
     elif opcion == '3':
         print("Cerrando sesión de usuario estándar...")
-        usuario_logueado = None # Cerrar sesión
+        cerrar_sesion_actual()
     else:
         print("Opción no válida. Intente de nuevo.")
 
 def main():
     """Función principal que ejecuta el programa."""
-    global usuario_logueado
     print("Iniciando Sistema de Gestión de Usuarios...")
     initialize_db() # Asegura que la DB y el admin por defecto existan
 
     while True:
+        usuario_logueado = obtener_usuario_logueado()
         if usuario_logueado is None:
             opcion = mostrar_menu_principal()
             if opcion == '1':
@@ -190,6 +213,7 @@ def main():
                 ejecutar_inicio_sesion()
             elif opcion == '3':
                 print("Gracias por usar el programa. ¡Adiós!")
+                cerrar_pool()
                 sys.exit()
             else:
                 print("Opción no válida. Por favor, ingrese 1, 2 o 3.")
@@ -202,7 +226,7 @@ def main():
                 ejecutar_accion_estandar(opcion)
             else:
                 print("Error interno: Tipo de usuario desconocido.")
-                usuario_logueado = None
+                cerrar_sesion_actual()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
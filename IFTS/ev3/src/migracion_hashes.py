@@ -0,0 +1,85 @@
+# migracion_hashes.py
+"""
+Migración sin conexión de los hashes SHA-256 viejos al formato con KDF (ver hash_contrasenas.py).
+
+Como no conocemos las contraseñas, cada hash viejo se envuelve: se guarda KDF(sha256(contraseña)).
+El usuario puede seguir iniciando sesión con la misma contraseña, y en ese momento
+su hash se reemplaza por uno directo.
+
+Uso:
+    python migracion_hashes.py --lote 1000 --procesos 4
+    python migracion_hashes.py --algoritmo pbkdf2
+Se puede cortar y volver a ejecutar: solo procesa los hashes que siguen en el formato viejo.
+"""
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import hash_contrasenas
+from database import actualizar_hashes_en_lote, obtener_pagina_hashes_legados
+
+
+def _inicializar_trabajador(kdf_config):
+    # Los procesos del pool usan la misma configuración del KDF que el proceso principal
+    hash_contrasenas.KDF_CONFIG.update(kdf_config)
+
+
+def migrar_hashes(tamano_lote=1000, procesos=None):
+    """
+    Recorre la tabla usuarios por páginas de tamano_lote (paginación por clave), envuelve
+    los hashes viejos en un pool de procesos y guarda cada página en una sola transacción.
+    Retorna un diccionario con el resumen de la migración.
+    """
+    resumen = {'migrados': 0, 'omitidos': 0, 'lotes_fallidos': 0}
+    ultimo_id = 0
+    inicio = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_inicializar_trabajador,
+                             initargs=(hash_contrasenas.KDF_CONFIG,)) as pool:
+        while True:
+            pagina = obtener_pagina_hashes_legados(ultimo_id, tamano_lote)
+            if not pagina:
+                break
+
+            hashes_viejos = [contrasena_hash for _, contrasena_hash in pagina]
+            hashes_nuevos = pool.map(hash_contrasenas.envolver_hash_legado, hashes_viejos,
+                                     chunksize=max(1, len(hashes_viejos) // 16))
+            cambios = [(id_usuario, viejo, nuevo) for (id_usuario, viejo), nuevo in zip(pagina, hashes_nuevos)]
+
+            actualizados = actualizar_hashes_en_lote(cambios)
+            if actualizados is None:
+                resumen['lotes_fallidos'] += 1
+            else:
+                resumen['migrados'] += actualizados
+                # Los que no se actualizaron cambiaron mientras tanto (por ejemplo, el usuario inició sesión)
+                resumen['omitidos'] += len(cambios) - actualizados
+
+            ultimo_id = pagina[-1][0]
+            transcurrido = time.perf_counter() - inicio
+            procesadas = resumen['migrados'] + resumen['omitidos']
+            print(f"{procesadas} hashes procesados hasta el ID {ultimo_id} ({procesadas / transcurrido:.0f} filas/s).")
+            if len(pagina) < tamano_lote:
+                break
+
+    resumen['segundos'] = time.perf_counter() - inicio
+    resumen['filas_por_segundo'] = (resumen['migrados'] + resumen['omitidos']) / resumen['segundos'] if resumen['segundos'] else 0.0
+    return resumen
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migra los hashes SHA-256 viejos al formato con KDF.")
+    parser.add_argument('--lote', type=int, default=1000, help="Filas por página y por transacción.")
+    parser.add_argument('--procesos', type=int, default=None, help="Procesos para calcular los hashes.")
+    parser.add_argument('--algoritmo', choices=('scrypt', 'pbkdf2'), default=None,
+                        help="KDF a usar (por defecto el de hash_contrasenas.KDF_CONFIG).")
+    args = parser.parse_args()
+
+    if args.algoritmo:
+        hash_contrasenas.configurar_kdf(args.algoritmo)
+    resumen = migrar_hashes(args.lote, args.procesos)
+    print(f"Migración terminada: {resumen}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+# pool_conexiones.py
+
+import threading
+import time
+from collections import deque
+
+
+class PoolAgotadoError(Exception):
+    """Se lanza cuando no hay conexiones libres y se agotó el tiempo de espera."""
+
+
+class ConexionDelPool:
+    """
+    Envoltorio de una conexión prestada por el pool.
+    Se comporta como la conexión real, pero close() la devuelve al pool
+    en lugar de cerrar el socket con el servidor.
+    """
+    def __init__(self, pool, conexion):
+        self._pool = pool
+        self._conexion = conexion
+        self._devuelta = False
+
+    def is_connected(self):
+        # La salud de la conexión ya se verificó al prestarla; no hacemos un ping por cada consulta.
+        return not self._devuelta
+
+    def close(self):
+        if not self._devuelta:
+            self._devuelta = True
+            self._pool.devolver(self._conexion)
+
+    def __getattr__(self, nombre):
+        # Todo lo demás (cursor, commit, rollback, ...) va directo a la conexión real
+        return getattr(self._conexion, nombre)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class PoolConexiones:
+    """
+    Pool de conexiones reutilizables.
+
+    - crear_conexion: función sin argumentos que abre una conexión nueva.
+    - tamano_maximo: cantidad máxima de conexiones abiertas a la vez.
+    - tiempo_max_inactiva: segundos que una conexión libre puede quedar sin uso antes de cerrarse.
+    - verificar_tras: segundos de inactividad a partir de los cuales se verifica la conexión al prestarla.
+    - timeout_espera: segundos que se espera una conexión libre antes de lanzar PoolAgotadoError.
+    """
+    def __init__(self, crear_conexion, tamano_maximo=5, tiempo_max_inactiva=300,
+                 verificar_tras=30, timeout_espera=5, verificar_conexion=None):
+        if tamano_maximo < 1:
+            raise ValueError("El tamaño máximo del pool debe ser al menos 1.")
+        self._crear_conexion = crear_conexion
+        self.tamano_maximo = tamano_maximo
+        self.tiempo_max_inactiva = tiempo_max_inactiva
+        self.verificar_tras = verificar_tras
+        self.timeout_espera = timeout_espera
+        self._verificar_conexion = verificar_conexion or (lambda conn: conn.is_connected())
+
+        self._libres = deque()  # (conexion, momento_de_devolucion); la más reciente a la derecha
+        self._en_uso = 0
+        self._condicion = threading.Condition()
+        self._cerrado = False
+        self._metricas = {
+            "creadas": 0,
+            "reutilizadas": 0,
+            "descartadas_por_salud": 0,
+            "expulsadas_inactivas": 0,
+            "esperas": 0,
+            "agotamientos": 0,
+        }
+
+    # --- Préstamo y devolución ---
+
+    def obtener(self):
+        """Presta una conexión del pool (envuelta en ConexionDelPool)."""
+        limite = time.monotonic() + self.timeout_espera
+        with self._condicion:
+            if self._cerrado:
+                raise PoolAgotadoError("El pool de conexiones está cerrado.")
+            self._expulsar_inactivas()
+            esperando = False
+            while True:
+                while self._libres:
+                    conexion, devuelta_en = self._libres.pop()
+                    if time.monotonic() - devuelta_en >= self.verificar_tras and not self._esta_sana(conexion):
+                        self._metricas["descartadas_por_salud"] += 1
+                        self._cerrar_silencioso(conexion)
+                        continue
+                    self._en_uso += 1
+                    self._metricas["reutilizadas"] += 1
+                    return ConexionDelPool(self, conexion)
+
+                if self._en_uso < self.tamano_maximo:
+                    # Reservamos el lugar antes de soltar el lock para abrir la conexión
+                    self._en_uso += 1
+                    break
+
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    self._metricas["agotamientos"] += 1
+                    raise PoolAgotadoError(
+                        f"No hay conexiones libres (máximo {self.tamano_maximo}) tras esperar {self.timeout_espera}s."
+                    )
+                if not esperando:
+                    self._metricas["esperas"] += 1
+                    esperando = True
+                self._condicion.wait(restante)
+
+        # El handshake con el servidor se hace fuera del lock para no bloquear al resto
+        try:
+            conexion = self._crear_conexion()
+        except Exception:
+            with self._condicion:
+                self._en_uso -= 1
+                self._condicion.notify()
+            raise
+        if conexion is None:
+            with self._condicion:
+                self._en_uso -= 1
+                self._condicion.notify()
+            return None
+        with self._condicion:
+            self._metricas["creadas"] += 1
+        return ConexionDelPool(self, conexion)
+
+    def devolver(self, conexion):
+        """Recibe una conexión prestada y la deja disponible para el próximo pedido."""
+        # Si quedó una transacción a medias, la deshacemos para no contaminar al próximo usuario
+        try:
+            if getattr(conexion, "in_transaction", False):
+                conexion.rollback()
+        except Exception:
+            with self._condicion:
+                self._en_uso -= 1
+                self._metricas["descartadas_por_salud"] += 1
+                self._condicion.notify()
+            self._cerrar_silencioso(conexion)
+            return
+
+        with self._condicion:
+            self._en_uso -= 1
+            if self._cerrado:
+                self._cerrar_silencioso(conexion)
+            else:
+                self._libres.append((conexion, time.monotonic()))
+            self._condicion.notify()
+
+    # --- Mantenimiento ---
+
+    def _esta_sana(self, conexion):
+        try:
+            return bool(self._verificar_conexion(conexion))
+        except Exception:
+            return False
+
+    def _expulsar_inactivas(self):
+        """Cierra las conexiones libres que superaron tiempo_max_inactiva (se llama con el lock tomado)."""
+        ahora = time.monotonic()
+        # Las más viejas están a la izquierda
+        while self._libres and ahora - self._libres[0][1] > self.tiempo_max_inactiva:
+            conexion, _ = self._libres.popleft()
+            self._metricas["expulsadas_inactivas"] += 1
+            self._cerrar_silencioso(conexion)
+
+    @staticmethod
+    def _cerrar_silencioso(conexion):
+        try:
+            conexion.close()
+        except Exception:
+            pass
+
+    def cerrar(self):
+        """Cierra todas las conexiones libres; las prestadas se cierran al devolverse."""
+        with self._condicion:
+            self._cerrado = True
+            while self._libres:
+                conexion, _ = self._libres.pop()
+                self._cerrar_silencioso(conexion)
+            self._condicion.notify_all()
+
+    def obtener_metricas(self):
+        """Retorna un diccionario con los contadores del pool."""
+        with self._condicion:
+            metricas = dict(self._metricas)
+            metricas["en_uso"] = self._en_uso
+            metricas["libres"] = len(self._libres)
+            metricas["tamano_maximo"] = self.tamano_maximo
+            return metricas
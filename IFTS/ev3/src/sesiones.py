@@ -0,0 +1,45 @@
+# sesiones.py
+
+from classes.usuario import Usuario # Importa database, que agrega IFTS al path para comun
+from comun.session_cache import CacheSesiones
+
+
+# --- Configuración de las Sesiones ---
+SESIONES_CONFIG = {
+    'ttl': 1800,                 # Segundos de inactividad tras los cuales vence la sesión
+    'duracion_maxima': 8 * 3600, # Segundos que puede durar una sesión aunque se siga usando
+    'max_sesiones': 100000       # Sesiones abiertas como máximo (se desaloja la usada hace más tiempo)
+}
+
+_sesiones = CacheSesiones(**SESIONES_CONFIG)
+
+
+def iniciar_sesion(usuario):
+    """Abre una sesión para el usuario (Administrador o UsuarioEstandar) y retorna su token."""
+    return _sesiones.crear(usuario.id_usuario)
+
+def obtener_usuario(token):
+    """
+    Retorna el usuario de la sesión, o None si el token no existe, venció o fue revocado.
+    La sesión guarda solo el id: el usuario se vuelve a leer (de la cache de la base) en cada
+    acceso, así un cambio de rol o una baja hechos por cualquier camino se ven enseguida.
+    """
+    sesion = _sesiones.obtener(token) if token is not None else None
+    if sesion is None:
+        return None
+    usuario = Usuario.obtener_por_id(sesion[0])
+    if usuario is None:
+        _sesiones.revocar(token) # El usuario ya no existe
+    return usuario
+
+def cerrar_sesion(token):
+    """Cierra la sesión. Retorna True si estaba abierta."""
+    return _sesiones.revocar(token) is not None
+
+def revocar_sesiones_de_usuario(id_usuario):
+    """Cierra todas las sesiones de un usuario (al cambiarle el rol o eliminarlo). Retorna cuántas se cerraron."""
+    return _sesiones.revocar_usuario(id_usuario)
+
+def obtener_estadisticas():
+    """Retorna los contadores de sesiones: creadas, activas, vencidas, desalojadas, revocadas, aciertos y fallos."""
+    return _sesiones.obtener_estadisticas()
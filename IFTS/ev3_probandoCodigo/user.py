@@ -1,6 +1,6 @@
 # Importar las funciones de hashing de contraseñas desde utils
 # Asegúrate de que utils.py contenga generar_contrasena_hash y verificar_contrasena_hash (con bcrypt)
-from validations import generar_contrasena_hash, verificar_contrasena_hash
+from validations import generar_contrasena_hash, verificar_contrasena_hash, necesita_rehash
 # Importar las clases de usuario y perfil
 from user_info import Perfil # Importar la clase Perfil
 
@@ -30,8 +30,15 @@ class Usuario:
         return self._rol
 
     def verificar_contrasena(self, contrasena: str) -> bool:
-        """Verifica si la contraseña proporcionada coincide con el hash almacenado."""
-        return verificar_contrasena_hash(contrasena, self._contrasena_hash)
+        """
+        Verifica si la contraseña proporcionada coincide con el hash almacenado.
+        Si coincide y el hash quedó con otro factor de trabajo, lo regenera con el actual.
+        """
+        if not verificar_contrasena_hash(contrasena, self._contrasena_hash):
+            return False
+        if necesita_rehash(self._contrasena_hash):
+            self._contrasena_hash = generar_contrasena_hash(contrasena)
+        return True
 
     def set_perfil(self, perfil_obj: Perfil):
         """Asigna un objeto Perfil a este usuario."""
@@ -1,5 +1,12 @@
 import os
-import bcrypt # Importamos la librería bcrypt
+import sys
+
+# Único módulo de la aplicación que usa el paquete comun: la carpeta IFTS se agrega al path acá
+_CARPETA_IFTS = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+if _CARPETA_IFTS not in sys.path:
+    sys.path.append(_CARPETA_IFTS)
+
+from comun.hashing_service import obtener_servicio_por_defecto
 
 def limpiar_pantalla():
     """Limpia la consola para una mejor experiencia de usuario."""
@@ -38,20 +45,20 @@ def validar_dni(dni):
 def generar_contrasena_hash(contrasena: str) -> bytes:
     """
     Genera un hash seguro de la contraseña utilizando bcrypt.
-    La contraseña debe ser codificada a bytes antes de hashear.
-    El hash resultante también es en bytes.
+    El hash se calcula en el pool de trabajadores del servicio de hashing, con el
+    factor de trabajo calibrado para esta máquina. El hash resultante es en bytes.
+    """
+    return obtener_servicio_por_defecto().hashear(contrasena)
+
+def necesita_rehash(hashed_contra: bytes) -> bool:
+    """
+    Indica si el hash se generó con un factor de trabajo menor que el actual.
+    Un hash bcrypt tiene la forma '$2b$12$...', donde 12 es el factor de trabajo.
     """
-    # bcrypt necesita una 'salt' (sal- cadena de caracteres) generada aleatoriamente.
-    # gen_salt() genera una sal segura. El factor de trabajo (rounds) define
-    # la dificultad (más alto = más lento = más seguro). 12 es un buen valor por defecto.
-    hashed_contra = bcrypt.hashpw(contrasena.encode('utf-8'), bcrypt.gensalt(rounds=12))
-    return hashed_contra
+    return obtener_servicio_por_defecto().necesita_rehash(hashed_contra)
 
 def verificar_contrasena_hash(contrasena: str, hashed_contra: bytes) -> bool:
     """
     Verifica si una contraseña en texto plano coincide con un hash bcrypt dado.
     """
-    # bcrypt.checkpw toma la contraseña en texto plano (codificada) y el hash almacenado
-    # y compara si coinciden.
-    return bcrypt.checkpw(contrasena.encode('utf-8'), hashed_contra)
-
+    return obtener_servicio_por_defecto().verificar(contrasena, hashed_contra)
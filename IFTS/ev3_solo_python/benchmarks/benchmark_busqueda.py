@@ -0,0 +1,100 @@
+# benchmark_busqueda.py
+"""
+Latencia de IndiceBusqueda con muchos perfiles:
+
+- tiempo de construcción del índice (agregar de a un usuario, como al cargar de disco)
+- búsquedas por prefijo (nombre de usuario, apellido, email, DNI)
+- búsquedas aproximadas (palabras con un error de tipeo)
+- actualizaciones de perfil (reindexado incremental)
+
+Reporta mediana y percentil 99 de cada tipo de operación.
+
+Uso (desde IFTS/ev3_solo_python):
+    python benchmarks/benchmark_busqueda.py --perfiles 1000000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))  # IFTS, para el paquete comun
+
+from comun.search_index import IndiceBusqueda
+
+NOMBRES = ["Ana", "Juan", "María", "Pedro", "Lucía", "Diego", "Sofía", "Martín", "Valentina", "Joaquín",
+           "Camila", "Mateo", "Julieta", "Tomás", "Florencia", "Nicolás", "Agustina", "Facundo", "Carla", "Bruno"]
+APELLIDOS = ["García", "Pérez", "González", "Rodríguez", "López", "Fernández", "Martínez", "Gómez", "Díaz",
+             "Sánchez", "Romero", "Sosa", "Álvarez", "Torres", "Ruiz", "Ramírez", "Flores", "Benítez", "Acosta", "Medina"]
+
+
+def generar_valores(i, azar):
+    nombre = azar.choice(NOMBRES)
+    apellido = azar.choice(APELLIDOS)
+    usuario = f"{nombre[0]}{apellido}{i}".lower()
+    return {'nombre_usuario': usuario, 'nombre': nombre, 'apellido': apellido,
+            'email': f"{usuario}@ejemplo.com", 'dni': str(20000000 + i)}
+
+
+def con_error_de_tipeo(palabra, azar):
+    posicion = azar.randrange(len(palabra))
+    return palabra[:posicion] + azar.choice("aeiourstln") + palabra[posicion + 1:]
+
+
+def medir(nombre, consultas, operacion):
+    tiempos = []
+    resultados = 0
+    for consulta in consultas:
+        inicio = time.perf_counter()
+        resultados += len(operacion(consulta))
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    tiempos.sort()
+    p99 = tiempos[min(len(tiempos) - 1, int(len(tiempos) * 0.99))]
+    print(f"{nombre:>24}: mediana {statistics.median(tiempos):7.3f} ms | p99 {p99:7.3f} ms | "
+          f"{resultados / len(consultas):.1f} resultados/consulta")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latencia de búsqueda por prefijo y aproximada.")
+    parser.add_argument("--perfiles", type=int, default=1000000)
+    parser.add_argument("--consultas", type=int, default=2000)
+    parser.add_argument("--limite", type=int, default=20)
+    parser.add_argument("--semilla", type=int, default=1234)
+    args = parser.parse_args()
+
+    azar = random.Random(args.semilla)
+    valores = [generar_valores(i, azar) for i in range(args.perfiles)]
+
+    indice = IndiceBusqueda()
+    inicio = time.perf_counter()
+    for id_usuario, valores_usuario in enumerate(valores, start=1):
+        indice.agregar(id_usuario, valores_usuario)
+    indice.buscar_prefijo("a") # La primera consulta ordena los índices
+    print(f"Índice de {args.perfiles} perfiles construido en {time.perf_counter() - inicio:.1f} s")
+
+    muestra = [azar.choice(valores) for _ in range(args.consultas)]
+    limite = args.limite
+    medir("prefijo usuario", [v['nombre_usuario'][:6] for v in muestra], lambda t: indice.buscar_prefijo(t, limite))
+    medir("prefijo apellido", [v['apellido'][:3] for v in muestra], lambda t: indice.buscar_prefijo(t, limite))
+    medir("prefijo email", [v['email'][:8] for v in muestra], lambda t: indice.buscar_prefijo(t, limite))
+    medir("prefijo DNI", [v['dni'][:6] for v in muestra], lambda t: indice.buscar_prefijo(t, limite))
+    medir("aproximada apellido", [con_error_de_tipeo(v['apellido'], azar) for v in muestra],
+          lambda t: indice.buscar_aproximado(t, limite))
+    medir("aproximada usuario", [con_error_de_tipeo(v['nombre_usuario'], azar) for v in muestra],
+          lambda t: indice.buscar_aproximado(t, limite))
+    medir("búsqueda combinada", [con_error_de_tipeo(v['nombre_usuario'], azar) for v in muestra],
+          lambda t: indice.buscar(t, limite))
+
+    def actualizar(id_usuario):
+        anteriores = valores[id_usuario - 1]
+        nuevos = dict(anteriores, apellido=azar.choice(APELLIDOS), email=f"nuevo{id_usuario}@ejemplo.com")
+        indice.actualizar(id_usuario, anteriores, nuevos)
+        valores[id_usuario - 1] = nuevos
+        return ()
+    medir("actualizar perfil", [azar.randrange(1, args.perfiles + 1) for _ in range(args.consultas)], actualizar)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# benchmark_hashing.py
+"""
+Throughput de bcrypt: hashing en el hilo que llama (como antes) contra
+ServicioHashing con distinta cantidad de trabajadores, en modo hilos y procesos.
+
+Uso (desde IFTS/ev3_solo_python):
+    python benchmarks/benchmark_hashing.py --rondas 10 --hashes 64
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))  # IFTS, para el paquete comun
+
+import bcrypt
+from comun.hashing_service import ServicioHashing
+
+
+def medir_serial(cantidad, rondas):
+    inicio = time.perf_counter()
+    for i in range(cantidad):
+        bcrypt.hashpw(f"clave{i}".encode("utf-8"), bcrypt.gensalt(rounds=rondas))
+    return cantidad / (time.perf_counter() - inicio)
+
+
+def medir_servicio(cantidad, rondas, trabajadores, modo):
+    servicio = ServicioHashing(trabajadores=trabajadores, modo=modo, rondas=rondas, max_pendientes=cantidad)
+    servicio.hashear("calentamiento")
+    inicio = time.perf_counter()
+    futuros = [servicio.hashear_async(f"clave{i}") for i in range(cantidad)]
+    for futuro in futuros:
+        futuro.result()
+    throughput = cantidad / (time.perf_counter() - inicio)
+    metricas = servicio.obtener_metricas()
+    servicio.cerrar()
+    return throughput, metricas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput de hashing bcrypt por cantidad de trabajadores.")
+    parser.add_argument("--rondas", type=int, default=10)
+    parser.add_argument("--hashes", type=int, default=64)
+    args = parser.parse_args()
+
+    nucleos = os.cpu_count() or 1
+    niveles = sorted({1, 2, 4, nucleos})
+    base = medir_serial(args.hashes, args.rondas)
+    print(f"bcrypt rounds={args.rondas} | hashes: {args.hashes} | núcleos: {nucleos}")
+    print(f"{'serial (hilo que llama)':>28}: {base:>8.1f} hashes/s")
+    for modo in ("hilos", "procesos"):
+        for trabajadores in niveles:
+            throughput, metricas = medir_servicio(args.hashes, args.rondas, trabajadores, modo)
+            print(f"{f'{modo}, {trabajadores} trabajadores':>28}: {throughput:>8.1f} hashes/s "
+                  f"({throughput / base:.1f}x, p99 {metricas['hashear_p99_ms']:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
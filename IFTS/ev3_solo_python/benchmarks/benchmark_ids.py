@@ -0,0 +1,97 @@
+# benchmark_ids.py
+"""
+Velocidad y unicidad de los asignadores de ids:
+
+- AsignadorIds con marca persistida, pidiendo ids de a uno desde 1 y desde varios hilos
+- AsignadorIds.reservar en bloques (importación masiva)
+- GeneradorSnowflake desde varios hilos y desde varios procesos (un nodo por proceso)
+
+En cada caso verifica que no haya ids repetidos.
+
+Uso (desde IFTS/ev3_solo_python):
+    python benchmarks/benchmark_ids.py --ids 1000000 --hilos 8 --procesos 4
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from services.id_allocator import AsignadorIds, GeneradorSnowflake
+
+
+def pedir(asignador, cantidad):
+    return [asignador.siguiente() for _ in range(cantidad)]
+
+
+def pedir_snowflake_en_proceso(id_nodo, cantidad):
+    return pedir(GeneradorSnowflake(id_nodo), cantidad)
+
+
+def informar(nombre, ids, transcurrido):
+    repetidos = len(ids) - len(set(ids))
+    print(f"{nombre:>40}: {len(ids) / transcurrido:>12,.0f} ids/s | repetidos: {repetidos}")
+    if repetidos:
+        sys.exit(1)
+
+
+def en_hilos(asignador, total, hilos):
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=hilos) as pool:
+        partes = list(pool.map(lambda _: pedir(asignador, total // hilos), range(hilos)))
+    transcurrido = time.perf_counter() - inicio
+    if any(parte != sorted(parte) for parte in partes):
+        print("Un hilo recibió ids fuera de orden")
+        sys.exit(1)
+    return [i for parte in partes for i in parte], transcurrido
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Velocidad y unicidad de los asignadores de ids.")
+    parser.add_argument("--ids", type=int, default=1000000)
+    parser.add_argument("--hilos", type=int, default=8)
+    parser.add_argument("--procesos", type=int, default=4)
+    parser.add_argument("--bloque", type=int, default=10000, help="Tamaño de cada reserva en la importación masiva")
+    args = parser.parse_args()
+
+    directorio = tempfile.mkdtemp(prefix="ids_")
+    ruta = os.path.join(directorio, "ids.json")
+
+    asignador = AsignadorIds(ruta)
+    inicio = time.perf_counter()
+    ids = pedir(asignador, args.ids)
+    informar("AsignadorIds, 1 hilo", ids, time.perf_counter() - inicio)
+    if ids != list(range(1, args.ids + 1)):
+        print("Con un solo hilo los ids deberían ser consecutivos")
+        sys.exit(1)
+
+    ids_hilos, transcurrido = en_hilos(asignador, args.ids, args.hilos)
+    informar(f"AsignadorIds, {args.hilos} hilos", ids + ids_hilos, transcurrido)
+
+    inicio = time.perf_counter()
+    rangos = [asignador.reservar(args.bloque) for _ in range(args.ids // args.bloque)]
+    transcurrido = time.perf_counter() - inicio
+    informar(f"AsignadorIds.reservar({args.bloque})", ids + ids_hilos + [i for r in rangos for i in r], transcurrido)
+
+    reiniciado = AsignadorIds(ruta)
+    primero = reiniciado.siguiente()
+    print(f"{'tras reiniciar':>40}: primer id {primero} (el mayor entregado fue {rangos[-1][-1]})")
+    if primero <= rangos[-1][-1]:
+        sys.exit(1)
+
+    ids_snowflake, transcurrido = en_hilos(GeneradorSnowflake(1), args.ids, args.hilos)
+    informar(f"GeneradorSnowflake, {args.hilos} hilos", ids_snowflake, transcurrido)
+
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.procesos) as pool:
+        partes = list(pool.map(pedir_snowflake_en_proceso, range(args.procesos), [args.ids // args.procesos] * args.procesos))
+    transcurrido = time.perf_counter() - inicio
+    informar(f"GeneradorSnowflake, {args.procesos} procesos", [i for parte in partes for i in parte], transcurrido)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# benchmark_memoria.py
+"""
+Bytes por usuario residente en memoria (objetos + índices), medidos con tracemalloc:
+
+- objetos con __dict__ (como eran Usuario y Perfil antes de __slots__) en un UserStore
+- objetos con __slots__ (Usuario y Perfil actuales) en un UserStore
+- ColumnarUserStore (columnas en arrays y textos repetidos internados)
+
+Los usuarios se arman desde JSON, igual que al cargarlos de disco (GestorPersistencia),
+así cada string repetido llega como un objeto distinto.
+
+Uso (desde IFTS/ev3_solo_python):
+    python benchmarks/benchmark_memoria.py --usuarios 100000
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from models.users import Perfil, Usuario
+from services.columnar_store import ColumnarUserStore
+from services.user_store import UserStore
+
+NOMBRES = ["Ana", "Juan", "María", "Pedro", "Lucía", "Diego", "Sofía", "Martín"]
+APELLIDOS = ["García", "Pérez", "González", "Rodríguez", "López", "Fernández"]
+
+
+# Réplicas sin __slots__, con los mismos __init__ que las clases del modelo
+class PerfilConDict:
+    __init__ = Perfil.__init__
+
+
+class UsuarioConDict:
+    __init__ = Usuario.__init__
+    rol = Usuario.rol
+
+
+def lineas_json(cantidad):
+    for i in range(cantidad):
+        yield json.dumps({
+            "id_usuario": i + 1, "nombre_usuario": f"usuario{i}", "rol": "admin" if i % 100 == 0 else "estandar",
+            "contrasena_hasheada": "$2b$12$" + "x" * 53,
+            "perfil": {"id_perfil": i + 1, "dni": str(10000000 + i), "nombre": NOMBRES[i % len(NOMBRES)],
+                       "apellido": APELLIDOS[i % len(APELLIDOS)], "email": f"usuario{i}@ejemplo.com",
+                       "telefono": str(1100000000 + i), "direccion": f"Calle {i % 500} {i % 9000}",
+                       "fecha_nacimiento": f"19{70 + i % 30}-{1 + i % 12:02d}-{1 + i % 28:02d}"},
+        })
+
+
+def construir(datos, clase_usuario, clase_perfil):
+    perfil = clase_perfil(**datos["perfil"])
+    return clase_usuario(id_usuario=datos["id_usuario"], nombre_usuario=datos["nombre_usuario"],
+                         contrasena_hasheada=datos["contrasena_hasheada"].encode("utf-8"),
+                         rol=datos["rol"], perfil_objeto=perfil)
+
+
+def medir(cantidad, crear_store, clase_usuario, clase_perfil):
+    gc.collect()
+    tracemalloc.start()
+    store = crear_store()
+    for linea in lineas_json(cantidad):
+        store.agregar(construir(json.loads(linea), clase_usuario, clase_perfil))
+    gc.collect()
+    ocupado, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    if len(store) != cantidad:
+        raise RuntimeError("El store no quedó con todos los usuarios.")
+    return ocupado / cantidad
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memoria por usuario: __dict__ vs __slots__ vs columnar.")
+    parser.add_argument("--usuarios", type=int, default=100000)
+    args = parser.parse_args()
+
+    variantes = [
+        ("objetos con __dict__ + UserStore", UserStore, UsuarioConDict, PerfilConDict),
+        ("objetos con __slots__ + UserStore", UserStore, Usuario, Perfil),
+        ("ColumnarUserStore", ColumnarUserStore, Usuario, Perfil),
+    ]
+    print(f"Usuarios: {args.usuarios}")
+    base = None
+    for nombre, crear_store, clase_usuario, clase_perfil in variantes:
+        bytes_por_usuario = medir(args.usuarios, crear_store, clase_usuario, clase_perfil)
+        base = base or bytes_por_usuario
+        print(f"{nombre:>36}: {bytes_por_usuario:>7.0f} bytes/usuario ({bytes_por_usuario / base:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# benchmark_persistence.py
+"""
+Persistencia de usuarios: tiempo de foto (snapshot), tiempo de recuperación
+(foto + reaplicar el registro) y throughput de escritura de mutaciones según
+cada cuántas entradas se hace fsync.
+
+Uso (desde IFTS/ev3_solo_python):
+    python benchmarks/benchmark_persistence.py --usuarios 1000000 --mutaciones 20000
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmark_user_store import crear_usuarios
+from services.persistence import GestorPersistencia
+from services.user_store import UserStore
+
+
+def medir_escritura(directorio, store, mutaciones, fsync_cada):
+    persistencia = GestorPersistencia(directorio, snapshot_cada=10**12, fsync_cada=fsync_cada, intervalo_fsync=10**9)
+    usuarios = list(store)
+    inicio = time.perf_counter()
+    for i in range(mutaciones):
+        usuario = usuarios[i % len(usuarios)]
+        persistencia.registrar("actualizar_perfil", store, nombre_usuario=usuario.nombre_usuario,
+                               datos={"telefono": str(1100000000 + i)})
+    persistencia.cerrar()
+    return mutaciones / (time.perf_counter() - inicio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snapshot, recuperación y escritura del registro de mutaciones.")
+    parser.add_argument("--usuarios", type=int, default=1_000_000)
+    parser.add_argument("--mutaciones", type=int, default=20_000)
+    args = parser.parse_args()
+
+    directorio = tempfile.mkdtemp()
+    try:
+        store = UserStore(crear_usuarios(args.usuarios))
+        print(f"Usuarios: {args.usuarios} | mutaciones: {args.mutaciones}")
+
+        for fsync_cada in (1, 100, 1000):
+            os.makedirs(os.path.join(directorio, f"log_{fsync_cada}"))
+            throughput = medir_escritura(os.path.join(directorio, f"log_{fsync_cada}"), store, args.mutaciones, fsync_cada)
+            print(f"Escritura con fsync cada {fsync_cada:>4} entradas: {throughput:>10.0f} mutaciones/s")
+
+        persistencia = GestorPersistencia(os.path.join(directorio, "log_1000"))
+        inicio = time.perf_counter()
+        persistencia.crear_snapshot(store)
+        print(f"Snapshot de {len(store)} usuarios: {time.perf_counter() - inicio:.2f} s "
+              f"({os.path.getsize(os.path.join(directorio, 'log_1000', GestorPersistencia.ARCHIVO_SNAPSHOT)) / len(store):.0f} bytes/usuario)")
+        persistencia.cerrar()
+
+        # Recuperación: foto completa + un registro con todas las mutaciones posteriores
+        medir_escritura(os.path.join(directorio, "log_1000"), store, args.mutaciones, 1000)
+        recuperado = UserStore()
+        persistencia = GestorPersistencia(os.path.join(directorio, "log_1000"))
+        inicio = time.perf_counter()
+        reaplicadas = persistencia.cargar(recuperado)
+        print(f"Recuperación ({len(recuperado)} usuarios + {reaplicadas} mutaciones): {time.perf_counter() - inicio:.2f} s")
+        persistencia.cerrar()
+    finally:
+        shutil.rmtree(directorio)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# benchmark_user_store.py
+"""
+Curva de escalado de las búsquedas de usuarios: lista con recorrido lineal
+(implementación anterior de GestorAutenticacion) contra UserStore con índices hash.
+
+Uso (desde IFTS/ev3_solo_python):
+    python benchmarks/benchmark_user_store.py --tamanos 1000 10000 100000 1000000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from models.users import Perfil, UsuarioEstandar
+from services.user_store import UserStore
+
+
+def crear_usuarios(cantidad):
+    # El hash no importa para medir búsquedas; evitamos pagar bcrypt por cada usuario
+    return [UsuarioEstandar(id_usuario=i, nombre_usuario=f"usuario{i}", contrasena_hasheada=b"hash",
+                            perfil_objeto=Perfil(id_perfil=i, dni=str(10000000 + i)))
+            for i in range(cantidad)]
+
+
+def buscar_lineal(usuarios, nombre_usuario):
+    nombre_normalizado = nombre_usuario.lower()
+    for usuario in usuarios:
+        if usuario.nombre_usuario == nombre_normalizado:
+            return usuario
+    return None
+
+
+def medir(funcion, nombres):
+    inicio = time.perf_counter()
+    for nombre in nombres:
+        if funcion(nombre) is None:
+            raise RuntimeError(f"No se encontró '{nombre}'.")
+    return (time.perf_counter() - inicio) / len(nombres) * 1e6  # microsegundos por búsqueda
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Búsqueda por nombre: lista lineal vs UserStore.")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    parser.add_argument("--busquedas", type=int, default=10000)
+    args = parser.parse_args()
+
+    random.seed(1234)
+    print(f"{'usuarios':>10} | {'lista (µs/búsqueda)':>20} | {'UserStore (µs/búsqueda)':>24} | {'aceleración':>11}")
+    for tamano in args.tamanos:
+        usuarios = crear_usuarios(tamano)
+        store = UserStore(usuarios)
+        nombres = [f"Usuario{random.randrange(tamano)}" for _ in range(args.busquedas)]
+        # El recorrido lineal es O(n): con muchos usuarios alcanza con pocas búsquedas para estimarlo
+        busquedas_lineales = max(5, min(args.busquedas, 2_000_000 // tamano))
+        t_lista = medir(lambda n: buscar_lineal(usuarios, n), nombres[:busquedas_lineales])
+        t_store = medir(store.obtener_por_nombre, nombres)
+        print(f"{tamano:>10} | {t_lista:>20.2f} | {t_store:>24.3f} | {t_lista / t_store:>10.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# stress_concurrencia.py
+"""
+Prueba de estrés de GestorAutenticacion / GestorUsuarios con muchos hilos a la vez:
+inicios de sesión, altas, cambios de contraseña, de perfil y de rol, bajas y listados paginados.
+
+Al terminar verifica que:
+- los índices del almacén (UserStore o ColumnarUserStore) coincidan entre sí (nombre, id, DNI, rol, nombres ordenados),
+- cada listado paginado haya salido ordenado y sin repetidos aunque cambiara entre páginas,
+- no haya DNIs repetidos y quede al menos un administrador,
+- las sesiones de usuarios eliminados ya no resuelvan a nadie,
+- al recargar desde disco (snapshot + registro) se obtenga exactamente el mismo estado.
+
+Uso (desde IFTS/ev3_solo_python):
+    python benchmarks/stress_concurrencia.py --hilos 32 --operaciones 5000
+    python benchmarks/stress_concurrencia.py --almacen columnas
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from services.auth_manager import GestorAutenticacion
+from services.columnar_store import ColumnarUserStore
+from comun.hashing_service import ServicioHashing
+from services.persistence import GestorPersistencia
+from services.user_manager import GestorUsuarios
+from services.user_store import UserStore
+
+CONTRASENA = "clave123"
+ALMACENES = {"objetos": UserStore, "columnas": ColumnarUserStore}
+
+
+def verificar_consistencia(gestor):
+    """Retorna la lista de problemas encontrados en los índices del almacén (vacía si está todo bien)."""
+    store = gestor.usuarios
+    problemas = []
+    with gestor.bloqueo_escritura:
+        usuarios = list(store)
+        por_nombre = store._por_nombre if isinstance(store, UserStore) else store._id_por_nombre
+        if len(por_nombre) != len(usuarios) or len(store) != len(usuarios):
+            problemas.append(f"índice por nombre con {len(por_nombre)} entradas para {len(usuarios)} usuarios")
+        nombres = [store.normalizar_nombre(u.nombre_usuario) for u in store.pagina(tamano=len(usuarios) + 1)]
+        if nombres != sorted(store.normalizar_nombre(u.nombre_usuario) for u in usuarios):
+            problemas.append("el índice de nombres ordenados no coincide con los usuarios")
+        for usuario in usuarios:
+            # != y no `is not`: ColumnarUserStore retorna una vista nueva en cada búsqueda
+            if store.obtener_por_nombre(usuario.nombre_usuario) != usuario:
+                problemas.append(f"'{usuario.nombre_usuario}' no se encuentra por nombre")
+            if usuario.perfil.dni and store.obtener_por_dni(usuario.perfil.dni) != usuario:
+                problemas.append(f"el DNI de '{usuario.nombre_usuario}' no apunta a él")
+        dnis = Counter(u.perfil.dni for u in usuarios if u.perfil.dni)
+        problemas += [f"DNI repetido: {dni}" for dni, veces in dnis.items() if veces > 1]
+        roles = Counter(u.rol for u in usuarios)
+        for rol in ("admin", "estandar"):
+            if store.contar_con_rol(rol) != roles[rol]:
+                problemas.append(f"contar_con_rol('{rol}') = {store.contar_con_rol(rol)}, real = {roles[rol]}")
+        if roles["admin"] == 0:
+            problemas.append("no quedó ningún administrador")
+    return problemas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estrés concurrente de los gestores de usuarios.")
+    parser.add_argument("--hilos", type=int, default=32)
+    parser.add_argument("--operaciones", type=int, default=5000)
+    parser.add_argument("--usuarios", type=int, default=200)
+    parser.add_argument("--semilla", type=int, default=1234)
+    parser.add_argument("--almacen", choices=ALMACENES, default="objetos")
+    args = parser.parse_args()
+
+    directorio = tempfile.mkdtemp(prefix="stress_usuarios_")
+    # rondas=4 (el mínimo de bcrypt): la prueba es sobre concurrencia, no sobre el costo del hash
+    servicio = ServicioHashing(rondas=4, max_pendientes=args.hilos * 4, timeout_encolado=30)
+    gestor = GestorAutenticacion(GestorPersistencia(directorio, snapshot_cada=500), servicio,
+                                 store=ALMACENES[args.almacen]())
+    usuarios = GestorUsuarios(gestor)
+    _, token_admin = gestor.crear_sesion("admin", "admin123")
+
+    for i in range(args.usuarios):
+        usuarios.crear_usuario(f"usuario{i}", CONTRASENA, {"dni": str(20000000 + i)}, "estandar", token_admin)
+
+    contadores = Counter()
+    bloqueo_contadores = threading.Lock()
+    sesiones_de_eliminados = []
+    listados_desordenados = []
+    siguiente_dni = iter(range(30000000, 40000000))
+
+    def operacion(numero):
+        azar = random.Random(args.semilla + numero)
+        nombre = f"usuario{azar.randrange(args.usuarios * 2)}"
+        tipo = azar.choice(["login", "login", "login", "perfil", "contrasena", "rol", "alta", "baja", "listado"])
+        if tipo == "login":
+            exito, _ = gestor.crear_sesion(nombre, CONTRASENA)
+        elif tipo == "perfil":
+            # DNIs tomados de un rango chico para provocar choques entre hilos
+            exito, _ = usuarios.actualizar_perfil_usuario(nombre, {"dni": str(50000000 + azar.randrange(50)),
+                                                                   "telefono": str(numero)}, token_admin)
+        elif tipo == "contrasena":
+            exito, _ = usuarios.actualizar_contrasena_usuario(nombre, CONTRASENA, token_admin)
+        elif tipo == "rol":
+            exito, _ = usuarios.actualizar_rol_usuario(nombre, azar.choice(["admin", "estandar"]), token_admin)
+        elif tipo == "alta":
+            exito, _ = usuarios.crear_usuario(nombre, CONTRASENA, {"dni": str(next(siguiente_dni))}, "estandar", token_admin)
+        elif tipo == "listado":
+            exito, filas = usuarios.leer_usuarios(campos=("nombre_usuario",), rol=azar.choice([None, "admin"]),
+                                                  prefijo=azar.choice(["", "usuario1"]), tamano_pagina=16, token=token_admin)
+            nombres = [fila["nombre_usuario"] for fila in filas]
+            if any(anterior >= siguiente for anterior, siguiente in zip(nombres, nombres[1:])):
+                with bloqueo_contadores:
+                    listados_desordenados.append(numero)
+        else:
+            ok_sesion, token = gestor.crear_sesion(nombre, CONTRASENA)
+            exito, _ = usuarios.eliminar_usuario(nombre, token_admin)
+            if exito and ok_sesion:
+                sesiones_de_eliminados.append((nombre, token))
+        with bloqueo_contadores:
+            contadores[(tipo, exito)] += 1
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.hilos) as pool:
+        for futuro in [pool.submit(operacion, n) for n in range(args.operaciones)]:
+            futuro.result() # Propaga cualquier excepción de los hilos
+    transcurrido = time.perf_counter() - inicio
+
+    print(f"{args.operaciones} operaciones en {args.hilos} hilos: {transcurrido:.2f} s "
+          f"({args.operaciones / transcurrido:.0f} ops/s)")
+    for (tipo, exito), cantidad in sorted(contadores.items()):
+        print(f"  {tipo:>10} {'ok' if exito else 'rechazada':>9}: {cantidad}")
+
+    problemas = verificar_consistencia(gestor)
+    problemas += [f"el listado de la operación {numero} salió desordenado o con repetidos" for numero in listados_desordenados]
+    for nombre, token in sesiones_de_eliminados:
+        usuario = gestor.obtener_usuario_logueado(token)
+        if usuario is not None and usuario.nombre_usuario == nombre:
+            problemas.append(f"la sesión de '{nombre}' sigue activa después de eliminarlo")
+
+    estado = sorted((u.a_diccionario() for u in gestor.usuarios), key=lambda d: d["id_usuario"])
+    gestor.cerrar()
+    recargado = GestorAutenticacion(GestorPersistencia(directorio), servicio, store=ALMACENES[args.almacen]())
+    estado_recargado = sorted((u.a_diccionario() for u in recargado.usuarios), key=lambda d: d["id_usuario"])
+    if estado != estado_recargado:
+        problemas.append("el estado recargado desde disco no coincide con el de memoria")
+    recargado.cerrar()
+    servicio.cerrar()
+
+    if problemas:
+        print("INCONSISTENCIAS:")
+        for problema in problemas:
+            print(f"  - {problema}")
+        sys.exit(1)
+    print(f"Estado consistente: {len(estado)} usuarios, recarga desde disco idéntica.")
+
+
+if __name__ == "__main__":
+    main()
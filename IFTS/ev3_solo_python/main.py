@@ -1,35 +1,41 @@
 import os # Importar os para limpiar la pantalla
 from services.auth_manager import GestorAutenticacion
 from services.user_manager import GestorUsuarios
+from services.persistence import GestorPersistencia
 from utils.validations import validar_contrasena, validar_dni # Importante importar esto
 
 def limpiar_pantalla():
     os.system('cls' if os.name == 'nt' else 'clear')
 
 def main():
-    gestor_autenticacion = GestorAutenticacion()
+    # Los usuarios se guardan en la carpeta 'datos' y se recuperan al volver a iniciar
+    gestor_autenticacion = GestorAutenticacion(GestorPersistencia("datos"))
     gestor_usuarios = GestorUsuarios(gestor_autenticacion)
 
-    while True:
-        limpiar_pantalla()
-        usuario_logueado = gestor_autenticacion.obtener_usuario_logueado()
-
-        if usuario_logueado:
-            print(f"Bienvenido, {usuario_logueado.nombre_usuario} ({usuario_logueado.rol})")
-            if usuario_logueado.rol == 'admin':
-                mostrar_menu_administrador()
-                opcion = input("Seleccione una opción: ").strip()
-                manejar_opcion_administrador(opcion, gestor_autenticacion, gestor_usuarios)
-            else: # usuario estandar
-                mostrar_menu_usuario_estandar()
+    try:
+        while True:
+            limpiar_pantalla()
+            usuario_logueado = gestor_autenticacion.obtener_usuario_logueado()
+
+            if usuario_logueado:
+                print(f"Bienvenido, {usuario_logueado.nombre_usuario} ({usuario_logueado.rol})")
+                if usuario_logueado.rol == 'admin':
+                    mostrar_menu_administrador()
+                    opcion = input("Seleccione una opción: ").strip()
+                    manejar_opcion_administrador(opcion, gestor_autenticacion, gestor_usuarios)
+                else: # usuario estandar
+                    mostrar_menu_usuario_estandar()
+                    opcion = input("Seleccione una opción: ").strip()
+                    manejar_opcion_usuario_estandar(opcion, gestor_autenticacion, gestor_usuarios)
+            else:
+                mostrar_menu_principal()
                 opcion = input("Seleccione una opción: ").strip()
-                manejar_opcion_usuario_estandar(opcion, gestor_autenticacion, gestor_usuarios)
-        else:
-            mostrar_menu_principal()
-            opcion = input("Seleccione una opción: ").strip()
-            manejar_opcion_menu_principal(opcion, gestor_autenticacion)
+                manejar_opcion_menu_principal(opcion, gestor_autenticacion)
 
-        input("\nPresione Enter para continuar...")
+            input("\nPresione Enter para continuar...")
+    finally:
+        # Al salir (incluso con exit()) se bajan a disco los cambios pendientes
+        gestor_autenticacion.cerrar()
 
 def mostrar_menu_principal():
     print("\n--- Menú Principal ---")
@@ -45,8 +51,9 @@ def mostrar_menu_administrador():
     print("4. Actualizar Perfil de Usuario")
     print("5. Eliminar Usuario")
     print("6. Actualizar Rol de Usuario") # <-- Nueva opción
-    print("7. Cerrar Sesión")
-    print("8. Salir del Programa") # 
+    print("7. Buscar Usuarios")
+    print("8. Cerrar Sesión")
+    print("9. Salir del Programa") # 
 
 def mostrar_menu_usuario_estandar():
     print("\n--- Menú de Usuario Estándar ---")
@@ -170,21 +177,29 @@ def manejar_opcion_menu_principal(opcion, gestor_autenticacion):
 
 def manejar_opcion_administrador(opcion, gestor_autenticacion, gestor_usuarios):
     if opcion == '1':
-        exito, usuarios_data = gestor_usuarios.leer_usuarios()
+        rol = input("Filtrar por rol (admin/estandar, Enter para todos): ").strip().lower() or None
+        if rol is not None and rol not in ['admin', 'estandar']:
+            print("Rol no válido. Debe ser 'admin' o 'estandar'.")
+            return
+        prefijo = input("Filtrar por comienzo del nombre de usuario (Enter para todos): ").strip()
+        # Los usuarios se traen de a una página y se imprimen a medida que llegan
+        exito, usuarios_data = gestor_usuarios.leer_usuarios(rol=rol, prefijo=prefijo)
         if exito:
-            if usuarios_data:
-                print("\n--- Lista de Usuarios y Perfiles ---")
-                for usuario in usuarios_data:
-                    print(f"Usuario: {usuario['nombre_usuario']}, Rol: {usuario['rol']}")
-                    if usuario['perfil']:
-                        print("  Perfil:")
-                        for key, value in usuario['perfil'].items():
-                            if value:
-                                print(f"    {key.replace('_', ' ').capitalize()}: {value}")
-                    else:
-                        print("  Perfil: No asignado")
-                    print("-" * 30)
-            else:
+            hay_usuarios = False
+            for usuario in usuarios_data:
+                if not hay_usuarios:
+                    print("\n--- Lista de Usuarios y Perfiles ---")
+                    hay_usuarios = True
+                print(f"Usuario: {usuario['nombre_usuario']}, Rol: {usuario['rol']}")
+                if usuario['perfil']:
+                    print("  Perfil:")
+                    for key, value in usuario['perfil'].items():
+                        if value:
+                            print(f"    {key.replace('_', ' ').capitalize()}: {value}")
+                else:
+                    print("  Perfil: No asignado")
+                print("-" * 30)
+            if not hay_usuarios:
                 print("No hay usuarios registrados.")
         else:
             print(f"Error: {usuarios_data}")
@@ -239,10 +254,24 @@ def manejar_opcion_administrador(opcion, gestor_autenticacion, gestor_usuarios):
 
         exito, mensaje = gestor_usuarios.actualizar_rol_usuario(nombre_usuario, nuevo_rol) # <-- Llamada a la nueva función
         print(mensaje)
-    elif opcion == '7': # <-- Se ajusta el número para Cerrar Sesión
+    elif opcion == '7':
+        print("\n--- Buscar Usuarios ---")
+        texto = input("Nombre de usuario, nombre, apellido, email o DNI (alcanza con el comienzo): ").strip()
+        exito, resultado = gestor_usuarios.buscar_usuarios(texto)
+        if not exito:
+            print(f"Error: {resultado}")
+        elif not resultado:
+            print("No se encontraron usuarios.")
+        else:
+            for usuario in resultado:
+                perfil = usuario['perfil'] or {}
+                print(f"Usuario: {usuario['nombre_usuario']}, Rol: {usuario['rol']}, "
+                      f"Nombre: {perfil.get('nombre') or 'N/A'} {perfil.get('apellido') or ''}, "
+                      f"Email: {perfil.get('email') or 'N/A'}, DNI: {perfil.get('dni') or 'N/A'}")
+    elif opcion == '8': # <-- Se ajusta el número para Cerrar Sesión
         exito, mensaje = gestor_autenticacion.cerrar_sesion()
         print(mensaje)
-    elif opcion == '8': # <-- Se ajusta el número para Salir del Programa
+    elif opcion == '9': # <-- Se ajusta el número para Salir del Programa
         print("Saliendo del programa. ¡Hasta luego!")
         exit()
     else:
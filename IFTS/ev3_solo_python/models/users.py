@@ -2,6 +2,10 @@ import itertools # Para generar IDs únicos
 import bcrypt # Asegúrate de que bcrypt esté importado
 
 class Perfil:
+    # Con __slots__ los objetos no llevan un __dict__ propio: con millones de usuarios en memoria
+    # es la mayor parte del consumo por objeto
+    __slots__ = ("id_perfil", "dni", "nombre", "apellido", "email", "telefono", "direccion", "fecha_nacimiento")
+    # Solo para perfiles creados sin id: los de la aplicación los asigna GestorAutenticacion
     _next_id_counter = itertools.count(1)
 
     def __init__(self, id_perfil=None, dni="", nombre="", apellido="", email="",
@@ -51,9 +55,12 @@ class Perfil:
 
 
 class Usuario:
+    __slots__ = ("id_usuario", "nombre_usuario", "contrasena_hasheada", "_rol", "perfil")
+    _next_id_counter = itertools.count(1)  # Igual que en Perfil
+
     def __init__(self, id_usuario=None, nombre_usuario="", contrasena_hasheada="", rol="estandar", perfil_objeto=None):
         # Genera un ID único para el usuario si no se proporciona
-        self.id_usuario = id_usuario if id_usuario is not None else str(next(itertools.count(1))) # Genera un ID único usando itertools
+        self.id_usuario = id_usuario if id_usuario is not None else next(Usuario._next_id_counter)
         self.nombre_usuario = nombre_usuario
         self.contrasena_hasheada = contrasena_hasheada # Almacena el hash, NO la contraseña en texto plano
         self._rol = rol # Almacena el rol internamente (usado por @property)
@@ -113,15 +120,19 @@ class Usuario:
             )
 
     def __repr__(self):
-        return f"{self.__class__.__name__}(id='{self.id_usuario[:8]}...', nombre='{self.nombre_usuario}', rol='{self.rol}')"
+        return f"{self.__class__.__name__}(id='{self.id_usuario}', nombre='{self.nombre_usuario}', rol='{self.rol}')"
 
 
 class UsuarioEstandar(Usuario):
+    __slots__ = ()
+
     def __init__(self, id_usuario=None, nombre_usuario="", contrasena_hasheada="", perfil_objeto=None):
         # Llama al constructor de Usuario, pasando el rol 'estandar'
         super().__init__(id_usuario, nombre_usuario, contrasena_hasheada, 'estandar', perfil_objeto)
 
 class Administrador(Usuario):
+    __slots__ = ()
+
     def __init__(self, id_usuario=None, nombre_usuario="", contrasena_hasheada="", perfil_objeto=None):
         # Llama al constructor de Usuario, pasando el rol 'admin'
         super().__init__(id_usuario, nombre_usuario, contrasena_hasheada, 'admin', perfil_objeto)     
\ No newline at end of file
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Los servicios usan el paquete comun: la carpeta IFTS se agrega al path una sola vez, acá
+_CARPETA_IFTS = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+if _CARPETA_IFTS not in sys.path:
+    sys.path.append(_CARPETA_IFTS)
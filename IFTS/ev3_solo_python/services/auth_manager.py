@@ -1,30 +1,97 @@
-import bcrypt
-import itertools  # Para generar IDs únicos
+import os
+import threading
 
 
 # Importa Perfil, UsuarioEstandar y Administrador. Si Perfil está en models.users, no necesitas importarlo de modelos.usuario directamente
-from models.users import UsuarioEstandar, Administrador, Perfil # Asumiendo que Perfil también está en models.users
+from models.users import Usuario, UsuarioEstandar, Administrador, Perfil # Asumiendo que Perfil también está en models.users
+from services.user_store import UserStore
+from comun.hashing_service import obtener_servicio_por_defecto
+from comun.session_cache import CacheSesiones
+from services.id_allocator import AsignadorIds
 
 class GestorAutenticacion:
-    def __init__(self):
-        self.usuarios = []
-        self.usuario_logueado = None
+    """
+    Gestor de usuarios y sesiones, seguro para usar desde varios hilos a la vez.
+
+    - Cada inicio de sesión recibe un token propio (crear_sesion): varios usuarios pueden
+      estar logueados al mismo tiempo. Los métodos sin token usan la sesión "actual",
+      que es la que abre iniciar_sesion (el menú de consola trabaja así).
+      Las sesiones viven en un CacheSesiones: vencen por inactividad y se revocan todas
+      juntas cuando al usuario se le cambia el rol o se lo elimina.
+    - Las lecturas (buscar usuarios, resolver un token) no toman ningún lock.
+    - Las escrituras se serializan con bloqueo_escritura: la comprobación y el cambio
+      ocurren juntos, y el registro en disco queda en el mismo orden que los cambios.
+      El hash de contraseñas y el id nuevo se obtienen fuera del lock, para no frenar a los demás.
+    - Los ids salen de un AsignadorIds con la marca alta guardada junto a la persistencia.
+      Con varios procesos registrando usuarios a la vez se puede pasar un GeneradorSnowflake
+      por proceso (asignador_ids y asignador_ids_perfil).
+    """
+    def __init__(self, persistencia=None, servicio_hashing=None, store=None, sesiones=None,
+                 asignador_ids=None, asignador_ids_perfil=None):
+        # Usuarios indexados por nombre, id, DNI y rol (búsquedas O(1) en lugar de recorrer una lista).
+        self.usuarios = store if store is not None else UserStore()
+        self.bloqueo_escritura = threading.RLock()
+        self.sesiones = sesiones if sesiones is not None else CacheSesiones()
+        self._token_actual = None   # Sesión del menú de consola
+        # Si hay persistencia (GestorPersistencia), se recuperan los usuarios guardados en disco
+        self.persistencia = persistencia
+        if self.persistencia is not None:
+            self.persistencia.cargar(self.usuarios)
+        directorio = self.persistencia.directorio if self.persistencia is not None else None
+        # bcrypt corre en un pool de trabajadores compartido (ServicioHashing), no en el hilo que llama.
+        # Con persistencia, el factor de trabajo calibrado se guarda junto a los datos
+        self.servicio_hashing = servicio_hashing or obtener_servicio_por_defecto(
+            directorio and os.path.join(directorio, "hashing.json"))
+        self.asignador_ids = asignador_ids or AsignadorIds(directorio and os.path.join(directorio, "ids_usuarios.json"))
+        # Cada gestor tiene sus propios asignadores: los ids se pasan explícitos al crear Usuario y Perfil
+        self.asignador_ids_perfil = asignador_ids_perfil or AsignadorIds(
+            directorio and os.path.join(directorio, "ids_perfiles.json"))
+        # Los datos cargados pueden ser anteriores a la marca guardada: los ids nuevos continúan a partir del mayor
+        self.asignador_ids.avanzar_hasta(max((u.id_usuario for u in self.usuarios), default=0) + 1)
+        self.asignador_ids_perfil.avanzar_hasta(max((u.perfil.id_perfil for u in self.usuarios), default=0) + 1)
         self._inicializar_admin_por_defecto()
 
+    def registrar_mutacion(self, operacion, **datos):
+        """Deja constancia de un cambio en el registro de persistencia (si está configurada)."""
+        if self.persistencia is not None:
+            with self.bloqueo_escritura:
+                self.persistencia.registrar(operacion, self.usuarios, **datos)
+
+    def cerrar(self):
+        """Baja a disco los cambios pendientes. Llamar antes de terminar el programa."""
+        if self.persistencia is not None:
+            with self.bloqueo_escritura:
+                self.persistencia.cerrar()
+
     def _hashear_contrasena(self, contrasena):
-        return bcrypt.hashpw(contrasena.encode('utf-8'), bcrypt.gensalt())
+        return self.servicio_hashing.hashear(contrasena)
 
     def _verificar_contrasena(self, contrasena_plana, contrasena_hasheada):
-        return bcrypt.checkpw(contrasena_plana.encode('utf-8'), contrasena_hasheada)
+        return self.servicio_hashing.verificar(contrasena_plana, contrasena_hasheada)
+
+    def _actualizar_hash_si_corresponde(self, usuario, contrasena_plana):
+        # Aprovecha que tenemos la contraseña en claro para llevar el hash al factor de trabajo actual
+        hash_verificado = usuario.contrasena_hasheada
+        nuevo_hash = self.servicio_hashing.rehashear_si_corresponde(contrasena_plana, hash_verificado)
+        if nuevo_hash is None:
+            return
+        with self.bloqueo_escritura:
+            # Si la contraseña cambió mientras calculábamos el hash, no la pisamos
+            if usuario.contrasena_hasheada != hash_verificado or usuario.nombre_usuario not in self.usuarios:
+                return
+            usuario.contrasena_hasheada = nuevo_hash
+            self.registrar_mutacion("actualizar_contrasena", nombre_usuario=usuario.nombre_usuario,
+                                    contrasena_hasheada=nuevo_hash.decode('utf-8'))
 
     def _inicializar_admin_por_defecto(self):
         # Es una buena práctica verificar si ya existe un admin en self.usuarios antes de crear uno nuevo
         # Esto es especialmente importante si vas a cargar usuarios desde un archivo
-        if not any(isinstance(u, Administrador) for u in self.usuarios):
-            admin_id = next(itertools.count(1)) # Genera un ID para el admin por defecto
+        if self.usuarios.contar_con_rol('admin') == 0:
+            admin_id = self.asignador_ids.siguiente() # Genera un ID para el admin por defecto
             admin_contrasena_hasheada = self._hashear_contrasena("admin123") # Usa tu método hashear
             
             perfil_admin_inicial = Perfil(
+                id_perfil=self.asignador_ids_perfil.siguiente(),
                 dni="12345678A",
                 nombre="Admin",
                 apellido="Principal",
@@ -37,22 +104,23 @@ class GestorAutenticacion:
             admin_usuario = Administrador(id_usuario=admin_id, nombre_usuario="admin", 
                                         contrasena_hasheada=admin_contrasena_hasheada, 
                                         perfil_objeto=perfil_admin_inicial)
-            self.usuarios.append(admin_usuario)
+            self.usuarios.agregar(admin_usuario)
+            self.registrar_mutacion("registrar", usuario=admin_usuario.a_diccionario())
 
     def registrar_usuario(self, nombre_usuario, contrasena, rol="estandar", perfil_objeto=None):
         nombre_usuario_normalizado = nombre_usuario.lower()
 
-        if any(usuario.nombre_usuario == nombre_usuario_normalizado for usuario in self.usuarios):
+        if nombre_usuario_normalizado in self.usuarios:
             return False, "El nombre de usuario ya existe."
 
         contrasena_hasheada = self._hashear_contrasena(contrasena)
         
         # Genera un ID para el nuevo usuario
-        nuevo_usuario_id = next(itertools.count(1))  # <-- Nuevo ID aquí
+        nuevo_usuario_id = self.asignador_ids.siguiente()  # <-- Nuevo ID aquí
 
         # Si no se proporciona un objeto de perfil, crea uno vacío
         if perfil_objeto is None:
-            nuevo_perfil = Perfil()
+            nuevo_perfil = Perfil(id_perfil=self.asignador_ids_perfil.siguiente())
         else:
             nuevo_perfil = perfil_objeto 
 
@@ -67,34 +135,60 @@ class GestorAutenticacion:
         else:
             return False, "Rol no válido. Debe ser 'admin' o 'estandar'."
 
-        self.usuarios.append(nuevo_usuario)
+        with self.bloqueo_escritura:
+            # Otro hilo pudo registrar el mismo nombre (o DNI) mientras se calculaba el hash
+            if nombre_usuario_normalizado in self.usuarios:
+                return False, "El nombre de usuario ya existe."
+            if nuevo_perfil.dni and self.usuarios.id_perfil_con_dni(nuevo_perfil.dni) is not None:
+                return False, f"Error: El DNI '{nuevo_perfil.dni}' ya está registrado por otro usuario."
+            self.usuarios.agregar(nuevo_usuario)
+            self.registrar_mutacion("registrar", usuario=nuevo_usuario.a_diccionario())
         return True, f"Usuario '{nombre_usuario}' con rol '{nuevo_usuario.rol}' registrado exitosamente."
 
-    def iniciar_sesion(self, nombre_usuario_ingresado, contrasena_plana):
-        nombre_usuario_normalizado_ingresado = nombre_usuario_ingresado.lower()
-
-        for usuario in self.usuarios:
-            if usuario.nombre_usuario == nombre_usuario_normalizado_ingresado:
-                if self._verificar_contrasena(contrasena_plana, usuario.contrasena_hasheada):
-                    self.usuario_logueado = usuario
-                    return True, f"Inicio de sesión exitoso como '{usuario.rol}'."
-                else:
-                    return False, "Credenciales incorrectas."
+    # --- Sesiones ---
+
+    def crear_sesion(self, nombre_usuario_ingresado, contrasena_plana):
+        """Verifica las credenciales y abre una sesión nueva. Retorna (True, token) o (False, mensaje)."""
+        usuario = self.usuarios.obtener_por_nombre(nombre_usuario_ingresado)
+        if usuario and self._verificar_contrasena(contrasena_plana, usuario.contrasena_hasheada):
+            self._actualizar_hash_si_corresponde(usuario, contrasena_plana)
+            return True, self.sesiones.crear(usuario.id_usuario)
         return False, "Credenciales incorrectas."
 
-    def cerrar_sesion(self):
-        if self.usuario_logueado:
-            nombre_usuario_actual = self.usuario_logueado.nombre_usuario
-            self.usuario_logueado = None
-            return True, f"Sesión de '{nombre_usuario_actual}' cerrada."
+    def iniciar_sesion(self, nombre_usuario_ingresado, contrasena_plana):
+        """Abre una sesión y la deja como sesión actual (la que usan los métodos llamados sin token)."""
+        exito, resultado = self.crear_sesion(nombre_usuario_ingresado, contrasena_plana)
+        if not exito:
+            return False, resultado
+        self._token_actual = resultado
+        return True, f"Inicio de sesión exitoso como '{self.obtener_usuario_logueado().rol}'."
+
+    def cerrar_sesion(self, token=None):
+        token = token if token is not None else self._token_actual
+        id_usuario = self.sesiones.revocar(token) if token is not None else None
+        if token == self._token_actual:
+            self._token_actual = None
+        usuario = self.usuarios.obtener_por_id(id_usuario) if id_usuario is not None else None
+        if usuario:
+            return True, f"Sesión de '{usuario.nombre_usuario}' cerrada."
         return False, "No hay ningún usuario logueado."
 
-    def obtener_usuario_logueado(self):
-        return self.usuario_logueado
+    def obtener_usuario_logueado(self, token=None):
+        """
+        Retorna el usuario de la sesión (o de la sesión actual si no se pasa token), o None.
+        Se busca en el almacén en cada llamada, así un cambio de rol o una baja se ven enseguida.
+        """
+        token = token if token is not None else self._token_actual
+        sesion = self.sesiones.obtener(token) if token is not None else None
+        return self.usuarios.obtener_por_id(sesion[0]) if sesion is not None else None
+
+    def cerrar_sesiones_de_usuario(self, id_usuario):
+        """Cierra todas las sesiones abiertas de un usuario (al eliminarlo o cambiarle el rol)."""
+        return self.sesiones.revocar_usuario(id_usuario)
+
+    @property
+    def usuario_logueado(self):
+        return self.obtener_usuario_logueado()
 
     def obtener_usuario_por_nombre(self, nombre_usuario):
-        nombre_usuario_normalizado = nombre_usuario.lower()
-        for usuario in self.usuarios:
-            if usuario.nombre_usuario == nombre_usuario_normalizado:
-                return usuario
-        return None
\ No newline at end of file
+        return self.usuarios.obtener_por_nombre(nombre_usuario)
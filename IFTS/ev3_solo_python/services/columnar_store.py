@@ -0,0 +1,325 @@
+import sys
+from array import array
+
+import bcrypt
+
+from models.users import Perfil, Usuario
+from comun.sorted_index import IndiceOrdenado
+from comun.search_index import IndiceBusqueda, valores_de_usuario
+
+
+class ColumnarUserStore:
+    """
+    Almacén de usuarios por columnas, con la misma interfaz que UserStore.
+
+    En lugar de un objeto Usuario y uno Perfil por usuario, cada atributo se guarda en su
+    propia columna: los números en arrays compactos, el rol como un código de 1 byte y los
+    textos que se repiten mucho (nombre, apellido, fecha de nacimiento) internados, así
+    todos los usuarios con el mismo valor comparten un único string.
+
+    Las búsquedas devuelven vistas (VistaUsuario) que se comportan como un Usuario:
+    leer o modificar sus atributos lee o escribe la columna correspondiente.
+    Los ids de usuario y de perfil deben ser enteros.
+
+    Como UserStore, se puede leer desde varios hilos sin lock mientras las escrituras estén
+    serializadas (GestorAutenticacion.bloqueo_escritura): las filas nunca se mueven. Una baja
+    deja la fila marcada como eliminada (una lápida) y cada vista recuerda su fila, así que una
+    vista obtenida antes de la baja sigue leyendo los últimos datos del usuario, igual que un
+    Usuario común que ya no está en el almacén. Las filas eliminadas ocupan lugar hasta que se
+    llama a compactar(), que sí mueve filas y requiere que ningún otro hilo esté usando vistas.
+    """
+    ROLES = ('estandar', 'admin')
+    CAMPOS_PERFIL = ('dni', 'nombre', 'apellido', 'email', 'telefono', 'direccion', 'fecha_nacimiento')
+    CAMPOS_INTERNADOS = ('nombre', 'apellido', 'fecha_nacimiento')
+
+    def __init__(self, usuarios=None):
+        self._ids = array('q')
+        self._nombres_usuario = []
+        self._hashes = []
+        self._roles = array('b')
+        self._ids_perfil = array('q')
+        self._perfiles = {campo: [] for campo in self.CAMPOS_PERFIL}
+        self._vivas = bytearray()  # Número de fila -> 1 si el usuario sigue en el almacén, 0 si es una lápida
+        self._eliminadas = 0
+        self._fila_por_id = {}     # id_usuario -> número de fila
+        self._id_por_nombre = {}   # nombre_usuario normalizado -> id_usuario
+        self._id_por_dni = {}      # dni -> id_usuario
+        self._cantidad_por_rol = [0] * len(self.ROLES)
+        self._nombres = IndiceOrdenado()                                   # nombres normalizados, en orden
+        self._nombres_por_rol = [IndiceOrdenado() for _ in self.ROLES]   # código de rol -> nombres en orden
+        self._busqueda = IndiceBusqueda()
+        for usuario in usuarios or []:
+            self.agregar(usuario)
+
+    @staticmethod
+    def normalizar_nombre(nombre_usuario):
+        """Los nombres de usuario se comparan sin distinguir mayúsculas."""
+        return nombre_usuario.lower()
+
+    def _codigo_rol(self, rol):
+        if rol not in self.ROLES:
+            raise ValueError("Rol no válido. Debe ser 'admin' o 'estandar'.")
+        return self.ROLES.index(rol)
+
+    def _texto(self, campo, valor):
+        return sys.intern(valor) if campo in self.CAMPOS_INTERNADOS and isinstance(valor, str) else valor
+
+    def _fila(self, id_usuario):
+        return self._fila_por_id[id_usuario]
+
+    def _vista(self, id_usuario):
+        # Si otro hilo lo eliminó entre la búsqueda en un índice y acá, no se lo encuentra
+        fila = self._fila_por_id.get(id_usuario) if id_usuario is not None else None
+        return VistaUsuario(self, id_usuario, fila) if fila is not None else None
+
+    def _vistas(self, ids):
+        return [vista for vista in map(self._vista, ids) if vista is not None]
+
+    # --- Altas y bajas ---
+
+    def agregar(self, usuario):
+        """Copia el usuario (y su perfil) a las columnas. Lanza ValueError si el nombre o el id ya existen."""
+        nombre = self.normalizar_nombre(usuario.nombre_usuario)
+        if nombre in self._id_por_nombre:
+            raise ValueError(f"El nombre de usuario '{usuario.nombre_usuario}' ya existe.")
+        if usuario.id_usuario in self._fila_por_id:
+            raise ValueError(f"El id de usuario '{usuario.id_usuario}' ya existe.")
+        codigo_rol = self._codigo_rol(usuario.rol)
+        perfil = usuario.perfil if usuario.perfil is not None else Perfil()
+
+        # La fila se completa antes de publicarla en los índices: quien la encuentra la ve entera
+        fila = len(self._ids)
+        for campo in self.CAMPOS_PERFIL:
+            self._perfiles[campo].append(self._texto(campo, getattr(perfil, campo)))
+        self._nombres_usuario.append(usuario.nombre_usuario)
+        self._hashes.append(usuario.contrasena_hasheada)
+        self._roles.append(codigo_rol)
+        self._ids_perfil.append(perfil.id_perfil)
+        self._vivas.append(1)
+        self._ids.append(usuario.id_usuario)
+        self._fila_por_id[usuario.id_usuario] = fila
+
+        self._cantidad_por_rol[codigo_rol] += 1
+        self._nombres.agregar(nombre)
+        self._nombres_por_rol[codigo_rol].agregar(nombre)
+        self._busqueda.agregar(usuario.id_usuario, valores_de_usuario(usuario))
+        if perfil.dni:
+            self._id_por_dni[perfil.dni] = usuario.id_usuario
+        self._id_por_nombre[nombre] = usuario.id_usuario # Último: recién ahora se lo encuentra por nombre
+
+    def eliminar(self, nombre_usuario):
+        """
+        Quita al usuario de las columnas y los índices. Retorna una copia independiente
+        (un Usuario común, no una vista) o None si no existía.
+        """
+        nombre = self.normalizar_nombre(nombre_usuario)
+        id_usuario = self._id_por_nombre.pop(nombre, None)
+        if id_usuario is None:
+            return None
+        fila = self._fila_por_id.pop(id_usuario)
+        eliminado = Usuario.desde_diccionario(VistaUsuario(self, id_usuario, fila).a_diccionario())
+        self._busqueda.quitar(id_usuario, valores_de_usuario(eliminado))
+        self._cantidad_por_rol[self._roles[fila]] -= 1
+        self._nombres.quitar(nombre)
+        self._nombres_por_rol[self._roles[fila]].quitar(nombre)
+        dni = self._perfiles['dni'][fila]
+        if dni and self._id_por_dni.get(dni) == id_usuario:
+            del self._id_por_dni[dni]
+        # La fila queda como lápida, con sus datos: las vistas que ya la tienen la siguen leyendo
+        self._vivas[fila] = 0
+        self._eliminadas += 1
+        return eliminado
+
+    def compactar(self):
+        """
+        Libera el lugar de las filas eliminadas. Mueve filas: las vistas obtenidas antes dejan
+        de ser válidas, así que solo se debe llamar sin otros hilos usando el almacén.
+        Retorna la cantidad de filas liberadas.
+        """
+        liberadas = self._eliminadas
+        if not liberadas:
+            return 0
+        vivas = [fila for fila, viva in enumerate(self._vivas) if viva]
+        self._ids = array('q', (self._ids[fila] for fila in vivas))
+        self._nombres_usuario = [self._nombres_usuario[fila] for fila in vivas]
+        self._hashes = [self._hashes[fila] for fila in vivas]
+        self._roles = array('b', (self._roles[fila] for fila in vivas))
+        self._ids_perfil = array('q', (self._ids_perfil[fila] for fila in vivas))
+        self._perfiles = {campo: [valores[fila] for fila in vivas] for campo, valores in self._perfiles.items()}
+        self._vivas = bytearray(b"\x01" * len(vivas))
+        self._fila_por_id = {id_usuario: fila for fila, id_usuario in enumerate(self._ids)}
+        self._eliminadas = 0
+        return liberadas
+
+    def cambiar_rol(self, usuario, nuevo_rol):
+        """Cambia el rol del usuario manteniendo al día la cantidad por rol."""
+        codigo_nuevo = self._codigo_rol(nuevo_rol)
+        fila = self._fila(usuario.id_usuario)
+        codigo_anterior = self._roles[fila]
+        if codigo_anterior != codigo_nuevo:
+            self._roles[fila] = codigo_nuevo
+            self._cantidad_por_rol[codigo_anterior] -= 1
+            self._cantidad_por_rol[codigo_nuevo] += 1
+            nombre = self.normalizar_nombre(self._nombres_usuario[fila])
+            self._nombres_por_rol[codigo_anterior].quitar(nombre)
+            self._nombres_por_rol[codigo_nuevo].agregar(nombre)
+
+    def actualizar_perfil(self, usuario, nuevos_datos_perfil):
+        """Actualiza los campos de perfil conocidos y mantiene el índice por DNI al día."""
+        fila = self._fila(usuario.id_usuario)
+        dni_anterior = self._perfiles['dni'][fila]
+        valores_anteriores = valores_de_usuario(VistaUsuario(self, usuario.id_usuario, fila))
+        for clave, valor in nuevos_datos_perfil.items():
+            if clave in self._perfiles:
+                self._perfiles[clave][fila] = self._texto(clave, valor)
+        self._busqueda.actualizar(usuario.id_usuario, valores_anteriores, valores_de_usuario(VistaUsuario(self, usuario.id_usuario, fila)))
+        dni_nuevo = self._perfiles['dni'][fila]
+        if dni_nuevo != dni_anterior:
+            if dni_anterior and self._id_por_dni.get(dni_anterior) == usuario.id_usuario:
+                del self._id_por_dni[dni_anterior]
+            if dni_nuevo:
+                self._id_por_dni[dni_nuevo] = usuario.id_usuario
+
+    # --- Búsquedas ---
+
+    def obtener_por_nombre(self, nombre_usuario):
+        return self._vista(self._id_por_nombre.get(self.normalizar_nombre(nombre_usuario)))
+
+    def obtener_por_id(self, id_usuario):
+        return self._vista(id_usuario)
+
+    def obtener_por_dni(self, dni):
+        return self._vista(self._id_por_dni.get(dni))
+
+    def id_perfil_con_dni(self, dni):
+        """Retorna el id del perfil que tiene registrado ese DNI, o None si nadie lo tiene."""
+        vista = self._vista(self._id_por_dni.get(dni))
+        return vista.perfil.id_perfil if vista is not None else None
+
+    def usuarios_con_rol(self, rol):
+        """Retorna la lista de usuarios (vistas) que tienen el rol indicado."""
+        codigo = self._codigo_rol(rol)
+        return [VistaUsuario(self, self._ids[fila], fila) for fila, codigo_fila in enumerate(self._roles)
+                if codigo_fila == codigo and self._vivas[fila]]
+
+    def contar_con_rol(self, rol):
+        return self._cantidad_por_rol[self._codigo_rol(rol)] if rol in self.ROLES else 0
+
+    def pagina(self, despues_de=None, tamano=100, rol=None, prefijo=""):
+        """Igual que UserStore.pagina: hasta `tamano` usuarios (vistas) ordenados por nombre."""
+        if rol is None:
+            indice = self._nombres
+        elif rol in self.ROLES:
+            indice = self._nombres_por_rol[self._codigo_rol(rol)]
+        else:
+            return []
+        nombres = indice.desde(despues_de, self.normalizar_nombre(prefijo), tamano)
+        return self._vistas(self._id_por_nombre.get(nombre) for nombre in nombres)
+
+    def buscar(self, texto, limite=20):
+        """Igual que UserStore.buscar: por prefijo y, si no alcanzan, por parecido."""
+        return self._vistas(self._busqueda.buscar(texto, limite))
+
+    # --- Comportamiento de colección ---
+
+    def __len__(self):
+        return len(self._ids) - self._eliminadas
+
+    def __iter__(self):
+        # Igual que UserStore: no se debe agregar ni eliminar usuarios durante el recorrido
+        return (VistaUsuario(self, self._ids[fila], fila) for fila in range(len(self._ids)) if self._vivas[fila])
+
+    def __contains__(self, nombre_usuario):
+        return self.normalizar_nombre(nombre_usuario) in self._id_por_nombre
+
+
+def _columna_perfil(campo):
+    def obtener(self):
+        return self._store._perfiles[campo][self._fila]
+
+    def asignar(self, valor):
+        self._store._perfiles[campo][self._fila] = self._store._texto(campo, valor)
+
+    return property(obtener, asignar)
+
+
+class VistaPerfil:
+    """Perfil de un usuario del ColumnarUserStore, con los mismos atributos que Perfil."""
+    __slots__ = ("_store", "_fila")
+
+    def __init__(self, store, fila):
+        self._store = store
+        self._fila = fila
+
+    @property
+    def id_perfil(self):
+        return self._store._ids_perfil[self._fila]
+
+    dni = _columna_perfil('dni')
+    nombre = _columna_perfil('nombre')
+    apellido = _columna_perfil('apellido')
+    email = _columna_perfil('email')
+    telefono = _columna_perfil('telefono')
+    direccion = _columna_perfil('direccion')
+    fecha_nacimiento = _columna_perfil('fecha_nacimiento')
+
+    a_diccionario = Perfil.a_diccionario
+    __repr__ = Perfil.__repr__
+
+
+class VistaUsuario:
+    """
+    Usuario del ColumnarUserStore: se usa igual que un Usuario y trabaja directo sobre las columnas.
+    Recuerda su fila, que no cambia mientras no se compacte el almacén.
+    """
+    __slots__ = ("_store", "id_usuario", "_fila")
+
+    def __init__(self, store, id_usuario, fila):
+        self._store = store
+        self.id_usuario = id_usuario
+        self._fila = fila
+
+    @property
+    def nombre_usuario(self):
+        return self._store._nombres_usuario[self._fila]
+
+    @property
+    def contrasena_hasheada(self):
+        return self._store._hashes[self._fila]
+
+    @contrasena_hasheada.setter
+    def contrasena_hasheada(self, valor):
+        self._store._hashes[self._fila] = valor
+
+    @property
+    def rol(self):
+        return self._store.ROLES[self._store._roles[self._fila]]
+
+    @rol.setter
+    def rol(self, valor):
+        self._store.cambiar_rol(self, valor) # Valida el rol y mantiene la cantidad por rol
+
+    @property
+    def perfil(self):
+        return VistaPerfil(self._store, self._fila)
+
+    @perfil.setter
+    def perfil(self, perfil_objeto):
+        self._store.actualizar_perfil(self, perfil_objeto.a_diccionario())
+        self._store._ids_perfil[self._fila] = perfil_objeto.id_perfil
+
+    def verificar_contrasena(self, contrasena):
+        """Verifica si la contraseña proporcionada coincide con la hasheada."""
+        return bcrypt.checkpw(contrasena.encode('utf-8'), self.contrasena_hasheada)
+
+    a_diccionario = Usuario.a_diccionario
+
+    def __eq__(self, otro):
+        return isinstance(otro, VistaUsuario) and otro._store is self._store and otro.id_usuario == self.id_usuario
+
+    def __hash__(self):
+        return hash((id(self._store), self.id_usuario))
+
+    def __repr__(self):
+        clase = "Administrador" if self.rol == 'admin' else "UsuarioEstandar"
+        return f"{clase}(id='{self.id_usuario}', nombre='{self.nombre_usuario}', rol='{self.rol}')"
@@ -0,0 +1,145 @@
+import json
+import os
+import threading
+import time
+
+
+class AsignadorIds:
+    """
+    Ids enteros únicos y crecientes: nunca entrega dos veces el mismo, ni siquiera entre reinicios.
+
+    - Marca alta persistida: antes de entregar un id se deja en disco (en `ruta`) una marca
+      por encima de él, reservando de a `tamano_segmento` ids para no escribir en cada alta.
+      Al reiniciar se sigue desde la marca; los ids reservados que no se usaron quedan como
+      huecos, pero no se repiten.
+    - Sin lock central en el camino caliente: cada hilo toma un bloque de `tamano_bloque` ids
+      y los entrega por su cuenta; solo pasa por el lock al agotarlo. Cada hilo entrega sus ids
+      en orden creciente; con varios hilos a la vez se intercalan.
+    - reservar(cantidad) entrega un rango contiguo de una vez, para importaciones masivas.
+
+    Sin `ruta` funciona igual pero solo en memoria.
+    """
+    def __init__(self, ruta=None, tamano_bloque=64, tamano_segmento=10000, inicio=1):
+        if tamano_bloque < 1:
+            raise ValueError("El tamaño de bloque debe ser al menos 1.")
+        self.ruta = ruta
+        self.tamano_bloque = tamano_bloque
+        self.tamano_segmento = max(tamano_segmento, tamano_bloque)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._generacion = 0                               # Cambia al avanzar: invalida los bloques de los hilos
+        self._siguiente = max(inicio, self._leer_marca())  # Primer id que todavía no se entregó
+        self._marca = self._siguiente                      # Los ids menores a la marca en disco ya se pueden entregar
+
+    def _leer_marca(self):
+        if self.ruta is None or not os.path.exists(self.ruta):
+            return 0
+        with open(self.ruta, encoding="utf-8") as archivo:
+            return json.load(archivo)["marca"]
+
+    def _guardar_marca(self, marca):
+        if self.ruta is not None:
+            temporal = self.ruta + ".tmp"
+            with open(temporal, "w", encoding="utf-8") as archivo:
+                json.dump({"marca": marca}, archivo)
+                archivo.flush()
+                os.fsync(archivo.fileno())
+            os.replace(temporal, self.ruta) # Atómico: queda la marca anterior o la nueva
+        self._marca = marca
+
+    def _tomar(self, cantidad):
+        # Llamar con self._lock tomado
+        inicio = self._siguiente
+        fin = inicio + cantidad
+        if fin > self._marca:
+            self._guardar_marca(max(fin, self._marca + self.tamano_segmento))
+        self._siguiente = fin
+        return inicio
+
+    def siguiente(self):
+        """Retorna un id nuevo."""
+        bloque = getattr(self._local, "bloque", None)
+        if bloque is None or bloque[1] >= bloque[2] or bloque[0] != self._generacion:
+            with self._lock:
+                inicio = self._tomar(self.tamano_bloque)
+                bloque = [self._generacion, inicio, inicio + self.tamano_bloque]
+            self._local.bloque = bloque
+        id_nuevo = bloque[1]
+        bloque[1] += 1
+        return id_nuevo
+
+    def reservar(self, cantidad):
+        """Reserva `cantidad` ids consecutivos y los retorna como un range."""
+        with self._lock:
+            inicio = self._tomar(cantidad)
+        return range(inicio, inicio + cantidad)
+
+    def avanzar_hasta(self, minimo):
+        """Asegura que todos los ids que se entreguen desde ahora sean >= minimo (por ejemplo, tras cargar datos)."""
+        with self._lock:
+            if minimo > self._siguiente:
+                self._siguiente = minimo
+                self._generacion += 1 # Los bloques que ya tienen los hilos pueden estar por debajo
+
+
+class GeneradorSnowflake:
+    """
+    Ids de 63 bits ordenados por tiempo, al estilo Snowflake, para que varios procesos
+    registren usuarios a la vez sin coordinarse ni compartir archivos:
+
+        41 bits de milisegundos desde EPOCA_MS | 10 bits de nodo | 12 bits de secuencia
+
+    Cada proceso usa un id_nodo distinto (0 a 1023). Alcanza para 4096 ids por milisegundo
+    y por nodo durante unos 69 años. Si el reloj retrocede, o se agotan los ids de un
+    milisegundo, se sigue sobre el último milisegundo usado: los ids nunca decrecen.
+    """
+    BITS_NODO = 10
+    BITS_SECUENCIA = 12
+    MAX_NODO = (1 << BITS_NODO) - 1
+    MAX_SECUENCIA = (1 << BITS_SECUENCIA) - 1
+    EPOCA_MS = 1704067200000  # 2024-01-01 00:00 UTC
+
+    def __init__(self, id_nodo, epoca_ms=EPOCA_MS, reloj=time.time):
+        if not 0 <= id_nodo <= self.MAX_NODO:
+            raise ValueError(f"El id de nodo debe estar entre 0 y {self.MAX_NODO}.")
+        self.id_nodo = id_nodo
+        self.epoca_ms = epoca_ms
+        self._reloj = reloj
+        self._lock = threading.Lock() # Solo entre hilos del mismo proceso
+        self._ultimo_ms = -1
+        self._secuencia = 0
+
+    def siguiente(self):
+        """Retorna un id nuevo, mayor que todos los que entregó este generador."""
+        ahora_ms = int(self._reloj() * 1000) - self.epoca_ms
+        with self._lock:
+            if ahora_ms > self._ultimo_ms:
+                self._ultimo_ms = ahora_ms
+                self._secuencia = 0
+            elif self._secuencia < self.MAX_SECUENCIA:
+                self._secuencia += 1
+            else:
+                self._ultimo_ms += 1 # Se agotó el milisegundo: se toma prestado el siguiente
+                self._secuencia = 0
+            return (self._ultimo_ms << (self.BITS_NODO + self.BITS_SECUENCIA)) | (self.id_nodo << self.BITS_SECUENCIA) | self._secuencia
+
+    def reservar(self, cantidad):
+        """Retorna una lista de `cantidad` ids nuevos (crecientes, no necesariamente consecutivos)."""
+        return [self.siguiente() for _ in range(cantidad)]
+
+    def avanzar_hasta(self, minimo):
+        """Asegura que los próximos ids sean >= minimo."""
+        with self._lock:
+            minimo_ms = minimo >> (self.BITS_NODO + self.BITS_SECUENCIA)
+            if minimo_ms >= self._ultimo_ms:
+                # Con la secuencia agotada, el próximo id pasa al milisegundo siguiente al de minimo
+                self._ultimo_ms = minimo_ms
+                self._secuencia = self.MAX_SECUENCIA
+
+    @classmethod
+    def descomponer(cls, id_snowflake, epoca_ms=EPOCA_MS):
+        """Retorna (momento en segundos desde 1970, id_nodo, secuencia) de un id."""
+        secuencia = id_snowflake & cls.MAX_SECUENCIA
+        id_nodo = (id_snowflake >> cls.BITS_SECUENCIA) & cls.MAX_NODO
+        milisegundos = id_snowflake >> (cls.BITS_NODO + cls.BITS_SECUENCIA)
+        return (milisegundos + epoca_ms) / 1000, id_nodo, secuencia
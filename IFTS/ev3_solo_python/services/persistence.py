@@ -0,0 +1,154 @@
+import json
+import os
+import time
+
+from models.users import Usuario
+
+
+class GestorPersistencia:
+    """
+    Guarda los usuarios en disco con dos archivos dentro de `directorio`:
+
+    - snapshot.jsonl: foto completa de todos los usuarios (una línea por usuario),
+      reescrita cada `snapshot_cada` mutaciones.
+    - mutaciones.log: registro de solo-agregado con cada cambio posterior a la última foto
+      (registrar, actualizar_perfil, actualizar_contrasena, cambiar_rol, eliminar).
+
+    Para no pagar un fsync por cada cambio, las mutaciones se acumulan y se sincronizan
+    a disco cada `fsync_cada` entradas, o en la primera escritura después de `intervalo_fsync`
+    segundos sin sincronizar (no hay un temporizador: si el proceso queda inactivo, lo
+    pendiente se sincroniza recién con la próxima escritura, con sincronizar() o al cerrar).
+    Al iniciar se carga la foto y se vuelven a aplicar las mutaciones del registro.
+    """
+    ARCHIVO_SNAPSHOT = "snapshot.jsonl"
+    ARCHIVO_LOG = "mutaciones.log"
+
+    def __init__(self, directorio="datos", snapshot_cada=10000, fsync_cada=100, intervalo_fsync=1.0):
+        self.directorio = directorio
+        self.snapshot_cada = snapshot_cada
+        self.fsync_cada = fsync_cada
+        self.intervalo_fsync = intervalo_fsync
+        os.makedirs(directorio, exist_ok=True)
+        self._ruta_snapshot = os.path.join(directorio, self.ARCHIVO_SNAPSHOT)
+        self._ruta_log = os.path.join(directorio, self.ARCHIVO_LOG)
+        self._log = None
+        self._secuencia = 0            # Número de la última mutación registrada
+        self._pendientes_fsync = 0
+        self._ultimo_fsync = time.monotonic()
+        self._desde_snapshot = 0       # Mutaciones registradas desde la última foto
+
+    # --- Recuperación ---
+
+    def cargar(self, store):
+        """
+        Carga la última foto y reaplica el registro de mutaciones sobre `store` (un UserStore vacío).
+        Retorna la cantidad de mutaciones reaplicadas.
+        """
+        secuencia_snapshot = 0
+        if os.path.exists(self._ruta_snapshot):
+            with open(self._ruta_snapshot, encoding="utf-8") as archivo:
+                encabezado = json.loads(archivo.readline())
+                secuencia_snapshot = encabezado["secuencia"]
+                for linea in archivo:
+                    store.agregar(Usuario.desde_diccionario(json.loads(linea)))
+        self._secuencia = secuencia_snapshot
+
+        reaplicadas = 0
+        if os.path.exists(self._ruta_log):
+            fin_valido = 0 # Byte donde termina la última línea completa
+            with open(self._ruta_log, "rb") as archivo:
+                for linea in archivo:
+                    if not linea.endswith(b"\n"):
+                        break # Última línea cortada por una caída: se descarta
+                    try:
+                        entrada = json.loads(linea.decode("utf-8"))
+                    except (UnicodeDecodeError, json.JSONDecodeError):
+                        break
+                    fin_valido += len(linea)
+                    if entrada["seq"] <= secuencia_snapshot:
+                        continue # Ya incluida en la foto
+                    self._aplicar(store, entrada)
+                    self._secuencia = entrada["seq"]
+                    reaplicadas += 1
+            if fin_valido < os.path.getsize(self._ruta_log):
+                # Se corta la línea rota: si no, la próxima entrada quedaría pegada a ella
+                with open(self._ruta_log, "r+b") as archivo:
+                    archivo.truncate(fin_valido)
+                    archivo.flush()
+                    os.fsync(archivo.fileno())
+        self._desde_snapshot = reaplicadas
+        self._abrir_log()
+        return reaplicadas
+
+    @staticmethod
+    def _aplicar(store, entrada):
+        operacion = entrada["op"]
+        if operacion == "registrar":
+            store.agregar(Usuario.desde_diccionario(entrada["usuario"]))
+            return
+        usuario = store.obtener_por_nombre(entrada["nombre_usuario"])
+        if usuario is None:
+            return
+        if operacion == "actualizar_perfil":
+            store.actualizar_perfil(usuario, entrada["datos"])
+        elif operacion == "actualizar_contrasena":
+            usuario.contrasena_hasheada = entrada["contrasena_hasheada"].encode("utf-8")
+        elif operacion == "cambiar_rol":
+            store.cambiar_rol(usuario, entrada["rol"])
+        elif operacion == "eliminar":
+            store.eliminar(entrada["nombre_usuario"])
+
+    # --- Escritura ---
+
+    def _abrir_log(self):
+        if self._log is None:
+            self._log = open(self._ruta_log, "a", encoding="utf-8")
+
+    def registrar(self, operacion, store, **datos):
+        """Agrega una mutación al registro y, si corresponde, sincroniza a disco o toma una foto nueva."""
+        self._abrir_log()
+        self._secuencia += 1
+        entrada = {"seq": self._secuencia, "op": operacion, **datos}
+        self._log.write(json.dumps(entrada, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._pendientes_fsync += 1
+        self._desde_snapshot += 1
+
+        if self._desde_snapshot >= self.snapshot_cada:
+            self.crear_snapshot(store)
+        elif self._pendientes_fsync >= self.fsync_cada or time.monotonic() - self._ultimo_fsync >= self.intervalo_fsync:
+            self.sincronizar()
+
+    def sincronizar(self):
+        """Baja a disco todas las mutaciones pendientes (un solo fsync para todo el grupo)."""
+        if self._log is not None and self._pendientes_fsync:
+            self._log.flush()
+            os.fsync(self._log.fileno())
+        self._pendientes_fsync = 0
+        self._ultimo_fsync = time.monotonic()
+
+    def crear_snapshot(self, store):
+        """Escribe una foto completa de `store` y vacía el registro de mutaciones."""
+        self.sincronizar()
+        temporal = self._ruta_snapshot + ".tmp"
+        with open(temporal, "w", encoding="utf-8") as archivo:
+            archivo.write(json.dumps({"version": 1, "secuencia": self._secuencia, "cantidad": len(store)}) + "\n")
+            for usuario in store:
+                archivo.write(json.dumps(usuario.a_diccionario(), ensure_ascii=False, separators=(",", ":")) + "\n")
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        # El reemplazo es atómico: o queda la foto anterior o la nueva, nunca una a medias
+        os.replace(temporal, self._ruta_snapshot)
+
+        # Las entradas del registro ya están en la foto; si nos caemos antes de vaciarlo,
+        # al cargar se saltean por su número de secuencia.
+        if self._log is not None:
+            self._log.close()
+        self._log = open(self._ruta_log, "w", encoding="utf-8")
+        self._desde_snapshot = 0
+
+    def cerrar(self):
+        """Sincroniza lo pendiente y cierra el registro."""
+        if self._log is not None:
+            self.sincronizar()
+            self._log.close()
+            self._log = None
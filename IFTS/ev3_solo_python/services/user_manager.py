@@ -1,8 +1,12 @@
 from services.auth_manager import GestorAutenticacion
 from models.users import Perfil
-import bcrypt # se usa en crear_usuario
 
 class GestorUsuarios:
+    """
+    Operaciones sobre usuarios que requieren permisos. Cada método recibe opcionalmente el token
+    de la sesión que la pide (GestorAutenticacion.crear_sesion); sin token se usa la sesión actual.
+    Las comprobaciones y los cambios se hacen bajo el lock de escritura del gestor de autenticación.
+    """
     def __init__(self, gestor_autenticacion: GestorAutenticacion):
         self.gestor_autenticacion = gestor_autenticacion
 
@@ -11,28 +15,24 @@ class GestorUsuarios:
         """
         Verifica si un DNI ya está registrado por otro usuario.
         Si se proporciona id_perfil_a_excluir, ignora el DNI de ese perfil.
+        Usa el índice DNI -> perfil del almacén de usuarios, sin recorrerlos a todos.
         """
-        for usuario in self.gestor_autenticacion.usuarios:
-            # Asegurarse de que el usuario tenga un perfil y un DNI no vacío
-            if usuario.perfil and usuario.perfil.dni:
-                # Compara el DNI en minúsculas por si hubiera inconsistencias de capitalización (aunque con dígitos no es un problema)
-                # O si quisieras una normalización más robusta en el futuro (ej. quitar puntos si los permitieras)
-                if usuario.perfil.dni == dni_a_verificar:
-                    # Si estamos excluyendo un perfil (ej. al actualizar), y es el mismo usuario,
-                    # entonces no lo contamos como un duplicado.
-                    if id_perfil_a_excluir and usuario.perfil.id_perfil == id_perfil_a_excluir:
-                        continue # Es el mismo usuario, ignóralo para la comprobación de duplicados
-                    return True # DNI encontrado en otro usuario
-        return False
+        id_perfil = self.gestor_autenticacion.usuarios.id_perfil_con_dni(dni_a_verificar)
+        if id_perfil is None:
+            return False
+        # Si estamos excluyendo un perfil (ej. al actualizar) y es el mismo usuario, no es un duplicado
+        if id_perfil_a_excluir and id_perfil == id_perfil_a_excluir:
+            return False
+        return True # DNI encontrado en otro usuario
     # --- FIN NUEVO MÉTODO AUXILIAR ---
 
 
-    def crear_usuario(self, nombre_usuario, contrasena, datos_perfil, rol):
-        usuario_logueado = self.gestor_autenticacion.obtener_usuario_logueado()
+    def crear_usuario(self, nombre_usuario, contrasena, datos_perfil, rol, token=None):
+        usuario_logueado = self.gestor_autenticacion.obtener_usuario_logueado(token)
         if not usuario_logueado or usuario_logueado.rol != 'admin':
             return False, "Acceso denegado. Solo los administradores pueden crear usuarios."
 
-        # Validar unicidad del DNI
+        # Validar unicidad del DNI (registrar_usuario lo vuelve a comprobar bajo el lock)
         dni = datos_perfil.get('dni', "")
         if dni and self._dni_ya_existe(dni): # Solo verifica si el DNI fue proporcionado
             return False, f"Error: El DNI '{dni}' ya está registrado por otro usuario."
@@ -48,6 +48,7 @@ class GestorUsuarios:
             fecha_nacimiento = datos_perfil.get('fecha_nacimiento', "")
 
             nuevo_perfil = Perfil(
+                id_perfil=self.gestor_autenticacion.asignador_ids_perfil.siguiente(),
                 dni=dni, nombre=nombre, apellido=apellido, email=email,
                 telefono=telefono, direccion=direccion, fecha_nacimiento=fecha_nacimiento
             )
@@ -60,19 +61,112 @@ class GestorUsuarios:
         )
         return exito, mensaje
 
-    def leer_usuarios(self):
-        # Esta función originalmente leía todos los usuarios en memoria del GestorAutenticacion,
-        # pero cuando se llama desde 'Ver Mi Perfil' para un usuario estándar,
-        # solo se debería devolver su propio perfil.
-        # Para evitar reescribir demasiado, el `principal.py` ya filtra por `usuario_logueado`
-        # cuando es un usuario estándar, así que aquí devolvemos la lista completa.
-        usuarios_data = []
-        for usuario in self.gestor_autenticacion.usuarios:
-            usuarios_data.append(usuario.a_diccionario())
-        return True, usuarios_data
-
-    def actualizar_contrasena_usuario(self, nombre_usuario, nueva_contrasena):
-        usuario_logueado = self.gestor_autenticacion.obtener_usuario_logueado()
+    def crear_usuarios_en_lote(self, nuevos_usuarios, token=None):
+        """
+        Crea varios usuarios de una vez. nuevos_usuarios es una lista de diccionarios con
+        'nombre_usuario', 'contrasena', 'rol' y 'datos_perfil'.
+        Antes de crear nada revisa todo el lote en una sola pasada: si algún DNI ya está
+        registrado o se repite dentro del lote, no se crea ningún usuario.
+        Retorna (exito, mensaje) y, si hubo creaciones fallidas, el mensaje las detalla.
+        """
+        usuario_logueado = self.gestor_autenticacion.obtener_usuario_logueado(token)
+        if not usuario_logueado or usuario_logueado.rol != 'admin':
+            return False, "Acceso denegado. Solo los administradores pueden crear usuarios."
+
+        vistos = set()
+        repetidos = []
+        for nuevo in nuevos_usuarios:
+            dni = (nuevo.get('datos_perfil') or {}).get('dni', "")
+            if not dni:
+                continue
+            if dni in vistos or self._dni_ya_existe(dni):
+                repetidos.append(dni)
+            vistos.add(dni)
+        if repetidos:
+            return False, f"Error: Los DNI {', '.join(sorted(set(repetidos)))} ya están registrados o se repiten en el lote."
+
+        errores = []
+        for nuevo in nuevos_usuarios:
+            exito, mensaje = self.crear_usuario(nuevo['nombre_usuario'], nuevo['contrasena'],
+                                                nuevo.get('datos_perfil') or {}, nuevo.get('rol', 'estandar'), token)
+            if not exito:
+                errores.append(f"{nuevo['nombre_usuario']}: {mensaje}")
+        creados = len(nuevos_usuarios) - len(errores)
+        if errores:
+            return False, f"Se crearon {creados} de {len(nuevos_usuarios)} usuarios. Errores: " + "; ".join(errores)
+        return True, f"Se crearon {creados} usuarios exitosamente."
+
+    # Campos que se pueden pedir en un listado. El hash de la contraseña no se lista nunca.
+    CAMPOS_LISTADO = ('id_usuario', 'nombre_usuario', 'rol', 'perfil')
+
+    def _proyectar(self, usuario, campos):
+        fila = {}
+        for campo in campos:
+            if campo == 'perfil':
+                fila['perfil'] = usuario.perfil.a_diccionario() if usuario.perfil else None
+            else:
+                fila[campo] = getattr(usuario, campo)
+        return fila
+
+    def leer_pagina_usuarios(self, cursor=None, tamano_pagina=100, campos=CAMPOS_LISTADO, rol=None, prefijo="", token=None):
+        """
+        Retorna (True, (filas, siguiente_cursor)): hasta tamano_pagina usuarios ordenados por nombre,
+        solo con los campos pedidos, opcionalmente filtrados por rol y/o prefijo del nombre.
+        Para la página siguiente se vuelve a llamar con cursor=siguiente_cursor; es None en la última.
+        """
+        usuario_logueado = self.gestor_autenticacion.obtener_usuario_logueado(token)
+        if not usuario_logueado or usuario_logueado.rol != 'admin':
+            return False, "Acceso denegado. Solo los administradores pueden listar usuarios."
+        campos_invalidos = [campo for campo in campos if campo not in self.CAMPOS_LISTADO]
+        if campos_invalidos:
+            return False, f"Campos no válidos para el listado: {', '.join(campos_invalidos)}."
+        return True, self._leer_pagina(cursor, tamano_pagina, campos, rol, prefijo)
+
+    def _leer_pagina(self, cursor, tamano_pagina, campos, rol, prefijo):
+        usuarios = self.gestor_autenticacion.usuarios
+        # Solo la página se arma bajo el lock: las altas y bajas esperan lo que tarda una página, no el listado entero
+        with self.gestor_autenticacion.bloqueo_escritura:
+            pagina = usuarios.pagina(cursor, tamano_pagina, rol, prefijo)
+            filas = [self._proyectar(usuario, campos) for usuario in pagina]
+            siguiente_cursor = usuarios.normalizar_nombre(pagina[-1].nombre_usuario) if len(pagina) == tamano_pagina else None
+        return filas, siguiente_cursor
+
+    def leer_usuarios(self, campos=CAMPOS_LISTADO, rol=None, prefijo="", tamano_pagina=100, token=None):
+        """
+        Retorna (True, generador) que recorre los usuarios página por página (ver leer_pagina_usuarios),
+        así el listado ocupa la memoria de una página sin importar cuántos usuarios haya.
+        """
+        exito, resultado = self.leer_pagina_usuarios(None, tamano_pagina, campos, rol, prefijo, token)
+        if not exito:
+            return False, resultado
+        return True, self._iterar_paginas(resultado, tamano_pagina, campos, rol, prefijo)
+
+    def _iterar_paginas(self, primera_pagina, tamano_pagina, campos, rol, prefijo):
+        filas, cursor = primera_pagina
+        yield from filas
+        while cursor is not None:
+            filas, cursor = self._leer_pagina(cursor, tamano_pagina, campos, rol, prefijo)
+            yield from filas
+
+    def buscar_usuarios(self, texto, limite=20, campos=CAMPOS_LISTADO, token=None):
+        """
+        Busca usuarios por nombre de usuario, nombre, apellido, email o DNI: primero los que
+        empiezan con el texto y después, si hace falta, los parecidos (tolera errores de tipeo).
+        Retorna (True, filas) con los campos pedidos, o (False, mensaje).
+        """
+        usuario_logueado = self.gestor_autenticacion.obtener_usuario_logueado(token)
+        if not usuario_logueado or usuario_logueado.rol != 'admin':
+            return False, "Acceso denegado. Solo los administradores pueden buscar usuarios."
+        if not texto.strip():
+            return False, "Ingrese un texto para buscar."
+        campos_invalidos = [campo for campo in campos if campo not in self.CAMPOS_LISTADO]
+        if campos_invalidos:
+            return False, f"Campos no válidos para el listado: {', '.join(campos_invalidos)}."
+        with self.gestor_autenticacion.bloqueo_escritura:
+            return True, [self._proyectar(usuario, campos) for usuario in self.gestor_autenticacion.usuarios.buscar(texto, limite)]
+
+    def actualizar_contrasena_usuario(self, nombre_usuario, nueva_contrasena, token=None):
+        usuario_logueado = self.gestor_autenticacion.obtener_usuario_logueado(token)
         if not usuario_logueado:
             return False, "Debe iniciar sesión para actualizar la contraseña."
 
@@ -86,16 +180,25 @@ class GestorUsuarios:
         if usuario_logueado.rol == 'estandar' and usuario_logueado.nombre_usuario != usuario_a_actualizar.nombre_usuario:
             return False, "Acceso denegado. No tiene permisos para actualizar la contraseña de otro usuario."
 
-        # Hashear la nueva contraseña
-        nueva_contrasena_hasheada = bcrypt.hashpw(nueva_contrasena.encode('utf-8'), bcrypt.gensalt())
-        usuario_a_actualizar.contrasena_hasheada = nueva_contrasena_hasheada
+        # Hashear la nueva contraseña (fuera del lock: es la parte lenta)
+        nueva_contrasena_hasheada = self.gestor_autenticacion._hashear_contrasena(nueva_contrasena)
+        with self.gestor_autenticacion.bloqueo_escritura:
+            if self.gestor_autenticacion.obtener_usuario_por_nombre(nombre_usuario) != usuario_a_actualizar:
+                return False, "Usuario no encontrado." # Se eliminó mientras tanto
+            usuario_a_actualizar.contrasena_hasheada = nueva_contrasena_hasheada
+            self.gestor_autenticacion.registrar_mutacion("actualizar_contrasena", nombre_usuario=usuario_a_actualizar.nombre_usuario,
+                                                         contrasena_hasheada=nueva_contrasena_hasheada.decode('utf-8'))
         return True, f"Contraseña del usuario '{usuario_a_actualizar.nombre_usuario}' actualizada exitosamente."
 
-    def actualizar_perfil_usuario(self, nombre_usuario, nuevos_datos_perfil):
-        usuario_logueado = self.gestor_autenticacion.obtener_usuario_logueado()
+    def actualizar_perfil_usuario(self, nombre_usuario, nuevos_datos_perfil, token=None):
+        usuario_logueado = self.gestor_autenticacion.obtener_usuario_logueado(token)
         if not usuario_logueado:
             return False, "Debe iniciar sesión para actualizar el perfil."
 
+        with self.gestor_autenticacion.bloqueo_escritura:
+            return self._actualizar_perfil(usuario_logueado, nombre_usuario, nuevos_datos_perfil)
+
+    def _actualizar_perfil(self, usuario_logueado, nombre_usuario, nuevos_datos_perfil):
         usuario_a_actualizar = self.gestor_autenticacion.obtener_usuario_por_nombre(nombre_usuario)
         if not usuario_a_actualizar:
             return False, "Usuario no encontrado."
@@ -108,7 +211,7 @@ class GestorUsuarios:
 
         if not usuario_a_actualizar.perfil:
             # Si por alguna razón el usuario no tiene perfil (no debería pasar con el flujo actual)
-            usuario_a_actualizar.perfil = Perfil()
+            usuario_a_actualizar.perfil = Perfil(id_perfil=self.gestor_autenticacion.asignador_ids_perfil.siguiente())
 
         # --- VALIDACIÓN DE UNICIDAD DEL DNI AL ACTUALIZAR ---
         if 'dni' in nuevos_datos_perfil and nuevos_datos_perfil['dni']:
@@ -118,64 +221,58 @@ class GestorUsuarios:
                 return False, f"Error: El DNI '{nuevo_dni}' ya está registrado por otro usuario."
         # --- FIN VALIDACIÓN DE UNICIDAD DEL DNI ---
 
-        # Actualizar los campos del perfil
-        for key, value in nuevos_datos_perfil.items():
-            # Solo actualiza si el valor no está vacío (permite dejar opcionales sin modificar)
-            # Y se asegura de que el atributo exista en el objeto Perfil
-            if hasattr(usuario_a_actualizar.perfil, key):
-                setattr(usuario_a_actualizar.perfil, key, value)
+        # Actualizar los campos del perfil (el almacén mantiene al día el índice por DNI)
+        self.gestor_autenticacion.usuarios.actualizar_perfil(usuario_a_actualizar, nuevos_datos_perfil)
+        self.gestor_autenticacion.registrar_mutacion("actualizar_perfil", nombre_usuario=usuario_a_actualizar.nombre_usuario,
+                                                     datos=nuevos_datos_perfil)
 
         return True, f"Perfil del usuario '{usuario_a_actualizar.nombre_usuario}' actualizado exitosamente."
 
-    def eliminar_usuario(self, nombre_usuario):
-        usuario_logueado = self.gestor_autenticacion.obtener_usuario_logueado()
+    def eliminar_usuario(self, nombre_usuario, token=None):
+        usuario_logueado = self.gestor_autenticacion.obtener_usuario_logueado(token)
         if not usuario_logueado or usuario_logueado.rol != 'admin':
             return False, "Acceso denegado. Solo los administradores pueden eliminar usuarios."
 
-        # No permitir que un admin se elimine a sí mismo si es el único admin
-        if usuario_logueado.nombre_usuario == nombre_usuario:
-            admins_activos = [u for u in self.gestor_autenticacion.usuarios if u.rol == 'admin']
-            if len(admins_activos) == 1 and admins_activos[0].nombre_usuario == nombre_usuario:
+        usuarios = self.gestor_autenticacion.usuarios
+        with self.gestor_autenticacion.bloqueo_escritura:
+            # No permitir eliminar al único admin (se comprueba bajo el lock: dos admins
+            # eliminándose entre sí al mismo tiempo no pueden dejar el sistema sin ninguno)
+            usuario_a_eliminar = usuarios.obtener_por_nombre(nombre_usuario)
+            if usuario_a_eliminar and usuario_a_eliminar.rol == 'admin' and usuarios.contar_con_rol('admin') == 1:
                 return False, "No puedes eliminar el único usuario administrador del sistema."
 
-        usuario_a_eliminar = None
-        # Iterar sobre la lista de usuarios del gestor de autenticación y eliminarlo
-        for i, usuario in enumerate(self.gestor_autenticacion.usuarios):
-            if usuario.nombre_usuario == nombre_usuario.lower(): # Siempre comparar normalizado
-                usuario_a_eliminar = usuario
-                del self.gestor_autenticacion.usuarios[i]
-                # Si el usuario logueado actualmente es el que se elimina, cerrar su sesión
-                if self.gestor_autenticacion.obtener_usuario_logueado() and \
-                   self.gestor_autenticacion.obtener_usuario_logueado().nombre_usuario == usuario.nombre_usuario:
-                    self.gestor_autenticacion.cerrar_sesion()
-                return True, f"Usuario '{nombre_usuario}' eliminado exitosamente."
-        return False, "Usuario no encontrado."
+            usuario_eliminado = usuarios.eliminar(nombre_usuario)
+            if usuario_eliminado is None:
+                return False, "Usuario no encontrado."
+            self.gestor_autenticacion.registrar_mutacion("eliminar", nombre_usuario=usuario_eliminado.nombre_usuario)
+
+        # Las sesiones abiertas del usuario eliminado (incluida la actual, si era él) quedan cerradas
+        self.gestor_autenticacion.cerrar_sesiones_de_usuario(usuario_eliminado.id_usuario)
+        return True, f"Usuario '{nombre_usuario}' eliminado exitosamente."
     
-    def actualizar_rol_usuario(self, nombre_usuario, nuevo_rol):
-        usuario_logueado = self.gestor_autenticacion.obtener_usuario_logueado()
+    def actualizar_rol_usuario(self, nombre_usuario, nuevo_rol, token=None):
+        usuario_logueado = self.gestor_autenticacion.obtener_usuario_logueado(token)
         if not usuario_logueado or usuario_logueado.rol != 'admin':
             return False, "Acceso denegado. Solo los administradores pueden cambiar roles."
 
         if nuevo_rol not in ['admin', 'estandar']:
             return False, "Rol no válido. Debe ser 'admin' o 'estandar'."
 
-        usuario_a_actualizar = self.gestor_autenticacion.obtener_usuario_por_nombre(nombre_usuario)
-        if not usuario_a_actualizar:
-            return False, f"Usuario '{nombre_usuario}' no encontrado."
+        usuarios = self.gestor_autenticacion.usuarios
+        with self.gestor_autenticacion.bloqueo_escritura:
+            usuario_a_actualizar = self.gestor_autenticacion.obtener_usuario_por_nombre(nombre_usuario)
+            if not usuario_a_actualizar:
+                return False, f"Usuario '{nombre_usuario}' no encontrado."
 
-        # No permitir que un admin se cambie a sí mismo a estándar si es el único admin
-        if usuario_a_actualizar.nombre_usuario == usuario_logueado.nombre_usuario and nuevo_rol == 'estandar':
-            admins_activos = [u for u in self.gestor_autenticacion.usuarios if u.rol == 'admin']
-            if len(admins_activos) == 1 and admins_activos[0].nombre_usuario == usuario_a_actualizar.nombre_usuario:
+            # No permitir degradar al único admin a estándar
+            if usuario_a_actualizar.rol == 'admin' and nuevo_rol == 'estandar' and usuarios.contar_con_rol('admin') == 1:
                 return False, "No puedes degradar al único usuario administrador del sistema a estándar."
-        
-        # Si el usuario es el que actualmente está logueado y va a cambiar su rol,
-        # su objeto de sesión debe actualizarse para reflejar el nuevo rol.
-        if usuario_a_actualizar.nombre_usuario == usuario_logueado.nombre_usuario:
-            usuario_logueado.rol = nuevo_rol
-            # No es estrictamente necesario llamar a set_usuario_logueado nuevamente,
-            # ya que el objeto es el mismo, pero lo dejo como recordatorio de la actualización.
-            # self.gestor_autenticacion.set_usuario_logueado(usuario_logueado) 
-
-        usuario_a_actualizar.rol = nuevo_rol
-        return True, f"Rol del usuario '{nombre_usuario}' actualizado a '{nuevo_rol}' exitosamente."
\ No newline at end of file
+
+            rol_anterior = usuario_a_actualizar.rol
+            usuarios.cambiar_rol(usuario_a_actualizar, nuevo_rol)
+            self.gestor_autenticacion.registrar_mutacion("cambiar_rol", nombre_usuario=usuario_a_actualizar.nombre_usuario, rol=nuevo_rol)
+
+        # Con otro rol cambian los permisos: el usuario tiene que volver a iniciar sesión
+        if rol_anterior != nuevo_rol:
+            self.gestor_autenticacion.cerrar_sesiones_de_usuario(usuario_a_actualizar.id_usuario)
+        return True, f"Rol del usuario '{nombre_usuario}' actualizado a '{nuevo_rol}' exitosamente."
@@ -0,0 +1,160 @@
+from models.users import Perfil
+from comun.sorted_index import IndiceOrdenado
+from comun.search_index import IndiceBusqueda, valores_de_usuario
+
+
+class UserStore:
+    """
+    Almacén de usuarios en memoria con índices hash.
+
+    Mantiene los usuarios indexados por nombre de usuario normalizado, id, DNI y rol,
+    así las búsquedas no recorren la colección completa (O(1) en lugar de O(n)).
+    Se puede iterar como una lista: `for usuario in store: ...`.
+
+    Las búsquedas se pueden hacer desde varios hilos sin lock mientras las escrituras
+    estén serializadas (GestorAutenticacion.bloqueo_escritura): un usuario nuevo se
+    publica en el índice por nombre al final, y el perfil se reemplaza entero al actualizarlo.
+    Recorrer el almacén (o pedir una página) sí requiere tener el lock de escritura.
+    """
+    def __init__(self, usuarios=None):
+        self._por_nombre = {}  # nombre_usuario normalizado -> usuario
+        self._por_id = {}      # id_usuario -> usuario
+        self._por_dni = {}     # dni -> usuario
+        self._por_rol = {}     # rol -> {id_usuario: usuario}
+        self._nombres = IndiceOrdenado()   # nombres normalizados, para paginar y filtrar por prefijo
+        self._nombres_por_rol = {}         # rol -> IndiceOrdenado de los nombres con ese rol
+        self._busqueda = IndiceBusqueda()  # nombre de usuario, nombre, apellido, email y DNI
+        for usuario in usuarios or []:
+            self.agregar(usuario)
+
+    @staticmethod
+    def normalizar_nombre(nombre_usuario):
+        """Los nombres de usuario se comparan sin distinguir mayúsculas."""
+        return nombre_usuario.lower()
+
+    # --- Altas y bajas ---
+
+    def agregar(self, usuario):
+        """Agrega un usuario a todos los índices. Lanza ValueError si el nombre o el id ya existen."""
+        nombre = self.normalizar_nombre(usuario.nombre_usuario)
+        if nombre in self._por_nombre:
+            raise ValueError(f"El nombre de usuario '{usuario.nombre_usuario}' ya existe.")
+        if usuario.id_usuario in self._por_id:
+            raise ValueError(f"El id de usuario '{usuario.id_usuario}' ya existe.")
+        self._por_id[usuario.id_usuario] = usuario
+        self._por_rol.setdefault(usuario.rol, {})[usuario.id_usuario] = usuario
+        dni = self._dni_de(usuario)
+        if dni:
+            self._por_dni[dni] = usuario
+        self._nombres.agregar(nombre)
+        self._nombres_por_rol.setdefault(usuario.rol, IndiceOrdenado()).agregar(nombre)
+        self._busqueda.agregar(usuario.id_usuario, valores_de_usuario(usuario))
+        self._por_nombre[nombre] = usuario # Último: recién ahora se lo encuentra por nombre
+
+    def eliminar(self, nombre_usuario):
+        """Quita al usuario de todos los índices. Retorna el usuario eliminado o None si no existía."""
+        nombre = self.normalizar_nombre(nombre_usuario)
+        usuario = self._por_nombre.pop(nombre, None)
+        if usuario is None:
+            return None
+        del self._por_id[usuario.id_usuario]
+        del self._por_rol[usuario.rol][usuario.id_usuario]
+        self._nombres.quitar(nombre)
+        self._nombres_por_rol[usuario.rol].quitar(nombre)
+        self._busqueda.quitar(usuario.id_usuario, valores_de_usuario(usuario))
+        dni = self._dni_de(usuario)
+        if dni and self._por_dni.get(dni) is usuario:
+            del self._por_dni[dni]
+        return usuario
+
+    def cambiar_rol(self, usuario, nuevo_rol):
+        """Cambia el rol del usuario manteniendo actualizado el índice por rol."""
+        rol_anterior = usuario.rol
+        usuario.rol = nuevo_rol # El setter valida el rol
+        if rol_anterior != nuevo_rol:
+            del self._por_rol[rol_anterior][usuario.id_usuario]
+            self._por_rol.setdefault(nuevo_rol, {})[usuario.id_usuario] = usuario
+            nombre = self.normalizar_nombre(usuario.nombre_usuario)
+            self._nombres_por_rol[rol_anterior].quitar(nombre)
+            self._nombres_por_rol.setdefault(nuevo_rol, IndiceOrdenado()).agregar(nombre)
+
+    def actualizar_perfil(self, usuario, nuevos_datos_perfil):
+        """
+        Actualiza los campos del perfil del usuario que existan en Perfil
+        y mantiene el índice por DNI al día si el DNI cambió.
+        Arma un Perfil nuevo y lo reemplaza de una vez, así quien lo lea al mismo tiempo
+        ve el perfil anterior o el nuevo, nunca uno a medio actualizar.
+        """
+        dni_anterior = self._dni_de(usuario)
+        valores_anteriores = valores_de_usuario(usuario)
+        datos = usuario.perfil.a_diccionario() if usuario.perfil else {}
+        for clave, valor in nuevos_datos_perfil.items():
+            if clave != 'id_perfil' and clave in Perfil.__slots__:
+                datos[clave] = valor
+        usuario.perfil = Perfil.desde_diccionario(datos)
+        self._busqueda.actualizar(usuario.id_usuario, valores_anteriores, valores_de_usuario(usuario))
+        dni_nuevo = self._dni_de(usuario)
+        if dni_nuevo != dni_anterior:
+            if dni_anterior and self._por_dni.get(dni_anterior) is usuario:
+                del self._por_dni[dni_anterior]
+            if dni_nuevo:
+                self._por_dni[dni_nuevo] = usuario
+
+    # --- Búsquedas ---
+
+    def obtener_por_nombre(self, nombre_usuario):
+        return self._por_nombre.get(self.normalizar_nombre(nombre_usuario))
+
+    def obtener_por_id(self, id_usuario):
+        return self._por_id.get(id_usuario)
+
+    def obtener_por_dni(self, dni):
+        return self._por_dni.get(dni)
+
+    def id_perfil_con_dni(self, dni):
+        """Retorna el id del perfil que tiene registrado ese DNI, o None si nadie lo tiene."""
+        usuario = self._por_dni.get(dni)
+        return usuario.perfil.id_perfil if usuario else None
+
+    def usuarios_con_rol(self, rol):
+        """Retorna la lista de usuarios que tienen el rol indicado."""
+        return list(self._por_rol.get(rol, {}).values())
+
+    def contar_con_rol(self, rol):
+        return len(self._por_rol.get(rol, {}))
+
+    def pagina(self, despues_de=None, tamano=100, rol=None, prefijo=""):
+        """
+        Retorna hasta `tamano` usuarios ordenados por nombre, a partir del cursor `despues_de`
+        (el nombre normalizado del último usuario de la página anterior), opcionalmente solo
+        los de un rol y/o cuyo nombre empieza con `prefijo`. Usa los índices ordenados:
+        el costo depende del tamaño de la página, no de la cantidad de usuarios.
+        """
+        indice = self._nombres if rol is None else self._nombres_por_rol.get(rol)
+        if indice is None:
+            return []
+        nombres = indice.desde(despues_de, self.normalizar_nombre(prefijo), tamano)
+        return [self._por_nombre[nombre] for nombre in nombres]
+
+    def buscar(self, texto, limite=20):
+        """
+        Usuarios cuyo nombre de usuario, nombre, apellido, email o DNI empieza con texto y,
+        si no alcanzan, los que tienen alguno parecido (tolera errores de tipeo).
+        """
+        return [self._por_id[id_usuario] for id_usuario in self._busqueda.buscar(texto, limite)]
+
+    @staticmethod
+    def _dni_de(usuario):
+        return usuario.perfil.dni if usuario.perfil else ""
+
+    # --- Comportamiento de colección ---
+
+    def __len__(self):
+        return len(self._por_id)
+
+    def __iter__(self):
+        # Recorre sin copiar; no se debe agregar ni eliminar usuarios durante el recorrido
+        return iter(self._por_id.values())
+
+    def __contains__(self, nombre_usuario):
+        return self.normalizar_nombre(nombre_usuario) in self._por_nombre